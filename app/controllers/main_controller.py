@@ -1,4 +1,6 @@
 # main_controller.py
+from concurrent.futures import wait
+
 from PyQt5.QtCore import (
     QObject,
     pyqtSignal,
@@ -13,6 +15,7 @@ from PyQt5 import (
 from app.views import MainView
 from app.models import MainModel
 from app.utils.logger import logger
+from app.utils.latency_stats import LatencyMonitor
 
 class MainController(QObject):
     """
@@ -37,13 +40,13 @@ class MainController(QObject):
         self._app = app
         self._main_view = main_view
         self._main_model = main_model
+        self._shutdown_future = None  # set once the containers are being shut down
         
         self._main_model.ros2_launch_container_model.start_periodic_tasks(
-            status_interval_ms=1000,
-            container_interval_ms=1000,
+            status_interval_ms=self._config.get("container_status_reconcile_interval_ms", 30000),
         )
         
-        self._app.aboutToQuit.connect(self.on_app_exit)
+        self._app.aboutToQuit.connect(self.on_app_about_to_quit)
         
         # Button click signals
         self._main_view.signal_bringup_btn_clicked.connect(
@@ -97,6 +100,29 @@ class MainController(QObject):
         self._main_model.ros2_launch_container_model.signal_container_status_updated.connect(
             self.on_signal_container_status_updated,
         )
+        self._main_model.launch_readiness_model.signal_readiness_changed.connect(
+            self.on_signal_readiness_changed,
+        )
+        self._main_model.ros2_launch_container_model.signal_container_stats.connect(
+            self._main_view.on_signal_container_stats,
+        )
+        self._main_model.ros2_launch_container_model.signal_container_command_finished.connect(
+            self.on_signal_container_command_finished,
+        )
+        self._main_model.ros2_launch_container_model.signal_container_operation_progress.connect(
+            self.on_signal_container_operation_progress,
+        )
+        self._main_model.container_image_model.signal_image_state.connect(
+            self._main_view.on_signal_image_state,
+        )
+        self._main_model.container_image_model.signal_image_progress.connect(
+            self._main_view.on_signal_image_progress,
+        )
+        # The image check started with the model; show where it is by now.
+        self._main_view.on_signal_image_state(
+            self._main_model.container_image_model.state,
+            self._main_model.container_image_model.info,
+        )
         
         # Foxglove WebSocket signals
         self._main_model.foxglove_ws_model.signal_health_status.connect(
@@ -108,6 +134,47 @@ class MainController(QObject):
         self._main_model.foxglove_ws_model.signal_heading_quat.connect(
             self._main_view.on_signal_heading_quat_received,
         )
+        self._main_model.foxglove_ws_model.signal_connection_state.connect(
+            self._main_view.on_signal_foxglove_connection_state,
+        )
+        self._main_model.foxglove_ws_model.signal_robot_connection_state.connect(
+            self._main_view.multi_panel.diagnostics_panel.update_robot_state,
+        )
+        self._main_model.foxglove_ws_model.signal_recording_state.connect(
+            self._main_view.on_signal_recording_state,
+        )
+        self._main_view.signal_panel_changed.connect(
+            self.on_signal_panel_changed,
+        )
+        self._main_view.signal_record_btn_clicked.connect(
+            self.on_signal_record_btn_clicked,
+        )
+        self._main_model.foxglove_ws_model.set_active_panel(
+            self._main_view.multi_panel.current_panel_name()
+        )
+        self._main_model.foxglove_ws_model.signal_replay_finished.connect(
+            self.on_signal_replay_finished,
+        )
+        # Latency diagnostics: refresh the panel every second, log a summary periodically.
+        self._latency_log_interval = int(self._config.get("foxglove_latency_log_interval_s", 10))
+        self._diagnostics_ticks = 0
+        self._diagnostics_timer = QTimer(self)
+        self._diagnostics_timer.setInterval(1000)
+        self._diagnostics_timer.timeout.connect(self.on_diagnostics_timer)
+        self._diagnostics_timer.start()
+        # Container logs: pull the new lines of the shown container while the panel is visible.
+        self._main_view.multi_panel.logs_panel.set_containers(
+            list(self._main_model.ros2_launch_container_model.containers_config)
+        )
+        self._logs_timer = QTimer(self)
+        self._logs_timer.setInterval(self._config.get("container_log_ui_interval_ms", 250))
+        self._logs_timer.timeout.connect(self.on_logs_timer)
+        self._logs_timer.start()
+        if self._config.get("replay_file"):
+            self._main_model.foxglove_ws_model.start_replay(
+                self._config["replay_file"],
+                speed=self._config.get("replay_speed", 1.0),
+            )
         
         # others
         self._main_model.signal_on_waypoints_loaded.connect(
@@ -130,11 +197,46 @@ class MainController(QObject):
     @pyqtSlot()
     def on_app_exit(self):
         """
-        Handles application exit by stopping all containers and quitting the app.
+        Handles the Exit button by stopping all containers and quitting the app
+        once they are stopped. The window stays responsive meanwhile.
         """
+        if self._shutdown_future is not None:
+            return
         logger.info("Exiting application...")
-        self._main_model.ros2_launch_container_model.remove_all_launch_containers()
+        self._main_view.setEnabled(False)
+        container_model = self._main_model.ros2_launch_container_model
+        container_model.signal_shutdown_finished.connect(self.on_signal_shutdown_finished)
+        self._shutdown_containers()
+
+    @pyqtSlot()
+    def on_signal_shutdown_finished(self):
+        """
+        Quits the app once the containers were stopped or removed on exit.
+        """
+        logger.info("Launch containers shut down.")
         self._app.quit()
+
+    @pyqtSlot()
+    def on_app_about_to_quit(self):
+        """
+        Handles every quit of the app, also those not going through the Exit
+        button (window close, signals, quit() from elsewhere). The event loop has
+        ended by now, so this waits up to `container_shutdown_timeout_s` for the
+        containers to stop before closing the Docker client.
+        """
+        if self._shutdown_future is None:
+            logger.info("Application quitting, shutting down the launch containers...")
+            self._shutdown_containers()
+        timeout = self._config.get("container_shutdown_timeout_s", 30)
+        done, _ = wait([self._shutdown_future], timeout=timeout)
+        if not done:
+            logger.warning(f"Launch containers did not shut down within {timeout} s.")
+        self._main_model.ros2_launch_container_model.close_docker()
+
+    def _shutdown_containers(self):
+        container_model = self._main_model.ros2_launch_container_model
+        container_model.stop_periodic_tasks()
+        self._shutdown_future = container_model.shutdown_launch_containers()
         
     @pyqtSlot()
     def on_signal_shutdown_btn_clicked(self):
@@ -157,6 +259,7 @@ class MainController(QObject):
         """
         logger.info(f"Bringup button clicked with command: {cmd}")
         if cmd == "start":
+            self._main_model.launch_readiness_model.mark_start_requested("bringup")
             self._main_model.ros2_launch_container_model.request_start_container(
                 key="bringup"
             )
@@ -172,6 +275,7 @@ class MainController(QObject):
         """
         logger.info(f"Localization button clicked with command: {cmd}")
         if cmd == "start":
+            self._main_model.launch_readiness_model.mark_start_requested("localization")
             self._main_model.ros2_launch_container_model.request_start_container(
                 key="localization")
         elif cmd == "stop":
@@ -185,46 +289,133 @@ class MainController(QObject):
         """
         logger.info(f"Navigation waypoint follow button clicked with command: {cmd}")
         if cmd == "start":
+            self._main_model.launch_readiness_model.mark_start_requested("navigation_wp_follow")
             self._main_model.ros2_launch_container_model.request_start_container(
                 key="navigation_wp_follow")
         elif cmd == "stop":
             self._main_model.ros2_launch_container_model.request_stop_container(
                 key="navigation_wp_follow")
         
+    @pyqtSlot(dict)
+    def on_signal_replay_finished(self, stats: dict):
+        """
+        Slot method to report the throughput of a finished replay.
+        """
+        logger.info(f"Replay finished: {stats}")
+
+    @pyqtSlot()
+    def on_logs_timer(self):
+        """
+        Appends the log lines added since the last pull to the logs panel while it is visible.
+        """
+        if self._main_view.multi_panel.current_panel_name() != "logs":
+            return
+        logs_panel = self._main_view.multi_panel.logs_panel
+        key = logs_panel.current_container()
+        if not key:
+            return
+        lines, skipped = self._main_model.ros2_launch_container_model.container_log_lines(
+            key, logs_panel.last_seq(), max_lines=logs_panel.max_lines())
+        logs_panel.append_lines(lines, skipped)
+
+    @pyqtSlot()
+    def on_diagnostics_timer(self):
+        """
+        Refreshes the diagnostics panel while it is visible and logs the latency
+        summary every `foxglove_latency_log_interval_s` seconds.
+        """
+        foxglove_ws_model = self._main_model.foxglove_ws_model
+        self._diagnostics_ticks += 1
+        log_due = self._latency_log_interval > 0 and self._diagnostics_ticks % self._latency_log_interval == 0
+        panel_visible = self._main_view.multi_panel.current_panel_name() == "diagnostics"
+        if not (log_due or panel_visible):
+            return
+        snapshot = foxglove_ws_model.latency_snapshot()
+        if panel_visible:
+            self._main_view.multi_panel.diagnostics_panel.update_latency(snapshot)
+            self._main_view.multi_panel.diagnostics_panel.update_decode_stats(foxglove_ws_model.decode_stats())
+        if log_due and snapshot:
+            logger.info(f"Foxglove latency:\n{LatencyMonitor.format_summary(snapshot)}")
+
+    @pyqtSlot(str)
+    def on_signal_record_btn_clicked(self, cmd: str):
+        """
+        Slot method to start or stop recording the Foxglove streams.
+        """
+        logger.info(f"Record button clicked with command: {cmd}")
+        if cmd == "start":
+            self._main_model.foxglove_ws_model.start_recording()
+        elif cmd == "stop":
+            self._main_model.foxglove_ws_model.stop_recording()
+
+    @pyqtSlot(str)
+    def on_signal_panel_changed(self, panel: str):
+        """
+        Updates the Foxglove subscriptions to the topics the visible panel needs.
+        """
+        self._main_model.foxglove_ws_model.set_active_panel(panel)
+
+    @pyqtSlot(str, str, str)
+    def on_signal_container_command_finished(self, key: str, command: str, result: str):
+        """
+        Slot method to report the outcome of a container start/stop request.
+        """
+        if result == "failed":
+            logger.warning(f"Container {key} {command} request failed.")
+        else:
+            logger.info(f"Container {key} {command} request {result}.")
+
+    @pyqtSlot(str, int, int)
+    def on_signal_container_operation_progress(self, operation: str, done: int, total: int):
+        """
+        Slot method to report the progress of container lifecycle operations.
+        """
+        logger.info(f"Container {operation}: {done}/{total} done")
+
     @pyqtSlot(str, str)
     def on_signal_container_status_updated(self, key: str, status: str):
         """
-        Slot method to handle container status updates.
+        Slot method to handle container status updates. A running container is
+        reported as started by the readiness model, once its probes passed.
         """
         logger.debug(f"Container {key} status updated: {status}")
-        
-        # Map container keys to view signal methods
-        container_map = {
+        if status != "exited":
+            return
+        container_map = self._container_status_map()
+        if key in container_map:
+            container_map[key]("stopped")
+        if key == "bringup" and not self._main_model.foxglove_ws_model.is_replaying() \
+                and self._main_model.foxglove_ws_model.is_running() is True:
+            self._main_model.foxglove_ws_model.stop()
+
+    @pyqtSlot(str, str, dict)
+    def on_signal_readiness_changed(self, key: str, state: str, timings: dict):
+        """
+        Slot method to handle readiness changes of the launch containers.
+        The WebSocket connects once the bringup's Foxglove port is listening;
+        the views show a container as started once it is ready.
+        """
+        if key == "bringup" and state in ("listening", "ready", "timeout") \
+                and not self._main_model.foxglove_ws_model.is_replaying() \
+                and self._main_model.foxglove_ws_model.is_running() is False:
+            self._main_model.foxglove_ws_model.start()
+        if state in ("ready", "timeout"):
+            if state == "timeout":
+                logger.warning(f"Container {key} is running but not ready: {timings}")
+            container_map = self._container_status_map()
+            if key in container_map:
+                container_map[key]("started")
+
+    def _container_status_map(self):
+        """
+        Returns the view method reporting the status of each container.
+        """
+        return {
             "bringup": self._main_view.on_signal_bringup_container_status,
             "localization": self._main_view.on_signal_localization_container_status,
             "navigation_wp_follow": self._main_view.on_signal_navigation_container_status
         }
-        
-        # Map container status to UI status
-        status_map = {
-            "running": "started",
-            "exited": "stopped"
-        }
-        
-        if status not in status_map:
-            return
-        
-        # Update the UI if we have a mapping for this container and status
-        if key in container_map and status in status_map:
-            container_map[key](status_map[status])
-            
-        if key == "bringup":
-            if status_map[status] == "started" and self._main_model.foxglove_ws_model.is_running() is False:
-                self._main_model.foxglove_ws_model.start()
-            elif status_map[status] == "stopped" and self._main_model.foxglove_ws_model.is_running() is True:
-                self._main_model.foxglove_ws_model.stop()
-                
-                
+
     @pyqtSlot(str, dict)
     def on_signal_log_save_btn_clicked(self, save_path: str, waypoints: dict):
         """
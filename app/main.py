@@ -44,6 +44,20 @@ def main():
         default=default_config_file,
     )
     
+    parser.add_argument(
+        "--replay-file",
+        dest="replay_file",
+        default=argparse.SUPPRESS,  # unset arguments keep the config values
+        help="replay a Foxglove recording (.mcap) instead of connecting to the robot",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        dest="replay_speed",
+        type=float,
+        default=argparse.SUPPRESS,
+        help="replay speed factor, 0 replays as fast as possible (default: replay_speed of the config)",
+    )
+    
     
     args = parser.parse_args()
     
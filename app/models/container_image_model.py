@@ -0,0 +1,220 @@
+# container_image_model.py
+import os
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from app.utils.async_docker_client import AsyncDockerClient, DockerAPIError, DockerNotFound, split_image_reference
+from app.utils.logger import logger
+from app.utils.signal_coalescer import SignalCoalescer
+
+
+class ContainerImageModel(QObject):
+    """
+    Makes sure the image of the launch containers (`container_image`) is available
+    locally before the first container is created, so a missing image shows up
+    at startup instead of at the first bringup. In the background it:
+
+      1. inspects the local image and, with `container_image_check_remote`, compares
+         its digest with the registry's,
+      2. loads a missing image from the `docker save` tarball `container_image_tarball`
+         in `mowbot_legacy_data_path`, which needs no network,
+      3. otherwise pulls it (or an outdated one) from the registry, with the
+         credentials `docker login` stored in the Docker config.
+
+    Emits signal_image_state on every state change and signal_image_progress with
+    the progress of a pull or load at `container_image_progress_ui_rate_hz`.
+    """
+
+    # 'missing': neither the tarball nor the registry provided the image.
+    IMAGE_STATES = ("checking", "loading", "pulling", "ready", "missing")
+
+    signal_image_state = pyqtSignal(str, dict)  # one of IMAGE_STATES, {'image', 'id', 'digest', 'source', 'error'}
+    signal_image_progress = pyqtSignal(dict)  # {'current', 'total' (bytes), 'layers_done', 'layers', 'status'}
+
+    _instance = None
+
+    @staticmethod
+    def get_instance(config: Dict[str, Any], docker: AsyncDockerClient = None) -> 'ContainerImageModel':
+        """
+        Returns the singleton instance of ContainerImageModel.
+        """
+        if ContainerImageModel._instance is None:
+            ContainerImageModel._instance = ContainerImageModel(config, docker)
+        return ContainerImageModel._instance
+
+    def __init__(self, config: Dict[str, Any], docker: AsyncDockerClient):
+        """
+        Initializes the ContainerImageModel.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary containing 'container_image',
+                'mowbot_legacy_data_path' and the 'container_image_*' options.
+            docker (AsyncDockerClient): Client of the Docker daemon.
+        """
+        if ContainerImageModel._instance is not None:
+            raise Exception("This class is a singleton! Use `get_instance` instead.")
+        super().__init__()
+        self._config = config
+        self._docker = docker
+        self.image = config["container_image"]
+        self._state = "checking"
+        self._info: Dict[str, Any] = {'image': self.image}
+        self._future: Optional[Future] = None
+
+        self._progress_coalescer = SignalCoalescer(config.get("container_image_progress_ui_rate_hz", 4.0), self)
+        self._progress_coalescer.register("progress", self.signal_image_progress)
+        # Queued to this object's thread, which owns the coalescer timer.
+        self.signal_image_state.connect(self._on_image_state)
+
+    @property
+    def state(self) -> str:
+        """
+        Returns the state of the image, one of IMAGE_STATES.
+        """
+        return self._state
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        """
+        Returns the details of the current state, as in signal_image_state.
+        """
+        return dict(self._info)
+
+    def prepare_image(self) -> Future:
+        """
+        Starts making the image available in the background. Call from the GUI thread.
+
+        Returns:
+            Future: Resolves with the image details once it is ready; raises
+                DockerAPIError if it stays missing.
+        """
+        if self._future is None or (self._future.done() and self._state == "missing"):
+            self._progress_coalescer.start()
+            self._future = self._docker.submit(self._prepare_image())
+        return self._future
+
+    async def _prepare_image(self) -> Dict[str, Any]:
+        self._set_state("checking")
+        image = await self._inspect_local()
+        if image is not None:
+            if not self._config.get("container_image_check_remote", False) or await self._is_current(image):
+                self._set_state("ready", source="local")
+                return image
+            logger.info(f"Image {self.image} is outdated; pulling the registry version.")
+        else:
+            tarball = self._tarball_path()
+            if tarball is not None:
+                image = await self._load_tarball(tarball)
+                if image is not None:
+                    self._set_state("ready", source="tarball")
+                    return image
+
+        try:
+            await self._pull()
+            pulled = await self._inspect_local()
+            if pulled is None:
+                raise DockerAPIError(f"Image {self.image} not found after pulling it.")
+        except DockerAPIError as e:
+            if image is not None:
+                # The outdated local image still works.
+                logger.warning(f"Could not update image {self.image}, keeping the local one: {e}")
+                self._set_state("ready", source="local")
+                return image
+            logger.error(f"Image {self.image} is not available: {e}")
+            self._set_state("missing", error=str(e))
+            raise
+        self._set_state("ready", source="registry")
+        return pulled
+
+    async def _inspect_local(self) -> Optional[Dict[str, Any]]:
+        try:
+            image = await self._docker.inspect_image(self.image)
+        except DockerNotFound:
+            logger.warning(f"Image {self.image} is not available locally.")
+            return None
+        self._info.update(id=image["Id"], digest=self._repo_digest(image))
+        return image
+
+    async def _is_current(self, image: Dict[str, Any]) -> bool:
+        """
+        Returns whether the local image has the digest the registry serves for its tag.
+        Unreachable registries count as current, so the robot works offline.
+        """
+        try:
+            remote_digest = await self._docker.distribution_digest(self.image)
+        except DockerAPIError as e:
+            logger.info(f"Could not check image {self.image} against the registry: {e}")
+            return True
+        return remote_digest == self._repo_digest(image)
+
+    def _repo_digest(self, image: Dict[str, Any]) -> Optional[str]:
+        repository, _ = split_image_reference(self.image)
+        for repo_digest in image.get("RepoDigests") or []:
+            name, _, digest = repo_digest.partition("@")
+            if name == repository:
+                return digest
+        return None
+
+    def _tarball_path(self) -> Optional[str]:
+        tarball = self._config.get("container_image_tarball")
+        if not tarball:
+            return None
+        path = os.path.join(self._config["mowbot_legacy_data_path"], tarball)
+        return path if os.path.isfile(path) else None
+
+    async def _load_tarball(self, path: str) -> Optional[Dict[str, Any]]:
+        logger.info(f"Loading image {self.image} from {path}.")
+        self._set_state("loading", tarball=path)
+        try:
+            async for message in self._docker.load_image(path):
+                status = message.get("stream") or f"{message.get('status', '')} {message.get('id', '')}"
+                self._publish_progress(status.strip(), message.get("progressDetail") or {})
+            return await self._inspect_local()
+        except DockerAPIError as e:
+            logger.warning(f"Could not load image tarball {path}: {e}")
+            return None
+
+    async def _pull(self) -> None:
+        logger.info(f"Pulling image {self.image}.")
+        self._set_state("pulling")
+        layers: Dict[str, Dict[str, int]] = {}  # layer id -> current and total download bytes
+        done = set()
+        async for message in self._docker.pull_image(self.image):
+            layer, status = message.get("id"), message.get("status", "")
+            detail = message.get("progressDetail") or {}
+            if layer and status == "Downloading" and detail.get("total"):
+                layers[layer] = {'current': detail.get("current", 0), 'total': detail["total"]}
+            elif layer and status in ("Download complete", "Pull complete", "Already exists"):
+                done.add(layer)
+                if layer in layers:
+                    layers[layer]['current'] = layers[layer]['total']
+            elif layer and status == "Pulling fs layer":
+                layers.setdefault(layer, {'current': 0, 'total': 0})
+            self._publish_progress(
+                f"{status} {layer}" if layer else status,
+                {
+                    'current': sum(entry['current'] for entry in layers.values()),
+                    'total': sum(entry['total'] for entry in layers.values()),
+                    'layers_done': len(done),
+                    'layers': len(layers),
+                },
+            )
+
+    def _publish_progress(self, status: str, detail: Dict[str, Any]) -> None:
+        progress = {key: detail[key] for key in ('current', 'total', 'layers_done', 'layers') if key in detail}
+        progress['status'] = status
+        self._progress_coalescer.publish("progress", progress)
+
+    def _set_state(self, state: str, **info: Any) -> None:
+        self._state = state
+        self._info = {key: value for key, value in self._info.items() if key in ('image', 'id', 'digest')}
+        self._info.update(info)
+        logger.info(f"Image {self.image} {state}: {self._info}")
+        self.signal_image_state.emit(state, dict(self._info))
+
+    @pyqtSlot(str, dict)
+    def _on_image_state(self, state: str, _info: dict):
+        if state in ("ready", "missing"):
+            self._progress_coalescer.stop()
@@ -0,0 +1,502 @@
+# foxglove_connection.py
+import asyncio
+import json
+import logging
+import random
+import struct
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+import websockets
+
+from app.utils.cdr_decoder import MessageDecoder
+from app.utils.logger import logger
+
+if TYPE_CHECKING:
+    from app.models.foxglove_ws_model import FoxgloveWsModel
+
+
+class BinaryFrame(NamedTuple):
+    """A message data frame queued for decoding."""
+    connection: 'FoxgloveConnection'
+    subscription_id: int
+    timestamp: int  # Frame timestamp (ns)
+    payload: memoryview
+    receive_ns: int  # Local time the frame was read from the socket
+    clock_offset_ns: int = 0  # Added to robot-side stamps; shifts replayed frames to now
+
+
+class SessionCache(NamedTuple):
+    """Channels and subscriptions of a closed connection, restored if the server session is unchanged."""
+    session_id: str
+    channels: Dict[int, Dict[str, Any]]
+    channel_decoders: Dict[int, MessageDecoder]
+    channel_subs: Dict[int, int]  # Subscription ID per channel ID
+
+
+class FoxgloveConnection:
+    """
+    One robot's Foxglove WebSocket connection: the reconnect supervisor, the
+    protocol ops and the robot's channel and subscription tables.
+    Runs on the event loop of the owning FoxgloveWsModel, which decodes the
+    frames and shares compiled decoders, decode workers and signals between robots.
+    """
+
+    # Values of the connection state.
+    CONNECTION_STATES = ("disconnected", "connecting", "connected", "reconnecting")
+
+    # Advertisement fields that must match for a channel to be considered unchanged.
+    CHANNEL_IDENTITY_FIELDS = ("topic", "encoding", "schemaName", "schemaEncoding", "schema")
+
+    # Binary message header: opcode (uint8), subscriptionId (uint32), timestamp (uint64).
+    BINARY_HEADER = struct.Struct('<BIQ')
+    # Binary time message: opcode (uint8), timestamp (uint64).
+    BINARY_TIME = struct.Struct('<BQ')
+
+    # Server binary opcodes.
+    OPCODE_MESSAGE_DATA = 0x01
+    OPCODE_TIME = 0x02
+
+    # Log levels of the `status` op (0: info, 1: warning, 2: error).
+    STATUS_LOG_LEVELS = {0: logging.INFO, 1: logging.WARNING, 2: logging.ERROR}
+
+    def __init__(self, model: 'FoxgloveWsModel', robot_id: str, uri: str, config: Dict[str, Any]):
+        """
+        Initializes the FoxgloveConnection.
+
+        Args:
+            model (FoxgloveWsModel): The model owning the event loop and decode path.
+            robot_id (str): The robot the connection belongs to.
+            uri (str): The Foxglove WebSocket server of the robot.
+            config (Dict[str, Any]): Application configuration (subprotocol, timeouts, backoff).
+        """
+        self._model = model
+        self.robot_id = robot_id
+        self.uri = uri
+        self._config = config
+        self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.task: Optional[asyncio.Task] = None
+
+        # Reconnect backoff: full jitter over min(max_delay, initial_delay * factor ** (retry - 1)).
+        self.max_retries = config.get('foxglove_reconnect_max_retries', 0)  # 0: until stopped
+        self.backoff_factor = config.get('foxglove_reconnect_backoff_factor', 2.0)
+        self.backoff_initial_s = config.get('foxglove_reconnect_initial_delay_s', 0.25)
+        self.backoff_max_s = config.get('foxglove_reconnect_max_delay_s', 10.0)
+        self.current_retries = 0
+        self.should_reconnect = True
+        self.connection_state = "disconnected"
+
+        # Subscriptions of the last connection, kept across reconnects.
+        self._session_cache: Optional[SessionCache] = None
+        self.reset_session()
+
+    def reset_session(self) -> None:
+        """
+        Forgets the channels and subscriptions of the previous connection.
+        """
+        self.ws_subs: Dict[int, Dict[str, Any]] = {}  # Subscribed channel per subscription ID
+        self.ws_decoders: Dict[int, MessageDecoder] = {}  # Compiled CDR decoder per subscription
+        self.ws_channels: Dict[int, Dict[str, Any]] = {}  # Advertised channels of configured topics
+        self.channel_subs: Dict[int, int] = {}  # Subscription ID per subscribed channel ID
+        self._channel_decoders: Dict[int, MessageDecoder] = {}
+        self._next_subscription_id = 1
+        self.last_accepted: Dict[int, float] = {}  # Receive time of the last accepted message
+        self.recorded_channels: Dict[int, int] = {}  # Recording channel ID per subscription ID
+
+        # Announced by the server in `serverInfo`.
+        self.server_info: Dict[str, Any] = {}
+        self.server_capabilities: Tuple[str, ...] = ()
+        self.server_time_ns: Optional[int] = None  # Latest server time, if it publishes one
+
+    def clear_session_cache(self) -> None:
+        self._session_cache = None
+
+    def topic_label(self, topic: str) -> str:
+        """
+        Returns `topic` prefixed with the robot ID, except for the primary robot.
+        """
+        return topic if self._model.is_primary(self) else f"/{self.robot_id}{topic}"
+
+    async def supervise(self) -> None:
+        """
+        Keeps a connection to the WebSocket server until stopped.
+        Runs one connection at a time in a loop instead of recursing, and waits a
+        jittered, capped backoff between attempts. The retry count is reset once a
+        connection is established, so a dropout is retried after a short delay.
+        """
+        while self.should_reconnect:
+            self._set_state("connecting" if self.current_retries == 0 else "reconnecting")
+            try:
+                self.ws = await websockets.connect(
+                    self.uri,
+                    subprotocols=[self._config['foxglove_ws_subprotocol']],
+                    open_timeout=self._config.get('foxglove_ws_open_timeout_s', 3.0),
+                    ping_interval=self._config.get('foxglove_ws_ping_interval_s', 2.0),
+                    ping_timeout=self._config.get('foxglove_ws_ping_timeout_s', 2.0),
+                    max_size=None,
+                )
+            except Exception as e:
+                logger.error(f"[{self.robot_id}] Error during WebSocket connection: {e}")
+            else:
+                logger.info(f"[{self.robot_id}] Connected to Foxglove WebSocket server at {self.uri}")
+                self.current_retries = 0
+                self.reset_session()  # The server advertises its channels again
+                self._set_state("connected")
+                try:
+                    await self._listen()
+                finally:
+                    self._cache_session()
+                    await self.close()
+                if self.should_reconnect:
+                    logger.warning(f"[{self.robot_id}] Connection to {self.uri} lost.")
+
+            if not self.should_reconnect:
+                break
+            self.current_retries += 1
+            if self.max_retries > 0 and self.current_retries > self.max_retries:
+                logger.error(f"[{self.robot_id}] Max retries reached. Could not connect to the server.")
+                break
+            delay = self._backoff_delay(self.current_retries)
+            logger.info(
+                f"[{self.robot_id}] Retrying connection in {delay:.2f} seconds... (attempt {self.current_retries})")
+            self._set_state("reconnecting")
+            await asyncio.sleep(delay)
+        self._set_state("disconnected")
+
+    def _backoff_delay(self, retry: int) -> float:
+        """
+        Returns the wait before reconnect attempt `retry` (1-based): uniformly random
+        up to the exponential backoff, capped at `backoff_max_s`, so clients that lost
+        the server at the same time do not reconnect in lockstep.
+        """
+        ceiling = min(self.backoff_max_s, self.backoff_initial_s * self.backoff_factor ** (retry - 1))
+        return random.uniform(0.0, ceiling)
+
+    def _set_state(self, state: str) -> None:
+        """
+        Updates the connection state and reports changes to the model.
+        """
+        if state != self.connection_state:
+            self.connection_state = state
+            self._model.on_connection_state(self, state)
+
+    async def _listen(self) -> None:
+        """
+        Listens for incoming messages until the connection closes.
+        Binary frames are only handed to the decode workers here, so reading the
+        socket never waits on decoding.
+        """
+        try:
+            async for message in self.ws:
+                if isinstance(message, bytes):
+                    self._submit_binary_message(message)
+                else:
+                    await self._handle_message(message)
+        except websockets.exceptions.ConnectionClosed as e:
+            logger.debug(f"[{self.robot_id}] Connection closed: {e}")
+        except Exception as e:
+            logger.error(f"[{self.robot_id}] Unexpected error in listen: {e}")
+
+    def _cache_session(self) -> None:
+        """
+        Keeps the channels and subscriptions of the connection that just closed, so
+        they can be restored in one `subscribe` if the server session is unchanged.
+        """
+        session_id = self.server_info.get("sessionId")
+        if session_id and self.ws_channels:
+            self._session_cache = SessionCache(
+                session_id, dict(self.ws_channels), dict(self._channel_decoders), dict(self.channel_subs))
+
+    async def _restore_session(self) -> None:
+        """
+        Resubscribes to the cached channels right after `serverInfo` if the server
+        reports the same session, without waiting for its advertisements. Channels
+        advertised afterwards with identical definitions are kept as they are.
+        """
+        cache, self._session_cache = self._session_cache, None
+        if cache is None or cache.session_id != self.server_info.get("sessionId"):
+            return
+        self.ws_channels = dict(cache.channels)
+        self._channel_decoders = dict(cache.channel_decoders)
+        self._model.on_channels_changed(self)
+        subscriptions = []
+        for channel_id, subscription_id in sorted(cache.channel_subs.items(), key=lambda item: item[1]):
+            if channel_id not in self.ws_channels or \
+                    not self._model.is_topic_wanted(self.ws_channels[channel_id].get("topic")):
+                continue
+            self.channel_subs[channel_id] = subscription_id
+            self.ws_subs[subscription_id] = self.ws_channels[channel_id]
+            self.ws_decoders[subscription_id] = self._channel_decoders[channel_id]
+            subscriptions.append({"id": subscription_id, "channelId": channel_id})
+        self._next_subscription_id = max(cache.channel_subs.values(), default=0) + 1
+        if subscriptions:
+            await self._send({"op": "subscribe", "subscriptions": subscriptions})
+            logger.info(
+                f"[{self.robot_id}] Resubscribed to topics of the previous session: "
+                f"{[self.ws_subs[sub['id']].get('topic') for sub in subscriptions]}")
+        await self.sync_subscriptions()  # Panel changes made while disconnected.
+
+    async def _handle_message(self, message: str) -> None:
+        """
+        Processes incoming JSON messages.
+
+        Args:
+            message (str): The incoming message.
+        """
+        try:
+            parsed_message = json.loads(message)
+            logger.debug(f"[{self.robot_id}] Received JSON message: {parsed_message}")
+
+            op = parsed_message.get("op")
+            if op:
+                await self._trigger_op_event(op, parsed_message)
+        except json.JSONDecodeError as e:
+            logger.error(f"[{self.robot_id}] JSON decode error: {e}")
+        except Exception as e:
+            logger.error(f"[{self.robot_id}] Error processing message: {e}")
+
+    async def _trigger_op_event(self, op: str, message: Dict[str, Any]) -> None:
+        """
+        Triggers events based on the operation type within the message.
+
+        Args:
+            op (str): The operation type.
+            message (Dict[str, Any]): The JSON message.
+        """
+        if op == "serverInfo":
+            self._handle_server_info(message)
+            await self._restore_session()
+        elif op == "advertise":
+            await self.handle_advertised_channels(message)
+        elif op == "unadvertise":
+            await self._handle_unadvertised_channels(message)
+        elif op == "status":
+            level = self.STATUS_LOG_LEVELS.get(message.get("level"), logging.INFO)
+            logger.log(level, f"[{self.robot_id}] Foxglove server status: {message.get('message')}")
+        elif op == "removeStatus":
+            logger.debug(f"[{self.robot_id}] Foxglove server removed status: {message.get('statusIds')}")
+        else:
+            logger.debug(f"[{self.robot_id}] Ignoring unsupported op: {op}")
+
+    def _handle_server_info(self, message: Dict[str, Any]) -> None:
+        """
+        Stores the server's name, capabilities and metadata.
+
+        Args:
+            message (Dict[str, Any]): The `serverInfo` message.
+        """
+        self.server_info = message
+        self.server_capabilities = tuple(message.get("capabilities", ()))
+        logger.info(
+            f"[{self.robot_id}] Foxglove server '{message.get('name')}' "
+            f"capabilities: {list(self.server_capabilities)}")
+
+    def has_capability(self, capability: str) -> bool:
+        """
+        Returns whether the connected server announced `capability` in `serverInfo`.
+        """
+        return capability in self.server_capabilities
+
+    def _parse_binary_message(self, message: bytes) -> Optional[BinaryFrame]:
+        """
+        Parses the header of a binary message.
+        The frame is only accessed through a memoryview, so the payload is never copied.
+
+        Args:
+            message (bytes): The binary message received.
+
+        Returns:
+            Optional[BinaryFrame]: The frame, or None if invalid.
+        """
+        receive_ns = time.time_ns()
+        if message and message[0] == self.OPCODE_TIME and len(message) >= self.BINARY_TIME.size:
+            self._handle_time(message)
+            return None
+        if len(message) < self.BINARY_HEADER.size:
+            logger.warning(f"[{self.robot_id}] Received binary message is too short.")
+            return None
+
+        # Decode opcode, subscriptionId, and timestamp from the binary message.
+        frame = memoryview(message)
+        opcode, subscription_id, timestamp = self.BINARY_HEADER.unpack_from(frame)
+        if opcode != self.OPCODE_MESSAGE_DATA:
+            logger.warning(f"[{self.robot_id}] Unexpected opcode: {opcode}")
+            return None
+        return BinaryFrame(self, subscription_id, timestamp, frame[self.BINARY_HEADER.size:], receive_ns)
+
+    def _handle_time(self, message: bytes) -> None:
+        """
+        Records the server time published by servers with the `time` capability.
+
+        Args:
+            message (bytes): The binary time message.
+        """
+        if not self.has_capability("time"):
+            logger.debug(f"[{self.robot_id}] Received time message from a server without the 'time' capability.")
+        _, self.server_time_ns = self.BINARY_TIME.unpack_from(message)
+
+    def _submit_binary_message(self, message: bytes) -> None:
+        """
+        Hands a binary message to the model for recording and decoding.
+
+        Args:
+            message (bytes): The binary message received.
+        """
+        try:
+            frame = self._parse_binary_message(message)
+            if frame is not None:
+                self._model.submit_frame(frame)
+        except struct.error as e:
+            logger.error(f"[{self.robot_id}] Error decoding binary message header: {e}")
+
+    async def handle_advertised_channels(self, message: Dict[str, Any]) -> None:
+        """
+        Processes channel advertisement messages by compiling decoders for the configured
+        topics and subscribing to those the visible panel needs. A channel advertised
+        again under a known ID replaces the previous one unless its definition is unchanged.
+
+        Args:
+            message (Dict[str, Any]): The JSON message advertising channels.
+        """
+        channels = [
+            channel for channel in message.get("channels", [])
+            if not self._is_known_channel(channel)
+        ]
+        replaced = [channel.get("id") for channel in channels if channel.get("id") in self.ws_channels]
+        if replaced:
+            await self._drop_channels(replaced, unsubscribe=True)
+        for channel in channels:
+            channel_id = channel.get("id")
+            decoder = self._model.channel_decoder(channel)
+            if decoder is None:
+                continue
+            self.ws_channels[channel_id] = channel
+            self._channel_decoders[channel_id] = decoder
+        self._model.on_channels_changed(self)
+        await self.sync_subscriptions()
+
+    def _is_known_channel(self, channel: Dict[str, Any]) -> bool:
+        """
+        Returns whether `channel` is already known under its ID with the same definition.
+        """
+        known = self.ws_channels.get(channel.get("id"))
+        return known is not None and all(
+            known.get(field) == channel.get(field) for field in self.CHANNEL_IDENTITY_FIELDS)
+
+    async def _handle_unadvertised_channels(self, message: Dict[str, Any]) -> None:
+        """
+        Forgets channels the server no longer advertises. The server drops their
+        subscriptions itself, so no `unsubscribe` is sent.
+
+        Args:
+            message (Dict[str, Any]): The JSON message unadvertising channels.
+        """
+        await self._drop_channels(message.get("channelIds", []), unsubscribe=False)
+
+    async def _drop_channels(self, channel_ids: List[int], unsubscribe: bool) -> None:
+        """
+        Removes channels together with their decoders and subscriptions.
+
+        Args:
+            channel_ids (List[int]): The channels to remove.
+            unsubscribe (bool): Whether to send `unsubscribe` for their subscriptions.
+        """
+        subscription_ids = []
+        for channel_id in channel_ids:
+            channel = self.ws_channels.pop(channel_id, None)
+            self._channel_decoders.pop(channel_id, None)
+            subscription_id = self.channel_subs.pop(channel_id, None)
+            if subscription_id is not None:
+                subscription_ids.append(subscription_id)
+                self._forget_subscription(subscription_id)
+            if channel is not None:
+                logger.info(f"[{self.robot_id}] Channel {channel_id} ({channel.get('topic')}) removed.")
+        self._model.on_channels_changed(self)
+        if unsubscribe and subscription_ids:
+            await self._send({"op": "unsubscribe", "subscriptionIds": subscription_ids})
+
+    def _forget_subscription(self, subscription_id: int) -> None:
+        """
+        Removes the local state of a subscription. Frames still in flight for it are ignored.
+        """
+        self.ws_subs.pop(subscription_id, None)
+        self.ws_decoders.pop(subscription_id, None)
+        self.last_accepted.pop(subscription_id, None)
+
+    async def sync_subscriptions(self) -> None:
+        """
+        Subscribes to the advertised channels whose topics are wanted and
+        unsubscribes from those that are not, with one op each.
+        Subscription IDs are never reused within a connection, so frames of
+        a dropped subscription cannot be routed to a new one.
+        """
+        wanted = {
+            channel_id for channel_id, channel in self.ws_channels.items()
+            if self._model.is_topic_wanted(channel.get("topic"))
+        }
+
+        subscriptions = []
+        for channel_id in sorted(wanted - set(self.channel_subs)):
+            subscription_id = self._next_subscription_id
+            self._next_subscription_id += 1
+            self.channel_subs[channel_id] = subscription_id
+            self.ws_subs[subscription_id] = self.ws_channels[channel_id]
+            self.ws_decoders[subscription_id] = self._channel_decoders[channel_id]
+            subscriptions.append({"id": subscription_id, "channelId": channel_id})
+        if subscriptions:
+            await self._send({"op": "subscribe", "subscriptions": subscriptions})
+            logger.info(
+                f"[{self.robot_id}] Subscribed to topics: "
+                f"{[self.ws_subs[sub['id']].get('topic') for sub in subscriptions]}")
+
+        unwanted = sorted(set(self.channel_subs) - wanted)
+        if unwanted:
+            subscription_ids = []
+            for channel_id in unwanted:
+                subscription_id = self.channel_subs.pop(channel_id)
+                subscription_ids.append(subscription_id)
+                self._forget_subscription(subscription_id)
+            await self._send({"op": "unsubscribe", "subscriptionIds": subscription_ids})
+            logger.info(
+                f"[{self.robot_id}] Unsubscribed from topics: "
+                f"{[self.ws_channels[cid].get('topic') for cid in unwanted]}")
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        """
+        Sends a JSON message to the WebSocket server.
+
+        Args:
+            message (Dict[str, Any]): The message to be sent.
+        """
+        try:
+            if self.ws:
+                await self.ws.send(json.dumps(message))
+                logger.debug(f"[{self.robot_id}] Sent message: {message}")
+            elif self._model.is_replaying():
+                logger.debug(f"Replaying, not sent: {message}")
+            else:
+                logger.warning(f"[{self.robot_id}] WebSocket is not open. Cannot send message.")
+        except Exception as e:
+            logger.error(f"[{self.robot_id}] Error sending message: {e}")
+
+    async def send_message(self, message: Dict[str, Any]) -> None:
+        """
+        Public method to send a message to the WebSocket server.
+
+        Args:
+            message (Dict[str, Any]): The message dictionary to send.
+        """
+        await self._send(message)
+
+    async def close(self) -> None:
+        """
+        Closes the current WebSocket connection, if any.
+        """
+        ws, self.ws = self.ws, None
+        if ws is None:
+            return
+        try:
+            await ws.close()
+            logger.info(f"[{self.robot_id}] Disconnected from Foxglove WebSocket server")
+        except Exception as e:
+            logger.error(f"[{self.robot_id}] Error during disconnect: {e}")
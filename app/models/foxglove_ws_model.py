@@ -1,38 +1,80 @@
 # foxglove_ws_model.py
 import asyncio
-import websockets
-import json
+import os
 import struct
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
 
 
 from PyQt5.QtCore import pyqtSignal, QThread, QObject
 from app.utils.logger import logger  # Ensure this is a configured logger
-from app.utils.cdr_decoder import decode_imu, decode_navsatfix, decode_sensorstatus
+from app.utils.signal_coalescer import SignalCoalescer
+from app.utils.decode_pool import DecodeWorkerPool
+from app.utils.latency_stats import LatencyMonitor, LatencySample
+from app.utils.mcap_reader import McapFormatError, McapReader
+from app.utils.mcap_writer import McapRecorder
+from app.utils.cdr_decoder import (
+    BUILTIN_SCHEMAS,
+    MessageDecoder,
+    SchemaError,
+    compile_schema,
+    get_builtin_decoder,
+)
+from app.models.foxglove_connection import BinaryFrame, FoxgloveConnection
 
 class FoxgloveWsModel(QObject):
     """
-    Model class for handling WebSocket communication with the Foxglove server.
-    This singleton Model maintains the connection, handles message decoding,
-    and emits signals with data updates that can be consumed by the Controller.
+    Model class for handling WebSocket communication with the Foxglove servers.
+    This singleton Model maintains one connection per robot on a single event loop,
+    decodes the frames of all robots on shared worker threads with shared compiled
+    decoders, and emits signals with data updates that can be consumed by the Controller.
+
+    The primary robot (`foxglove_robot_id` at `foxglove_ws_uri`) drives the untagged
+    signals; every robot, the primary one included, drives the `signal_robot_*`
+    signals tagged with its ID. Further robots are listed in `foxglove_fleet`.
     """
-    
-    # Topics to subscribe to
-    SUBCRIBE_TOPICS = [
-        "/gps/heading",
-        "/gps/fix",
-        "/sensor_status",
-        "/gps/fix_filtered"
-    ]
-    
+
+    # Decoder choices of the `foxglove_topics` config table.
+    DECODER_CHOICES = ("projected", "full", "builtin")
+
+    # Accepted header.frame_id values per topic (raw bytes, compared without decoding).
+    HEADING_FRAME_IDS = (b"gps_left_link",)
+    GPS_FIX_FRAME_IDS = (b"gps_left_link", b"base_footprint")
+
+    # Fields each consumer actually reads; everything else is skipped while decoding.
+    TOPIC_PROJECTIONS = {
+        "/gps/heading": ("orientation",),
+        "/gps/fix_filtered": ("latitude", "longitude", "altitude"),
+        "/sensor_status": ("status.name", "status.message"),
+    }
+
+    # Fixed-layout topics whose backlogged frames are decoded in one vectorized call.
+    BATCH_TOPICS = ("/gps/heading", "/gps/fix_filtered")
+    BATCH_DECODE_MIN_FRAMES = 8
+
+    # Values of signal_connection_state.
+    CONNECTION_STATES = FoxgloveConnection.CONNECTION_STATES
+
     # Singleton instance
     _instance = None
 
-    # PyQt signals for data updates
+    # PyQt signals for data updates of the primary robot
     signal_heading_quat = pyqtSignal(dict)
     signal_gps_fix = pyqtSignal(dict)
     signal_health_status = pyqtSignal(dict)
-    
+    signal_recording_state = pyqtSignal(bool, str)  # (recording, file path)
+    signal_replay_finished = pyqtSignal(dict)  # replay statistics
+    signal_connection_state = pyqtSignal(str)  # one of CONNECTION_STATES
+
+    # PyQt signals tagged with the robot ID, for every robot
+    signal_robot_heading_quat = pyqtSignal(str, dict)
+    signal_robot_gps_fix = pyqtSignal(str, dict)
+    signal_robot_health_status = pyqtSignal(str, dict)
+    signal_robot_connection_state = pyqtSignal(str, str)  # (robot ID, one of CONNECTION_STATES)
+    signal_robot_advertised_topics = pyqtSignal(str, list)  # (robot ID, advertised topics of foxglove_topics)
+
     @staticmethod
     def get_instance(config: Dict[str, Any]) -> 'FoxgloveWsModel':
         """
@@ -43,7 +85,7 @@ class FoxgloveWsModel(QObject):
         return FoxgloveWsModel._instance
 
     def __init__(
-            self, 
+            self,
             config: Dict[str, Any]
         ):
         """
@@ -58,14 +100,58 @@ class FoxgloveWsModel(QObject):
         super().__init__()
         self._config = config
         self._running = False
-        self.ws: Optional[websockets.WebSocketClientProtocol] = None
-        self.max_retries = config.get('max_retries', 5)
-        self.backoff_factor = config.get('backoff_factor', 2)
-        self.current_retries = 0
-        self.should_reconnect = True
         self.loop: Optional[asyncio.AbstractEventLoop] = None  # Reference to the event loop
+        self._main_task: Optional[asyncio.Task] = None  # Fleet of connections or replay
+        self._fleet_changed: Optional[asyncio.Event] = None  # Set when robots are added at runtime
 
-        self.ws_subs: Dict[int, Dict[str, Any]] = {}  # Store WebSocket subscription info
+        # Compiled decoders per channel definition, shared by all robots and reconnects.
+        self._decoder_cache: Dict[Tuple[Any, ...], Optional[MessageDecoder]] = {}
+
+        # Per-topic subscription table and the panel currently shown (None: all panels).
+        self._topic_cfg: Dict[str, Dict[str, Any]] = config.get('foxglove_topics', {})
+        self._active_panel: Optional[str] = None
+
+        # Binary frames of all robots are decoded off the event loop by worker threads.
+        self._decode_pool = DecodeWorkerPool(
+            self._handle_binary_messages,
+            num_workers=config.get('foxglove_decode_workers', 1),
+            queue_size=config.get('foxglove_decode_queue_size', 1024),
+            name="foxglove-decode",
+        )
+
+        # Raw frames of the subscribed channels can be recorded to MCAP files.
+        self._recorder = McapRecorder(
+            os.path.join(config['mowbot_legacy_data_path'], 'recordings'),
+            chunk_size=config.get('foxglove_record_chunk_size', 1024 * 1024),
+        )
+
+        # Recording replayed instead of connecting to the server, see start_replay().
+        self._replay_path: Optional[str] = None
+        self._replay_speed = 1.0
+
+        # Decoded samples are parked here by the decode workers and published on the
+        # GUI thread at the UI rate. Not parented to self, so it stays on the GUI thread.
+        self._coalescer = SignalCoalescer(config.get('foxglove_ui_rate_hz', 15))
+        # Coalescer key -> (signal of the primary robot, robot-tagged signal)
+        self._coalesced_signals = {
+            'heading_quat': (self.signal_heading_quat, self.signal_robot_heading_quat),
+            'gps_fix': (self.signal_gps_fix, self.signal_robot_gps_fix),
+            'health_status': (self.signal_health_status, self.signal_robot_health_status),
+        }
+
+        # Per-topic latency from the robot stamps to the view update.
+        self.latency = LatencyMonitor()
+        self._coalescer.set_emitted_callback(self.latency.record_view)
+
+        # One connection per robot, the primary robot first.
+        self.primary_robot_id: str = config.get('foxglove_robot_id', 'mowbot')
+        self._connections: Dict[str, FoxgloveConnection] = {}
+        self._add_connection(self.primary_robot_id, config['foxglove_ws_uri'])
+        for robot in config.get('foxglove_fleet') or []:
+            if not robot.get('id') or not robot.get('uri') or robot['id'] in self._connections:
+                logger.warning(f"Ignoring invalid or duplicate foxglove_fleet entry: {robot}")
+                continue
+            self._add_connection(robot['id'], robot['uri'])
 
         # Setup QThread for asynchronous WebSocket handling.
         self.thread = QThread()
@@ -80,9 +166,14 @@ class FoxgloveWsModel(QObject):
         """
         if not self.thread.isRunning():
             self._running = True
-            self.should_reconnect = True
-            self.current_retries = 0
-            self.ws_subs = {}  # Reset subscriptions
+            for connection in self._connections.values():
+                connection.should_reconnect = True
+                connection.current_retries = 0
+                connection.reset_session()
+                connection.clear_session_cache()
+            self.latency.reset()
+            self._coalescer.start()
+            self._decode_pool.start()
             self.thread.start()
             logger.info("FoxgloveWsModel thread started.")
         else:
@@ -93,23 +184,222 @@ class FoxgloveWsModel(QObject):
         Stops the WebSocket Model and its associated thread gracefully.
         """
         self._running = False
-        self.should_reconnect = False
-        if self.ws and self.loop and not self.loop.is_closed():
-            # Schedule the disconnect coroutine on the event loop.
-            future = asyncio.run_coroutine_threadsafe(self._ws_disconnect(), self.loop)
+        for connection in self._connections.values():
+            connection.should_reconnect = False
+        loop, task = self.loop, self._main_task
+        if loop and task and not loop.is_closed():
+            # The cancelled connections close their sockets on their way out, then the loop finishes.
             try:
-                future.result(timeout=1)
-            except asyncio.TimeoutError:
-                logger.warning("Disconnect coroutine timed out.")
-            except Exception as e:
-                logger.error(f"Error during disconnect: {e}")
-        else:
-            logger.warning("Event loop is closed or not available.")
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # The loop closed in the meantime.
         self.thread.quit()
         self.thread.wait()
+        self.stop_recording()
+        self._decode_pool.stop()
+        logger.info(f"Foxglove decode stats: {self._decode_pool.stats()}")
+        self._coalescer.stop()
         logger.info("FoxgloveWsModel thread stopped.")
         self.loop = None
-        self.ws = None
+        self._replay_path = None
+        for connection in self._connections.values():
+            connection.ws = None
+            connection.task = None
+            self.on_connection_state(connection, "disconnected")
+            connection.connection_state = "disconnected"
+
+    @property
+    def primary(self) -> FoxgloveConnection:
+        """
+        The connection of the primary robot.
+        """
+        return self._connections[self.primary_robot_id]
+
+    @property
+    def connection_state(self) -> str:
+        """
+        The connection state of the primary robot.
+        """
+        return self.primary.connection_state
+
+    def has_capability(self, capability: str) -> bool:
+        """
+        Returns whether the primary robot's server announced `capability` in `serverInfo`.
+        """
+        return self.primary.has_capability(capability)
+
+    def is_primary(self, connection: FoxgloveConnection) -> bool:
+        """
+        Returns whether `connection` belongs to the primary robot.
+        """
+        return connection.robot_id == self.primary_robot_id
+
+    def robot_ids(self) -> List[str]:
+        """
+        Returns the IDs of all robots, the primary robot first.
+        """
+        return list(self._connections)
+
+    def robot_connection_state(self, robot_id: str) -> Optional[str]:
+        """
+        Returns the connection state of a robot, or None for unknown robots.
+        """
+        connection = self._connections.get(robot_id)
+        return connection.connection_state if connection else None
+
+    def add_robot(self, robot_id: str, uri: str) -> bool:
+        """
+        Adds a robot to monitor. If the Model is running, it connects right away on
+        the shared event loop. Safe to call from the GUI thread.
+
+        Args:
+            robot_id (str): Unique robot ID used to tag its signals.
+            uri (str): The robot's Foxglove WebSocket server.
+
+        Returns:
+            bool: False if a robot with this ID already exists.
+        """
+        if robot_id in self._connections:
+            logger.warning(f"Robot {robot_id} is already monitored.")
+            return False
+        connection = self._add_connection(robot_id, uri)
+        if self._running and not self._replay_path and self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._start_connection, connection)
+        logger.info(f"Robot {robot_id} added at {uri}.")
+        return True
+
+    def remove_robot(self, robot_id: str) -> bool:
+        """
+        Disconnects and forgets a robot. The primary robot cannot be removed.
+        Safe to call from the GUI thread.
+
+        Args:
+            robot_id (str): The robot to remove.
+
+        Returns:
+            bool: False if the robot is unknown or the primary robot.
+        """
+        if robot_id == self.primary_robot_id or robot_id not in self._connections:
+            logger.warning(f"Cannot remove robot {robot_id}.")
+            return False
+        connection = self._connections.pop(robot_id)
+        connection.should_reconnect = False
+        for key in self._coalesced_signals:
+            self._coalescer.unregister((robot_id, key))
+        if connection.task is not None and self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(connection.task.cancel)
+        self.signal_robot_connection_state.emit(robot_id, "disconnected")
+        logger.info(f"Robot {robot_id} removed.")
+        return True
+
+    def _add_connection(self, robot_id: str, uri: str) -> FoxgloveConnection:
+        """
+        Creates the connection of a robot and registers its coalesced signals.
+        """
+        connection = FoxgloveConnection(self, robot_id, uri, self._config)
+        self._connections[robot_id] = connection
+        for key, (primary_signal, robot_signal) in self._coalesced_signals.items():
+            if robot_id == self.primary_robot_id:
+                self._coalescer.register((robot_id, key), primary_signal)
+            self._coalescer.register((robot_id, key), robot_signal, robot_id)
+        return connection
+
+    def on_connection_state(self, connection: FoxgloveConnection, state: str) -> None:
+        """
+        Emits the connection state signals. Called by the connections.
+        """
+        self.signal_robot_connection_state.emit(connection.robot_id, state)
+        if self.is_primary(connection):
+            self.signal_connection_state.emit(state)
+
+    def on_channels_changed(self, connection: FoxgloveConnection) -> None:
+        """
+        Emits the configured topics a robot's server advertises. Called by the connections.
+        """
+        topics = sorted({channel.get("topic") for channel in connection.ws_channels.values()})
+        self.signal_robot_advertised_topics.emit(connection.robot_id, topics)
+
+    def set_active_panel(self, panel: str) -> None:
+        """
+        Sets the panel currently shown and updates the subscriptions to the topics it needs.
+        Safe to call from the GUI thread.
+
+        Args:
+            panel (str): Name of the visible panel.
+        """
+        self._active_panel = panel
+        if not (self.loop and self.loop.is_running()):
+            return
+        for connection in list(self._connections.values()):
+            if connection.ws or (self._replay_path and self.is_primary(connection)):
+                asyncio.run_coroutine_threadsafe(connection.sync_subscriptions(), self.loop)
+
+    def start_recording(self) -> None:
+        """
+        Starts recording the raw frames of all subscribed channels to a new MCAP file
+        under `mowbot_legacy_data_path`/recordings. Topics of robots other than the
+        primary one are prefixed with the robot ID.
+        """
+        if self._recorder.is_recording():
+            logger.warning("Recording is already running.")
+            return
+        try:
+            for connection in self._connections.values():
+                connection.recorded_channels = {}
+            path = self._recorder.start()
+        except OSError as e:
+            logger.error(f"Could not start recording: {e}")
+            self.signal_recording_state.emit(False, "")
+            return
+        self.signal_recording_state.emit(True, path)
+
+    def stop_recording(self) -> None:
+        """
+        Stops the recording and finalizes its indexes.
+        """
+        if not self._recorder.is_recording():
+            return
+        self._recorder.stop()
+        self.signal_recording_state.emit(False, self._recorder.path)
+
+    def is_recording(self) -> bool:
+        """
+        Returns whether frames are being recorded.
+        """
+        return self._recorder.is_recording()
+
+    def is_topic_wanted(self, topic: str) -> bool:
+        """
+        Returns whether `topic` is enabled and needed by the visible panel.
+        """
+        topic_cfg = self._topic_cfg.get(topic)
+        if not topic_cfg or not topic_cfg.get('enabled', False):
+            return False
+        panels = topic_cfg.get('panels')
+        return panels is None or self._active_panel is None or self._active_panel in panels
+
+    def _accept_rate(self, connection: FoxgloveConnection, subscription_id: int) -> bool:
+        """
+        Limits delivery to the topic's `max_rate_hz`. The protocol has no server-side
+        throttling, so excess messages are dropped here before they are decoded.
+        Replays at max speed decode every message, so they measure the full pipeline.
+
+        Args:
+            connection (FoxgloveConnection): The connection the message arrived on.
+            subscription_id (int): The subscription the message belongs to.
+
+        Returns:
+            bool: True if the message should be processed.
+        """
+        topic = connection.ws_subs.get(subscription_id, {}).get('topic')
+        max_rate_hz = self._topic_cfg.get(topic, {}).get('max_rate_hz') or 0
+        if max_rate_hz <= 0 or (self._replay_path and self._replay_speed == 0):
+            return True
+        now = time.monotonic()
+        if now - connection.last_accepted.get(subscription_id, float('-inf')) < 1.0 / max_rate_hz:
+            return False
+        connection.last_accepted[subscription_id] = now
+        return True
 
     def _run_websocket(self) -> None:
         """
@@ -118,212 +408,415 @@ class FoxgloveWsModel(QObject):
         loop = asyncio.new_event_loop()
         self.loop = loop
         asyncio.set_event_loop(loop)
+        self._main_task = loop.create_task(self._replay() if self._replay_path else self._run_fleet())
         try:
-            loop.run_until_complete(self._ws_connect())
+            loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logger.error(f"Error in _run_websocket: {e}")
         finally:
             loop.close()
 
-    async def _ws_connect(self) -> None:
+    async def _run_fleet(self) -> None:
         """
-        Connects to the WebSocket server with reconnection logic.
+        Runs the connection supervisor of every robot as a task on this loop and
+        returns once all of them have ended. Cancelling it cancels every connection.
         """
-        while self.should_reconnect and self.current_retries < self.max_retries:
-            try:
-                self.ws = await websockets.connect(
-                    self._config['foxglove_ws_uri'],
-                    subprotocols=[self._config['foxglove_ws_subprotocol']],
-                )
-                logger.info(f"Connected to Foxglove WebSocket server at {self._config['foxglove_ws_uri']}")
-                self.current_retries = 0  # Reset retry counter upon successful connection
-
-                # Begin listening for messages
-                await self._listen()
-            except Exception as e:
-                logger.error(f"Error during WebSocket connection: {e}")
-                self.current_retries += 1
-                if self.current_retries >= self.max_retries:
-                    logger.error("Max retries reached. Could not connect to the server.")
+        self._fleet_changed = asyncio.Event()
+        for connection in list(self._connections.values()):
+            self._start_connection(connection)
+        try:
+            while True:
+                tasks = {
+                    connection.task for connection in self._connections.values()
+                    if connection.task is not None and not connection.task.done()
+                }
+                if not tasks:
                     break
-                wait_time = self.backoff_factor ** self.current_retries
-                logger.info(f"Retrying connection in {wait_time} seconds... ({self.current_retries}/{self.max_retries})")
-                await asyncio.sleep(wait_time)
+                self._fleet_changed.clear()
+                changed = asyncio.ensure_future(self._fleet_changed.wait())
+                try:
+                    await asyncio.wait(tasks | {changed}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    changed.cancel()
+        finally:
+            tasks = [connection.task for connection in self._connections.values() if connection.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-    async def _listen(self) -> None:
+    def _start_connection(self, connection: FoxgloveConnection) -> None:
         """
-        Listens for incoming messages from the WebSocket server.
+        Starts the supervisor task of a connection. Runs on the event loop.
         """
-        try:
-            async for message in self.ws:
-                await self._handle_message(message)
-        except websockets.exceptions.ConnectionClosed as e:
-            logger.warning(f"Connection closed: {e}")
-            if self.should_reconnect:
-                await self._ws_connect()
-        except Exception as e:
-            logger.error(f"Unexpected error in listen: {e}")
-            if self.should_reconnect:
-                await self._ws_connect()
+        connection.should_reconnect = True
+        connection.task = asyncio.ensure_future(connection.supervise())
+        if self._fleet_changed is not None:
+            self._fleet_changed.set()
 
-    async def _handle_message(self, message: Any) -> None:
+    def start_replay(self, path: str, speed: float = 1.0) -> None:
         """
-        Processes incoming messages, handling both JSON and binary data.
+        Starts the Model with a recording as source instead of the WebSocket servers.
+        Recorded frames go through the primary robot's subscription, decode and signal path.
 
         Args:
-            message (Any): The incoming message.
+            path (str): The MCAP recording.
+            speed (float): Playback speed; 1.0 is real time, 0 replays as fast as
+                the decode workers keep up.
+        """
+        if self.thread.isRunning():
+            logger.warning("FoxgloveWsModel is running; stop it before replaying.")
+            return
+        self._replay_path = path
+        self._replay_speed = max(0.0, speed)
+        self.start()
+
+    def is_replaying(self) -> bool:
         """
+        Returns whether the Model is running on a recording.
+        """
+        return self._running and self._replay_path is not None
+
+    async def _replay(self) -> None:
+        """
+        Feeds the frames of the recording into the decode workers in log time order,
+        paced to the replay speed, and reports throughput when done.
+        """
+        path, speed = self._replay_path, self._replay_speed
+        connection = self.primary
         try:
-            if isinstance(message, bytes):
-                self._handle_binary_message(message)
-            else:
-                parsed_message = json.loads(message)
-                logger.info(f"Received JSON message: {parsed_message}")
-
-                op = parsed_message.get("op")
-                if op:
-                    await self._trigger_op_event(op, parsed_message)
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-        except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            reader = McapReader(path)
+        except (OSError, McapFormatError) as e:
+            logger.error(f"Cannot replay {path}: {e}")
+            return
+        logger.info(f"Replaying {path} at {'max' if speed == 0 else f'{speed}x'} speed.")
+
+        with reader:
+            channels = []
+            for channel in reader.channels.values():
+                schema = reader.schema_of(channel.id)
+                channels.append({
+                    "id": channel.id,
+                    "topic": channel.topic,
+                    "encoding": channel.message_encoding,
+                    "schemaName": schema.name if schema else "",
+                    "schemaEncoding": schema.encoding if schema else "",
+                    "schema": schema.data.decode("utf-8") if schema else "",
+                })
+            await connection.handle_advertised_channels({"op": "advertise", "channels": channels})
 
-    async def _trigger_op_event(self, op: str, message: Dict[str, Any]) -> None:
+            replayed = 0
+            started = time.monotonic()
+            first_log_time = None
+            for message in reader.iter_messages():
+                if not self._running:
+                    break
+                subscription_id = connection.channel_subs.get(message.channel_id)
+                if subscription_id is None:
+                    continue
+                if first_log_time is None:
+                    first_log_time = message.log_time
+                if speed > 0:
+                    due = started + (message.log_time - first_log_time) / 1e9 / speed
+                    while self._running and time.monotonic() < due:
+                        await asyncio.sleep(min(due - time.monotonic(), 0.1))
+                else:
+                    # Wait for the workers instead of letting the queues drop frames.
+                    while self._running and self._decode_pool.backlog() >= self._decode_pool.queue_size // 2:
+                        await asyncio.sleep(0.001)
+                    if replayed % 256 == 0:
+                        await asyncio.sleep(0)  # Let subscription changes and stop() through.
+                # Shift the recorded times to now, keeping the recorded publish-to-log delay.
+                receive_ns = time.time_ns()
+                self._decode_pool.submit((connection.robot_id, subscription_id), BinaryFrame(
+                    connection, subscription_id, message.publish_time, message.data, receive_ns,
+                    clock_offset_ns=receive_ns - message.log_time))
+                replayed += 1
+
+            while self._running and not self._decode_pool.is_idle():
+                await asyncio.sleep(0.01)
+            elapsed = time.monotonic() - started
+
+        stats = {
+            'messages': replayed,
+            'seconds': round(elapsed, 3),
+            'messages_per_second': round(replayed / elapsed, 1) if elapsed > 0 else 0.0,
+            **self.decode_stats(),
+        }
+        logger.info(f"Replay of {path} finished: {stats}")
+        self.signal_replay_finished.emit(stats)
+
+    def submit_frame(self, frame: BinaryFrame) -> None:
         """
-        Triggers events based on the operation type within the message.
+        Records a frame if recording and queues it for decoding, sharded by robot and
+        subscription so each subscription is decoded in order by a single worker.
+        Called by the connections on the event loop.
 
         Args:
-            op (str): The operation type.
-            message (Dict[str, Any]): The JSON message.
+            frame (BinaryFrame): The parsed frame.
         """
-        if op == "advertise":
-            await self._handle_advertised_channels(message)
-        elif op == "message":
-            # Process other operation types as needed
-            pass
+        if self._recorder.is_recording():
+            self._record(frame)
+        self._decode_pool.submit((frame.connection.robot_id, frame.subscription_id), frame)
 
-    def _handle_binary_message(self, message: bytes) -> None:
+    def _record(self, frame: BinaryFrame) -> None:
         """
-        Decodes and processes binary messages.
+        Queues the raw payload of a message for the recording, registering its channel first.
 
         Args:
-            message (bytes): The binary message received.
+            frame (BinaryFrame): The frame to record.
         """
-        try:
-            if len(message) < 13:
-                logger.warning("Received binary message is too short.")
+        connection = frame.connection
+        channel_id = connection.recorded_channels.get(frame.subscription_id)
+        if channel_id is None:
+            channel = connection.ws_subs.get(frame.subscription_id)
+            if channel is None:
                 return
-            
-            # Decode opcode, subscriptionId, and timestamp from the binary message.
-            opcode = message[0]
-            subscription_id = struct.unpack('<I', message[1:5])[0]
-            timestamp = struct.unpack('<Q', message[5:13])[0]
-            payload = message[13:]
-
-            if opcode != 0x01:
-                logger.warning(f"Unexpected opcode: {opcode}")
+            schema_name = channel.get("schemaName", "")
+            schema = channel.get("schema")
+            schema_encoding = channel.get("schemaEncoding", "ros2msg")
+            if not schema:
+                # Store the definition the payloads were decoded with, so the file is self-describing.
+                schema, schema_encoding = BUILTIN_SCHEMAS.get(schema_name, ""), "ros2msg"
+            channel_id = self._recorder.add_channel(
+                connection.topic_label(channel.get("topic")),
+                channel.get("encoding", "cdr"),
+                schema_name,
+                schema_encoding,
+                schema.encode("utf-8"),
+            )
+            connection.recorded_channels[frame.subscription_id] = channel_id
+        self._recorder.write(channel_id, frame.timestamp, frame.payload)
+
+    def _handle_binary_messages(self, messages: List[BinaryFrame]) -> None:
+        """
+        Decodes and processes the binary messages drained by a decode worker.
+        Payloads of fixed-layout topics that piled up are decoded with one vectorized
+        call per subscription. Runs on a decode worker thread.
+
+        Args:
+            messages (List[BinaryFrame]): The frames, oldest first.
+        """
+        frames: Dict[Tuple[FoxgloveConnection, int], List[BinaryFrame]] = {}
+        for frame in messages:
+            frames.setdefault((frame.connection, frame.subscription_id), []).append(frame)
+
+        for (connection, subscription_id), sub_frames in frames.items():
+            topic = connection.ws_subs.get(subscription_id, {}).get('topic')
+            decoder = connection.ws_decoders.get(subscription_id)
+            try:
+                if topic in self.BATCH_TOPICS and decoder is not None and decoder.supports_batch() \
+                        and len(sub_frames) >= self.BATCH_DECODE_MIN_FRAMES:
+                    self._handle_payload_batch(connection, subscription_id, sub_frames)
+                    continue
+                for frame in sub_frames:
+                    self._handle_payload(frame)
+            except struct.error as e:
+                logger.error(f"[{connection.robot_id}] Error decoding binary messages of {topic}: {e}")
+            except Exception as e:
+                logger.error(f"[{connection.robot_id}] Unexpected error processing binary messages of {topic}: {e}")
+
+    def _handle_payload_batch(
+            self, connection: FoxgloveConnection, subscription_id: int, frames: List[BinaryFrame]) -> None:
+        """
+        Decodes a burst of fixed-layout payloads into column arrays and publishes the
+        newest sample that passes the frame filter. The signals carry the current
+        state, so older samples of the same burst would be overwritten anyway.
+
+        Args:
+            connection (FoxgloveConnection): The connection the frames arrived on.
+            subscription_id (int): The subscription the frames belong to.
+            frames (List[BinaryFrame]): The frames, oldest first.
+        """
+        topic = connection.ws_subs.get(subscription_id, {}).get('topic')
+        decoder = connection.ws_decoders.get(subscription_id)
+        if decoder is None or not self._accept_rate(connection, subscription_id):
+            return
+        columns = decoder.decode_batch([frame.payload for frame in frames])
+        accepted = self.HEADING_FRAME_IDS if topic == '/gps/heading' else self.GPS_FIX_FRAME_IDS
+        matches = np.flatnonzero(np.isin(columns['header.frame_id'], accepted))
+        if not matches.size:
+            return
+        index = matches[-1]
+        sample = self._latency_sample(topic, decoder, frames[index])
+        if topic == '/gps/heading':
+            self._publish(connection, 'heading_quat', {
+                axis: float(columns[f'orientation.{axis}'][index]) for axis in ('x', 'y', 'z', 'w')
+            }, sample)
+        elif topic == '/gps/fix_filtered':
+            self._publish(connection, 'gps_fix', {
+                key: float(columns[key][index]) for key in ('latitude', 'longitude', 'altitude')
+            }, sample)
+
+    def _handle_payload(self, frame: BinaryFrame) -> None:
+        """
+        Decodes and processes the payload of a single binary message.
+
+        Args:
+            frame (BinaryFrame): The frame carrying the CDR payload.
+        """
+        connection, subscription_id, payload = frame.connection, frame.subscription_id, frame.payload
+        # Process message based on subscription topic.
+        topic = connection.ws_subs.get(subscription_id, {}).get('topic')
+        decoder = connection.ws_decoders.get(subscription_id)
+        if decoder is None or not self._accept_rate(connection, subscription_id):
+            return
+        if topic == '/gps/heading':
+            # Reject other IMU frames before touching the rest of the payload.
+            if decoder.read_frame_id(payload) not in self.HEADING_FRAME_IDS:
                 return
+            imu_record = decoder.lazy(payload)
+            orientation = imu_record['orientation']
+            self._publish(connection, 'heading_quat', orientation, self._latency_sample(topic, decoder, frame))
+        elif topic == '/gps/fix':
+            # Not consumed by any view; nothing to decode.
+            return
+        elif topic == '/gps/fix_filtered':
+            if decoder.read_frame_id(payload) not in self.GPS_FIX_FRAME_IDS:
+                return
+            navsatfix_record = decoder.lazy(payload)
+            gps_fix = {
+                'latitude': navsatfix_record['latitude'],
+                'longitude': navsatfix_record['longitude'],
+                'altitude': navsatfix_record['altitude'],
+            }
+            self._publish(connection, 'gps_fix', gps_fix, self._latency_sample(topic, decoder, frame))
+            # logger.info(f"Navsatfix Data: {navsatfix_data}")
+        elif topic == '/sensor_status':
+            diagnostic_array = decoder.decode(payload)
+            sensorstatus_data = {
+                str(status['name']): str(status['message']) for status in diagnostic_array['status']
+            }
+            self._publish(connection, 'health_status', sensorstatus_data, self._latency_sample(topic, decoder, frame))
+            # logger.info(f"Sensor Status Data: {sensorstatus_data}")
 
-            # Process message based on subscription topic.
-            topic = self.ws_subs.get(subscription_id, {}).get('topic')
-            if topic == '/gps/heading':
-                imu_data = decode_imu(payload)
-                if imu_data is None:
-                    return
-                heading_quat = imu_data.get('orientation', {})
-                self.signal_heading_quat.emit(heading_quat)
-            elif topic == '/gps/fix':
-                navsatfix_data = decode_navsatfix(payload)
-                if navsatfix_data is None:
-                    return
-                # Optionally process navsatfix_data...
-            elif topic == '/gps/fix_filtered':
-                navsatfix_data = decode_navsatfix(payload)
-                if navsatfix_data is None:
-                    return
-                gps_fix = {
-                    'latitude': navsatfix_data.get('latitude', 0),
-                    'longitude': navsatfix_data.get('longitude', 0),
-                    'altitude': navsatfix_data.get('altitude', 0),
-                }
-                self.signal_gps_fix.emit(gps_fix)
-                # logger.info(f"Navsatfix Data: {navsatfix_data}")
-            elif topic == '/sensor_status':
-                sensorstatus_data = decode_sensorstatus(payload)
-                self.signal_health_status.emit(sensorstatus_data)
-                # logger.info(f"Sensor Status Data: {sensorstatus_data}")
-        except struct.error as e:
-            logger.error(f"Error decoding binary message: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error processing binary message: {e}")
+    def _publish(self, connection: FoxgloveConnection, key: str, value: Any, sample: LatencySample) -> None:
+        """
+        Hands a decoded value of a robot to the coalescer.
+        """
+        self._coalescer.publish((connection.robot_id, key), value, sample)
 
-    async def _handle_advertised_channels(self, message: Dict[str, Any]) -> None:
+    def _latency_sample(self, topic: str, decoder: MessageDecoder, frame: BinaryFrame) -> LatencySample:
         """
-        Processes channel advertisement messages by subscribing to desired channels.
+        Records the receive-side latency of a decoded frame and returns the sample
+        to carry along to the view update.
 
         Args:
-            message (Dict[str, Any]): The JSON message advertising channels.
-        """
-        channels = message.get("channels", [])
-        for channel in channels:
-            channel_id = channel.get("id")
-            topic = channel.get("topic")
-            if topic in self.SUBCRIBE_TOPICS:
-                logger.info(f"Subscribing to channel: {channel_id} with topic: {topic}")
-                subscription_id = channel_id  # Use the channel's id as the subscription id.
-                self.ws_subs[subscription_id] = channel
-                await self._send({
-                    "op": "subscribe",
-                    "subscriptions": [
-                        {"id": subscription_id, "channelId": channel_id}
-                    ]
-                })
-                logger.info(f"Subscribed to channel: {channel_id} with subscription ID: {subscription_id}")
+            topic (str): The topic of the frame.
+            decoder (MessageDecoder): The decoder of the frame's subscription.
+            frame (BinaryFrame): The decoded frame.
+
+        Returns:
+            LatencySample: The timestamps of the frame so far.
+        """
+        stamp_ns = decoder.read_stamp(frame.payload)
+        sample = LatencySample(
+            frame.connection.topic_label(topic),
+            stamp_ns + frame.clock_offset_ns if stamp_ns else None,
+            frame.timestamp + frame.clock_offset_ns if frame.timestamp else None,
+            frame.receive_ns,
+            time.time_ns(),
+        )
+        self.latency.record_decoded(sample)
+        return sample
 
-    async def _send(self, message: Dict[str, Any]) -> None:
+    def channel_decoder(self, channel: Dict[str, Any]) -> Optional[MessageDecoder]:
         """
-        Sends a JSON message to the WebSocket server.
+        Returns the decoder of an advertised channel, or None if its topic is not
+        enabled or it cannot be decoded. Decoders are compiled once per channel
+        definition and shared by all robots, so re-advertisements are cheap.
 
         Args:
-            message (Dict[str, Any]): The message to be sent.
+            channel (Dict[str, Any]): The advertised channel.
         """
-        try:
-            if self.ws:
-                await self.ws.send(json.dumps(message))
-                logger.info(f"Sent message: {message}")
-            else:
-                logger.warning("WebSocket is not open. Cannot send message.")
-        except Exception as e:
-            logger.error(f"Error sending message: {e}")
+        topic_cfg = self._topic_cfg.get(channel.get("topic"))
+        if not topic_cfg or not topic_cfg.get('enabled', False):
+            return None
+        decoder_choice = topic_cfg.get('decoder', 'projected')
+        key = (decoder_choice,) + tuple(
+            channel.get(field) for field in FoxgloveConnection.CHANNEL_IDENTITY_FIELDS)
+        if key not in self._decoder_cache:
+            self._decoder_cache[key] = self._compile_channel_decoder(channel, decoder_choice)
+        return self._decoder_cache[key]
 
-    async def _ws_disconnect(self) -> None:
+    def _compile_channel_decoder(self, channel: Dict[str, Any], decoder_choice: str) -> Optional[MessageDecoder]:
         """
-        Gracefully disconnects from the WebSocket server and stops the event loop.
+        Compiles the CDR decoder for an advertised channel.
+        Uses the channel's schema unless `decoder_choice` is 'builtin' or the schema is
+        unusable, in which case the built-in definition is used. All choices but 'full'
+        are projected onto the fields the views read.
+
+        Args:
+            channel (Dict[str, Any]): The advertised channel.
+            decoder_choice (str): One of `DECODER_CHOICES`.
+
+        Returns:
+            Optional[MessageDecoder]: The decoder, or None if the channel cannot be decoded.
         """
+        topic = channel.get("topic")
+        schema_name = channel.get("schemaName", "")
+        if decoder_choice not in self.DECODER_CHOICES:
+            logger.warning(f"Unknown decoder '{decoder_choice}' for topic {topic}, using 'projected'.")
+            decoder_choice = "projected"
+        if channel.get("encoding", "cdr") != "cdr":
+            logger.warning(f"Unsupported message encoding '{channel.get('encoding')}' for topic: {topic}")
+            return None
+        decoder = None
         try:
-            if self.ws:
-                await self.ws.close()
-                logger.info("Disconnected from Foxglove WebSocket server")
-            if self.loop and self.loop.is_running():
-                self.loop.call_soon_threadsafe(self.loop.stop)
-            logger.info("WebSocket connection closed.")
-        except Exception as e:
-            logger.error(f"Error during disconnect: {e}")
+            if channel.get("schema") and decoder_choice != "builtin":
+                decoder = compile_schema(
+                    schema_name, channel.get("schemaEncoding", "ros2msg"), channel["schema"], lazy_strings=True)
+        except SchemaError as e:
+            logger.warning(f"Could not compile schema '{schema_name}' for topic {topic}: {e}")
+        if decoder is None:
+            decoder = get_builtin_decoder(schema_name, lazy_strings=True)
+        if decoder is None:
+            logger.error(f"No decoder available for topic {topic} ({schema_name}).")
+            return None
 
-    async def send_message(self, message: Dict[str, Any]) -> None:
+        projection = self.TOPIC_PROJECTIONS.get(topic)
+        if projection is not None and decoder_choice != "full":
+            try:
+                decoder = decoder.project(projection)
+            except SchemaError as e:
+                logger.warning(f"Decoding all fields of {topic}, projection failed: {e}")
+        return decoder
+
+    async def send_message(self, message: Dict[str, Any], robot_id: Optional[str] = None) -> None:
         """
-        Public method to send a message to the WebSocket server.
+        Public method to send a message to a robot's WebSocket server.
 
         Args:
             message (Dict[str, Any]): The message dictionary to send.
+            robot_id (Optional[str]): The robot; the primary robot if None.
         """
-        await self._send(message)
-        
+        connection = self._connections.get(robot_id or self.primary_robot_id)
+        if connection is None:
+            logger.warning(f"Cannot send to unknown robot {robot_id}.")
+            return
+        await connection.send_message(message)
+
     def is_running(self) -> bool:
         """
         Returns whether the WebSocket Model is currently running.
-        
+
         Returns:
             bool: True if the Model is running, False otherwise.
         """
         return self._running
+
+    def latency_snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the latency percentiles per topic and stage, see LatencyMonitor.snapshot().
+        """
+        return self.latency.snapshot()
+
+    def decode_stats(self) -> Dict[str, int]:
+        """
+        Returns the counters of the decode queue.
+
+        Returns:
+            Dict[str, int]: 'submitted', 'dropped', 'handled' and currently 'queued' frames.
+        """
+        return self._decode_pool.stats()
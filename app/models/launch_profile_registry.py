@@ -0,0 +1,193 @@
+# launch_profile_registry.py
+import copy
+import hashlib
+import importlib.resources as pkg_resources
+import json
+import os
+import re
+import shlex
+from typing import Any, Dict, ItemsView, Iterator, KeysView
+
+import yaml
+
+from app import configs as mowbot_configs
+from app.utils.logger import logger
+
+
+class LaunchProfileRegistry:
+    """
+    Definitions of the ROS 2 launch containers, loaded from the launch profiles
+    YAML (see app/configs/launch_profiles.yaml) instead of being hardcoded.
+
+    Profiles are resolved once when loaded: inheritance is applied, ${VAR}
+    environment variables are substituted and the launch command is built from
+    the launch arguments. The hash of the fields a container is created from is
+    cached per profile, so unchanged containers are recognised without
+    recomputing it on every start.
+
+    The registry behaves like a read-only dict of the resolved profiles keyed by
+    profile name, with the fields 'name', 'image', 'command', 'environment',
+    'volumes', 'network_mode', 'privileged', 'tty', 'working_dir' and 'depends_on'.
+    """
+
+    PROFILES_FILE = "launch_profiles.yaml"
+
+    # Fields a container is created from; a change recreates the container.
+    HASH_FIELDS = (
+        "image", "command", "privileged", "volumes", "environment",
+        "network_mode", "working_dir", "tty",
+    )
+
+    _VARIABLE_PATTERN = re.compile(r"\$\{(\w+)\}")
+
+    def __init__(self, raw_profiles: Dict[str, Dict[str, Any]], default_image: str):
+        """
+        Initializes the LaunchProfileRegistry and resolves the profiles.
+
+        Args:
+            raw_profiles (Dict[str, Dict[str, Any]]): Profiles as written in the YAML.
+            default_image (str): Image of the profiles that set none.
+
+        Raises:
+            ValueError: If a profile is incomplete, inherits in a cycle or depends on
+                an unknown profile.
+            EnvironmentError: If a profile uses an unset environment variable.
+        """
+        self._raw = raw_profiles
+        self._default_image = default_image
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        for name in raw_profiles:
+            if not name.startswith("_"):
+                self._profiles[name] = self._finalize(name, self._resolve(name, ()))
+        for name, profile in self._profiles.items():
+            unknown = [other for other in profile["depends_on"] if other not in self._profiles]
+            if unknown:
+                raise ValueError(f"Launch profile {name} depends on unknown profiles: {unknown}")
+        self._hashes = {name: self._config_hash(profile) for name, profile in self._profiles.items()}
+
+    @staticmethod
+    def load(config: Dict[str, Any]) -> 'LaunchProfileRegistry':
+        """
+        Loads the packaged launch profiles, merged with the profiles of
+        `launch_profiles_file` if set.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary containing
+                'container_image' and 'launch_profiles_file'.
+        """
+        with pkg_resources.open_text(mowbot_configs, LaunchProfileRegistry.PROFILES_FILE) as f:
+            profiles = yaml.safe_load(f) or {}
+        profiles_file = config.get("launch_profiles_file")
+        if profiles_file:
+            logger.info(f"Loading launch profiles from: {profiles_file}")
+            with open(os.path.expanduser(profiles_file)) as f:
+                profiles = _merge(profiles, yaml.safe_load(f) or {})
+        return LaunchProfileRegistry(profiles, config["container_image"])
+
+    def config_hash(self, name: str) -> str:
+        """
+        Returns the cached hash of the fields the container of a profile is created from.
+        """
+        return self._hashes[name]
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self._profiles[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._profiles
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._profiles)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def keys(self) -> KeysView[str]:
+        return self._profiles.keys()
+
+    def items(self) -> ItemsView[str, Dict[str, Any]]:
+        return self._profiles.items()
+
+    def _resolve(self, name: str, path: tuple) -> Dict[str, Any]:
+        """
+        Returns a profile with the fields it inherits.
+        """
+        if name in path:
+            raise ValueError(f"Circular launch profile inheritance: {' -> '.join(path + (name,))}")
+        if name not in self._raw:
+            raise ValueError(f"Launch profile {path[-1]} extends unknown profile {name}")
+        profile = dict(self._raw[name] or {})
+        parent = profile.pop("extends", None)
+        if parent is None:
+            return copy.deepcopy(profile)
+        return _merge(self._resolve(parent, path + (name,)), profile)
+
+    def _finalize(self, name: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Substitutes the environment variables of a resolved profile, fills in its
+        defaults and builds its command.
+        """
+        profile = self._substitute(name, profile)
+        if "name" not in profile:
+            raise ValueError(f"Launch profile {name} has no container name")
+        command = profile.get("command")
+        if command is None:
+            if "launch_file" not in profile:
+                raise ValueError(f"Launch profile {name} has neither a command nor a launch_file")
+            command = ["/bin/bash", "-c", self._launch_command(profile)]
+        return {
+            "name": profile["name"],
+            "image": profile.get("image") or self._default_image,
+            "command": command,
+            "environment": {key: str(value) for key, value in (profile.get("environment") or {}).items()},
+            "volumes": profile.get("volumes") or {},
+            "network_mode": profile.get("network_mode", "bridge"),
+            "privileged": bool(profile.get("privileged", False)),
+            "tty": bool(profile.get("tty", False)),
+            "working_dir": profile.get("working_dir"),
+            "depends_on": list(profile.get("depends_on") or []),
+        }
+
+    @staticmethod
+    def _launch_command(profile: Dict[str, Any]) -> str:
+        words = ["ros2", "launch", profile["package"], profile["launch_file"]]
+        for arg, value in (profile.get("launch_args") or {}).items():
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            words.append(shlex.quote(f"{arg}:={value}"))
+        launch = " ".join(words)
+        setup = profile.get("setup")
+        return f". {shlex.quote(setup)} && {launch}" if setup else launch
+
+    def _substitute(self, name: str, value: Any) -> Any:
+        if isinstance(value, str):
+            return self._VARIABLE_PATTERN.sub(lambda match: self._variable(name, match.group(1)), value)
+        if isinstance(value, dict):
+            return {self._substitute(name, key): self._substitute(name, item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._substitute(name, item) for item in value]
+        return value
+
+    @staticmethod
+    def _variable(profile_name: str, variable: str) -> str:
+        value = os.environ.get(variable)
+        if value is None:
+            raise EnvironmentError(f"{variable} environment variable is not set (launch profile {profile_name}).")
+        return value
+
+    def _config_hash(self, profile: Dict[str, Any]) -> str:
+        definition = {field: profile.get(field) for field in self.HASH_FIELDS}
+        return hashlib.sha256(json.dumps(definition, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns `base` updated with `override`, merging nested mappings key by key.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
@@ -0,0 +1,248 @@
+# launch_readiness_model.py
+import re
+import time
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtNetwork import QAbstractSocket, QTcpSocket
+
+from app.models.foxglove_ws_model import FoxgloveWsModel
+from app.models.ros2_launch_container_model import ROS2LaunchContainerModel
+from app.utils.logger import logger
+
+
+class LaunchReadinessModel(QObject):
+    """
+    Decides when a launch container is actually ready, instead of taking the
+    Docker status 'running' for it. Once a container runs, the probes configured
+    for it in `container_readiness` must pass:
+
+      - tcp: the port of `foxglove_ws_uri` accepts connections,
+      - channels: the Foxglove server advertises these topics,
+      - log_markers: each of these regular expressions matched a line of the
+        container output.
+
+    Emits signal_readiness_changed on every state change with the timings of the
+    probes, in seconds since the container start was requested (or, without a
+    request, since it was seen running).
+    """
+
+    # 'listening' is emitted once the tcp probe passes, so the WebSocket can connect
+    # and the channel advertisements can arrive.
+    READINESS_STATES = ("stopped", "starting", "listening", "ready", "timeout")
+
+    signal_readiness_changed = pyqtSignal(str, str, dict)  # key, one of READINESS_STATES, timings
+
+    _instance = None
+
+    @staticmethod
+    def get_instance(
+            config: Dict[str, Any],
+            container_model: ROS2LaunchContainerModel = None,
+            foxglove_ws_model: FoxgloveWsModel = None,
+        ) -> 'LaunchReadinessModel':
+        """
+        Returns the singleton instance of LaunchReadinessModel.
+        """
+        if LaunchReadinessModel._instance is None:
+            LaunchReadinessModel._instance = LaunchReadinessModel(config, container_model, foxglove_ws_model)
+        return LaunchReadinessModel._instance
+
+    def __init__(
+            self,
+            config: Dict[str, Any],
+            container_model: ROS2LaunchContainerModel,
+            foxglove_ws_model: FoxgloveWsModel,
+        ):
+        """
+        Initializes the LaunchReadinessModel.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary containing
+                'container_readiness' and 'foxglove_ws_uri'.
+            container_model (ROS2LaunchContainerModel): Source of the container statuses and logs.
+            foxglove_ws_model (FoxgloveWsModel): Source of the channel advertisements.
+        """
+        if LaunchReadinessModel._instance is not None:
+            raise Exception("This class is a singleton! Use `get_instance` instead.")
+        super().__init__()
+        self._config = config
+        self._container_model = container_model
+        self._foxglove_ws_model = foxglove_ws_model
+        self._readiness_cfg: Dict[str, Dict[str, Any]] = config.get('container_readiness', {})
+        self._probe_interval_ms = config.get('container_readiness_probe_interval_ms', 200)
+
+        uri = urlparse(config['foxglove_ws_uri'])
+        self._tcp_host = uri.hostname or "localhost"
+        self._tcp_port = uri.port or (443 if uri.scheme == "wss" else 80)
+
+        keys = container_model.containers_config.keys()
+        self._states: Dict[str, str] = dict.fromkeys(keys, "stopped")
+        self._requested_at: Dict[str, float] = {}  # monotonic time of the last start request
+        self._started_at: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, float]] = {key: {} for key in keys}
+        self._pending: Dict[str, Set[str]] = {key: set() for key in keys}  # probes not passed yet
+        self._markers: Dict[str, List[re.Pattern]] = {}  # log markers not seen yet
+        self._log_seq: Dict[str, int] = {}
+        self._advertised: Set[str] = set()
+        self._waiting_for_fix: Optional[str] = None  # container whose first GPS fix is timed
+
+        # One TCP probe for the Foxglove port, retried until it connects.
+        self._tcp_socket = QTcpSocket(self)
+        self._tcp_socket.connected.connect(self._on_tcp_connected)
+        self._tcp_socket.errorOccurred.connect(self._on_tcp_error)
+        self._tcp_retry_timer = QTimer(self)
+        self._tcp_retry_timer.setSingleShot(True)
+        self._tcp_retry_timer.setInterval(self._probe_interval_ms)
+        self._tcp_retry_timer.timeout.connect(self._probe_tcp)
+
+        # Log markers, advertisements and timeouts are checked on this tick while a container starts.
+        self._probe_timer = QTimer(self)
+        self._probe_timer.setInterval(self._probe_interval_ms)
+        self._probe_timer.timeout.connect(self._on_probe_tick)
+
+        container_model.signal_container_status_updated.connect(self.on_container_status_updated)
+        foxglove_ws_model.signal_robot_advertised_topics.connect(self.on_advertised_topics)
+        foxglove_ws_model.signal_gps_fix.connect(self.on_gps_fix)
+
+    def readiness_state(self, key: str) -> str:
+        """
+        Returns the readiness state of a container, one of READINESS_STATES.
+        """
+        return self._states[key]
+
+    def timings(self, key: str) -> Dict[str, float]:
+        """
+        Returns the probe timings of the current or last start of a container.
+        """
+        return dict(self._timings[key])
+
+    def mark_start_requested(self, key: str) -> None:
+        """
+        Records that the user asked to start a container; timings count from here.
+        """
+        self._requested_at[key] = time.monotonic()
+
+    @pyqtSlot(str, str)
+    def on_container_status_updated(self, key: str, status: str):
+        """
+        Starts the probes when a container runs and resets its readiness otherwise.
+        """
+        if key not in self._states:
+            return
+        if status == "running":
+            if self._states[key] in ("stopped", "timeout"):
+                self._begin(key)
+        elif self._states[key] != "stopped":
+            self._pending[key].clear()
+            self._markers.pop(key, None)
+            if "channels" in self._readiness_cfg.get(key, {}):
+                self._advertised.clear()
+            if self._waiting_for_fix == key:
+                self._waiting_for_fix = None
+            self._set_state(key, "stopped")
+
+    @pyqtSlot(str, list)
+    def on_advertised_topics(self, robot_id: str, topics: list):
+        if robot_id == self._foxglove_ws_model.primary_robot_id:
+            self._advertised = set(topics)
+            self._on_probe_tick()
+
+    @pyqtSlot(dict)
+    def on_gps_fix(self, _fix: dict):
+        key, self._waiting_for_fix = self._waiting_for_fix, None
+        if key is not None:
+            self._timings[key]['first_gps_fix_s'] = self._elapsed(key)
+            logger.info(f"First GPS fix {self._timings[key]['first_gps_fix_s']:.1f} s after starting {key}.")
+
+    def _begin(self, key: str) -> None:
+        now = time.monotonic()
+        requested = self._requested_at.pop(key, None)
+        timeout_s = self._readiness_cfg.get(key, {}).get('timeout_s', 60.0)
+        # A request older than the timeout belongs to an earlier attempt.
+        self._started_at[key] = requested if requested is not None and now - requested < timeout_s else now
+        self._timings[key] = {'running_s': self._elapsed(key)}
+
+        cfg = self._readiness_cfg.get(key, {})
+        pending = set()
+        if cfg.get('tcp'):
+            pending.add('tcp')
+            self._probe_tcp()
+        if cfg.get('channels'):
+            pending.add('channels')
+        if cfg.get('log_markers'):
+            pending.add('log_markers')
+            self._markers[key] = [re.compile(marker) for marker in cfg['log_markers']]
+            self._log_seq[key] = self._container_model.container_log_last_seq(key)
+        self._pending[key] = pending
+        if cfg.get('gps_fix'):
+            self._waiting_for_fix = key
+        self._set_state(key, "starting")
+        self._probe_timer.start()
+        self._on_probe_tick()
+
+    @pyqtSlot()
+    def _probe_tcp(self) -> None:
+        self._tcp_socket.abort()
+        self._tcp_socket.connectToHost(self._tcp_host, self._tcp_port)
+
+    @pyqtSlot()
+    def _on_tcp_connected(self):
+        self._tcp_socket.abort()
+        for key, pending in self._pending.items():
+            if 'tcp' in pending:
+                pending.discard('tcp')
+                self._timings[key]['tcp_s'] = self._elapsed(key)
+                self._set_state(key, "listening")
+        self._on_probe_tick()
+
+    @pyqtSlot(QAbstractSocket.SocketError)
+    def _on_tcp_error(self, _error):
+        if any('tcp' in pending for pending in self._pending.values()):
+            self._tcp_retry_timer.start()
+
+    @pyqtSlot()
+    def _on_probe_tick(self):
+        for key, pending in self._pending.items():
+            if self._states[key] not in ("starting", "listening"):
+                continue
+            cfg = self._readiness_cfg.get(key, {})
+            if 'channels' in pending and set(cfg['channels']) <= self._advertised:
+                pending.discard('channels')
+                self._timings[key]['channels_s'] = self._elapsed(key)
+            if 'log_markers' in pending:
+                self._check_log_markers(key)
+            if not pending:
+                self._timings[key]['ready_s'] = self._elapsed(key)
+                self._set_state(key, "ready")
+            elif self._elapsed(key) > cfg.get('timeout_s', 60.0):
+                logger.warning(f"Container {key} not ready after {cfg.get('timeout_s', 60.0)} s, "
+                               f"waiting for: {sorted(pending)}")
+                pending.clear()
+                self._set_state(key, "timeout")
+        if not any(self._pending.values()):
+            self._probe_timer.stop()
+
+    def _check_log_markers(self, key: str) -> None:
+        lines, _ = self._container_model.container_log_lines(key, self._log_seq[key])
+        if lines:
+            self._log_seq[key] = lines[-1].seq
+        markers = self._markers.get(key, [])
+        for line in lines:
+            markers[:] = [marker for marker in markers if not marker.search(line.text)]
+            if not markers:
+                break
+        if not markers:
+            self._pending[key].discard('log_markers')
+            self._timings[key]['log_markers_s'] = self._elapsed(key)
+
+    def _elapsed(self, key: str) -> float:
+        return round(time.monotonic() - self._started_at.get(key, time.monotonic()), 3)
+
+    def _set_state(self, key: str, state: str) -> None:
+        if self._states[key] == state:
+            return
+        self._states[key] = state
+        logger.info(f"Container {key} {state}: {self._timings[key]}")
+        self.signal_readiness_changed.emit(key, state, dict(self._timings[key]))
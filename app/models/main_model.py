@@ -7,6 +7,8 @@ from PyQt5.QtCore import (
 )
 from .foxglove_ws_model import FoxgloveWsModel
 from .ros2_launch_container_model import ROS2LaunchContainerModel
+from .container_image_model import ContainerImageModel
+from .launch_readiness_model import LaunchReadinessModel
 from .settings_cfg_model import (
     OtherSettingsCfgModel,
     NtripSettingsCfgModel,
@@ -36,7 +38,21 @@ class MainModel(QObject):
         self._ros2_launch_container_model = ROS2LaunchContainerModel.get_instance(
             config=self._config,
         )
-        # self._ros2_launch_container_model.create_all_launch_containers()
+        self._launch_readiness_model = LaunchReadinessModel.get_instance(
+            config=self._config,
+            container_model=self._ros2_launch_container_model,
+            foxglove_ws_model=self._foxglove_ws_model,
+        )
+        self._container_image_model = ContainerImageModel.get_instance(
+            config=self._config,
+            docker=self._ros2_launch_container_model.docker,
+        )
+        # Check, load or pull the image first; container operations wait for it.
+        self._ros2_launch_container_model.wait_for_image(
+            self._container_image_model.prepare_image())
+        if self._config.get("container_warm_pool", True):
+            # Create the containers in the background, so the start buttons only run ros2 launch.
+            self._ros2_launch_container_model.warm_up_launch_containers()
         
         # self.ntrip_params_cfg_model = NTRIPParamsCfgModel.get_instance(
         #     config=self._config,
@@ -62,6 +78,20 @@ class MainModel(QObject):
         Returns the ROS2 Launch Container model.
         """
         return self._ros2_launch_container_model
+
+    @property
+    def container_image_model(self):
+        """
+        Returns the container image model.
+        """
+        return self._container_image_model
+
+    @property
+    def launch_readiness_model(self):
+        """
+        Returns the launch readiness model.
+        """
+        return self._launch_readiness_model
     
     def save_yaml_waypoints(self, waypoints: dict, file_path: str):
         """
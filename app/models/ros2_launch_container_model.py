@@ -1,21 +1,44 @@
 # ros2_launch_container_model.py
 
+import asyncio
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+import time
 import docker
-import json
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QThread, pyqtSlot
-from app.models import ros2_launch_container_cfg
-from app.models.ros2_launch_container_cfg import CONTAINERS_CFG
+from app.models.launch_profile_registry import LaunchProfileRegistry
+from app.utils.async_docker_client import AsyncDockerClient, DockerAPIError, DockerNotFound
+from app.utils.container_stats import ContainerStatsWindow, parse_stats
+from app.utils.log_buffer import LogLine, LogRingBuffer
 from app.utils.logger import logger
+from app.utils.signal_coalescer import SignalCoalescer
 
 class ROS2LaunchContainerModel(QObject):
     """
     Model for managing ROS2 launch containers via Docker.
     Provides methods to create, start, stop, remove, and check container statuses.
-    Emits signal_container_status_updated for status changes.
-    Also supports periodic tasks through worker timers.
+    Emits signal_container_status_updated for status changes, which are followed
+    through the Docker events stream. A slow periodic status check reconciles
+    the statuses in case events were missed.
+
+    Docker requests run on the loop of the AsyncDockerClient. Methods returning
+    futures never block and may be called from the GUI thread. The synchronous
+    wrappers (create/start/stop/remove_launch_container, stop_all_launch_containers,
+    get_launch_container_status, get_all_launch_container_statuses and
+    check_all_launch_containers) wait for the daemon and are for the worker
+    threads only.
     """
     signal_container_status_updated = pyqtSignal(str, str)  # key, status
+    signal_shutdown_finished = pyqtSignal()  # the containers were stopped or removed on exit
+    signal_container_operation_progress = pyqtSignal(str, int, int)  # operation, done, total
+    signal_container_command_finished = pyqtSignal(str, str, str)  # key, "start"/"stop", "done"/"failed"/"cancelled"
+    signal_container_stats = pyqtSignal(str, dict)  # key, ContainerStatsWindow.summary() ({} when not running)
+
+    # Containers are labelled with the hash of their definition to detect outdated ones.
+    CONFIG_HASH_LABEL = "mowbot_legacy_gui.config_hash"
     
 
     _instance = None
@@ -33,115 +56,561 @@ class ROS2LaunchContainerModel(QObject):
             raise Exception("This class is a singleton! Use get_instance() instead.")
         super().__init__()
         self._config = config
-        ros2_launch_container_cfg.IMAGE = self._config["container_image"]
         try:
-            self.docker_client = docker.from_env()
-            self.docker_client.ping()  # Test Docker connection.
-            logger.info("Docker connection established.")
-        except docker.errors.DockerException as e:
+            # Requests go through the pooled async client; the docker-py client only
+            # serves the long-lived log and stats streams, see _stream_client().
+            self.docker = AsyncDockerClient.from_env(pool_size=self._config.get("docker_pool_size", 8))
+        except DockerAPIError as e:
             raise RuntimeError(f"Failed to connect to Docker: {e}")
-        self.containers_config = CONTAINERS_CFG
+        self._docker_client = None
+        self._docker_client_lock = threading.Lock()
+        # Test the Docker connection without blocking the GUI thread on the daemon.
+        self.docker.submit(self.docker.ping()).add_done_callback(self._on_docker_ping)
+        # Container definitions, keyed by launch profile name.
+        self.containers_config = LaunchProfileRegistry.load(self._config)
+        self._container_keys = {cfg["name"]: key for key, cfg in self.containers_config.items()}
+
+        # Last status emitted per container; only transitions are emitted.
+        self._container_statuses = {}
+        self._status_lock = threading.Lock()
 
         # Worker and thread attributes for periodic tasks.
         self._container_manage_worker = None
         self._worker_thread = None
+        self._events_worker = None
+        self._events_thread = None
+
+        # Lifecycle operations run concurrently on the Docker client loop, ordered only
+        # by container dependencies.
+        self._lifecycle_lock = threading.RLock()  # done callbacks may run while submitting
+        self._last_operations: Dict[str, Future] = {}  # latest operation per container
+        self._image_ready: Future = None  # starts and warm-ups wait for the image, see wait_for_image()
 
-    def create_launch_container(self, key: str):
+        # Resource usage of the running containers, followed through the Docker stats
+        # streams (one thread each) and published to the views at a low rate.
+        self._stats_enabled = False
+        self._stats_streams: Dict[str, threading.Event] = {}  # key -> stop event of its stream
+        self._stats_coalescer = SignalCoalescer(self._config.get("container_stats_ui_rate_hz", 0.5))
+        for key in self.containers_config:
+            self._stats_coalescer.register(key, self.signal_container_stats, key)
+
+        # Output of the running containers, read by one log stream thread each into a
+        # bounded buffer per container that the views poll at their own rate.
+        self._logs_enabled = False
+        self._log_streams: Dict[str, threading.Event] = {}  # key -> stop event of its stream
+        self._log_buffers = {
+            key: LogRingBuffer(self._config.get("container_log_buffer_lines", 5000), timestamps=True)
+            for key in self.containers_config
+        }
+
+    def create_launch_container(self, key: str) -> Dict[str, Any]:
+        """
+        Returns the inspected container of `key`, creating it if needed. Blocks
+        until the daemon answered; call from worker threads only.
+        """
+        return self.docker.submit(self._create_launch_container(key)).result()
+
+    async def _create_launch_container(self, key: str) -> Dict[str, Any]:
+        """
+        Returns the inspected container of `key`, creating it if needed. A stopped
+        container whose definition changed since it was created is recreated; a
+        running one is kept until its next start.
+        """
         config = self.containers_config[key]
         name = config["name"]
+        config_hash = self.container_config_hash(key)
         try:
-            return self.docker_client.containers.get(name)
-        except docker.errors.NotFound:
-            logger.info(f"Creating container: {name}")
-            return self.docker_client.containers.create(
-                image=config["image"],
-                name=name,
-                command=config["command"],
-                privileged=config["privileged"],
-                volumes=config["volumes"],
-                environment=config["environment"],
-                network=config["network_mode"],
-                detach=config["detach"],
-                tty=config["tty"],
-            )
-            
-    def create_all_launch_containers(self) -> None:
+            container = await self.docker.inspect_container(name)
+            if (container["Config"].get("Labels") or {}).get(self.CONFIG_HASH_LABEL) == config_hash:
+                return container
+            if container["State"]["Status"] == "running":
+                logger.warning(f"Container {name} is outdated but running; it is recreated on its next start.")
+                return container
+            logger.info(f"Recreating container {name}: its definition changed.")
+            await self.docker.remove_container(name, force=True)
+        except DockerNotFound:
+            pass
+        logger.info(f"Creating container: {name}")
+        await self.docker.create_container(name, self._container_create_config(key))
+        return await self.docker.inspect_container(name)
+
+    def _container_create_config(self, key: str) -> Dict[str, Any]:
         """
-        Creates all launch containers defined in the configuration.
+        Returns the Docker API create body of launch profile `key`.
         """
-        for key in self.containers_config.keys():
-            self.create_launch_container(key=key)
-            logger.info(f"Created container: {key}")
+        config = self.containers_config[key]
+        body = {
+            "Image": config["image"],
+            "Cmd": config["command"],
+            "Tty": config["tty"],
+            "Env": [f"{name}={value}" for name, value in config["environment"].items()],
+            "Labels": {self.CONFIG_HASH_LABEL: self.container_config_hash(key)},
+            "HostConfig": {
+                "Privileged": config["privileged"],
+                "Binds": [
+                    f"{host_path}:{volume['bind']}:{volume.get('mode', 'rw')}"
+                    for host_path, volume in config["volumes"].items()
+                ],
+                "NetworkMode": config["network_mode"],
+            },
+        }
+        if config["working_dir"]:
+            body["WorkingDir"] = config["working_dir"]
+        return body
+
+    def container_config_hash(self, key: str) -> str:
+        """
+        Returns the hash of the fields of launch profile `key` the container is created from.
+        """
+        return self.containers_config.config_hash(key)
+
+    def wait_for_image(self, image_ready: Future) -> None:
+        """
+        Makes container starts and warm-ups wait until `image_ready` is done, e.g.
+        while the image is pulled. They run anyway if it failed.
+        """
+        self._image_ready = image_ready
+
+    def warm_up_launch_containers(self) -> Dict[str, Future]:
+        """
+        Creates all launch containers in the background, so starting one only
+        has to run its launch command.
+        """
+        return self.run_lifecycle_operation("warm_up", self.containers_config.keys())
+
+    async def _warm_up_launch_container(self, key: str) -> None:
+        image = self.containers_config[key]["image"]
+        if self._config.get("container_warm_pool_validate_image", False):
+            try:
+                await self.docker.inspect_image(image)
+            except DockerNotFound:
+                logger.warning(f"Image {image} of container {key} is not available locally.")
+                return
+        await self._create_launch_container(key)
+
+    def create_all_launch_containers(self) -> Dict[str, Future]:
+        """
+        Creates all launch containers defined in the configuration in the background,
+        see warm_up_launch_containers().
+        """
+        return self.warm_up_launch_containers()
 
     def start_launch_container(self, key: str) -> None:
-        container = self.create_launch_container(key)
-        if container.status != "running":
-            container.start()
+        self.docker.submit(self._start_launch_container(key)).result()
+
+    async def _start_launch_container(self, key: str) -> None:
+        await self._create_launch_container(key)
+        if await self.docker.start_container(self.containers_config[key]["name"]):
             logger.info(f"Started container: {key}")
         else:
             logger.info(f"Container {key} is already running.")
 
     def stop_launch_container(self, key: str, timeout: int = 10) -> None:
+        self.docker.submit(self._stop_launch_container(key, timeout)).result()
+
+    async def _stop_launch_container(self, key: str, timeout: int = 10) -> None:
         try:
-            name = self.containers_config[key]["name"]
-            container = self.docker_client.containers.get(name)
-            container.stop(timeout=timeout)
+            await self.docker.stop_container(self.containers_config[key]["name"], timeout=timeout)
             logger.info(f"Stopped container: {key}")
-        except docker.errors.NotFound:
+        except DockerNotFound:
             logger.warning(f"Container not found: {key}")
-            
+
     def stop_all_launch_containers(self, timeout: int = 10) -> None:
         for key in self.containers_config.keys():
             self.stop_launch_container(key=key, timeout=timeout)
 
     def get_launch_container_status(self, key: str) -> str:
+        return self.docker.submit(self._get_launch_container_status(key)).result()
+
+    async def _get_launch_container_status(self, key: str) -> str:
         try:
-            name = self.containers_config[key]["name"]
-            container = self.docker_client.containers.get(name)
-            return container.status
-        except docker.errors.NotFound:
+            container = await self.docker.inspect_container(self.containers_config[key]["name"])
+            return container["State"]["Status"]
+        except DockerNotFound:
             return "not created"
 
     def check_launch_container(self, key: str) -> None:
         status = self.get_launch_container_status(key)
+        self.update_container_status(key, status)
+
+    def update_container_status(self, key: str, status: str) -> None:
+        """
+        Records the status of a container and emits signal_container_status_updated
+        if it changed. Called from the status check and events threads.
+        """
+        with self._status_lock:
+            if self._container_statuses.get(key) == status:
+                return
+            self._container_statuses[key] = status
+        logger.debug(f"Container {key} is {status}.")
         self.signal_container_status_updated.emit(key, status)
+        if status == "running":
+            self._start_stats_stream(key)
+            self._start_log_stream(key)
+        else:
+            self._stop_stats_stream(key)
+            self._stop_log_stream(key)
+
+    def _stream_client(self) -> docker.DockerClient:
+        """
+        Returns the docker-py client of the log and stats streams, which hold a
+        connection each. It is created on first use with the API version the
+        async client negotiated, so it blocks on the daemon then; call from the
+        stream threads only.
+        """
+        with self._docker_client_lock:
+            if self._docker_client is None:
+                version = self.docker.submit(self.docker.api_version()).result()
+                self._docker_client = docker.from_env(version=version)
+            return self._docker_client
+
+    # --- Logs ---
+    def container_log_lines(self, key: str, seq: int = 0, max_lines: int = None) -> Tuple[List[LogLine], int]:
+        """
+        Returns the buffered log lines of a container after sequence number `seq`,
+        see LogRingBuffer.since(). Safe to call from any thread.
+        """
+        return self._log_buffers[key].since(seq, max_lines)
+
+    def container_log_last_seq(self, key: str) -> int:
+        """
+        Returns the sequence number of the newest buffered log line of a container.
+        """
+        return self._log_buffers[key].last_seq()
+
+    def _start_log_stream(self, key: str) -> None:
+        """
+        Starts reading the log stream of a running container.
+        """
+        with self._status_lock:
+            if not self._logs_enabled or key in self._log_streams:
+                return
+            stop_event = threading.Event()
+            self._log_streams[key] = stop_event
+        threading.Thread(
+            target=self._follow_log_stream, args=(key, stop_event),
+            name=f"container-logs-{key}", daemon=True,
+        ).start()
+
+    def _stop_log_stream(self, key: str) -> None:
+        """
+        Stops reading the logs of a container. Docker ends the stream when the
+        container stops; otherwise the thread ends with the next chunk.
+        """
+        with self._status_lock:
+            stop_event = self._log_streams.pop(key, None)
+        if stop_event is not None:
+            stop_event.set()
+
+    def _follow_log_stream(self, key: str, stop_event: threading.Event) -> None:
+        buffer = self._log_buffers[key]
+        # Continue after the last line of the previous stream of this session, or show
+        # the recent output. `since` has one-second granularity; the buffer drops the
+        # lines of that second it already has.
+        last_timestamp_ns = buffer.last_timestamp_ns()
+        if last_timestamp_ns is not None:
+            options = {"since": last_timestamp_ns // 1_000_000_000}
+        else:
+            options = {"tail": self._config.get("container_log_tail_lines", 200)}
+        try:
+            container = self._stream_client().containers.get(self.containers_config[key]["name"])
+            for chunk in container.logs(stream=True, follow=True, timestamps=True, **options):
+                if stop_event.is_set():
+                    break
+                buffer.feed(chunk)
+        except Exception as e:
+            if not stop_event.is_set():
+                logger.warning(f"Log stream of container {key} failed: {e}")
+        finally:
+            buffer.flush()
+            with self._status_lock:
+                if self._log_streams.get(key) is stop_event:
+                    del self._log_streams[key]
+
+    # --- Resource Usage ---
+    def _start_stats_stream(self, key: str) -> None:
+        """
+        Starts following the Docker stats stream of a running container.
+        """
+        with self._status_lock:
+            if not self._stats_enabled or key in self._stats_streams:
+                return
+            stop_event = threading.Event()
+            self._stats_streams[key] = stop_event
+        threading.Thread(
+            target=self._follow_stats_stream, args=(key, stop_event),
+            name=f"container-stats-{key}", daemon=True,
+        ).start()
+
+    def _stop_stats_stream(self, key: str) -> None:
+        """
+        Stops following the stats of a container. The stream thread ends with the
+        next sample, which Docker sends every second.
+        """
+        with self._status_lock:
+            stop_event = self._stats_streams.pop(key, None)
+        if stop_event is not None:
+            stop_event.set()
+            self._stats_coalescer.publish(key, {})
+
+    def _follow_stats_stream(self, key: str, stop_event: threading.Event) -> None:
+        window = ContainerStatsWindow(self._config.get("container_stats_window_s", 10.0))
+        try:
+            container = self._stream_client().containers.get(self.containers_config[key]["name"])
+            for raw in container.stats(stream=True, decode=True):
+                if stop_event.is_set():
+                    break
+                window.add(parse_stats(raw, time.monotonic()))
+                self._stats_coalescer.publish(key, window.summary())
+        except Exception as e:
+            if not stop_event.is_set():
+                logger.warning(f"Stats stream of container {key} failed: {e}")
+        finally:
+            with self._status_lock:
+                if self._stats_streams.get(key) is stop_event:
+                    del self._stats_streams[key]
+
+    def handle_container_event(self, event: dict) -> None:
+        """
+        Updates the status of a launch container from a Docker container event.
+        """
+        name = event.get("Actor", {}).get("Attributes", {}).get("name")
+        key = self._container_keys.get(name)
+        # Actions such as "exec_start: ..." or "health_status: ..." carry details after a colon.
+        status = _ContainerEventsWorker.EVENT_STATUSES.get(event.get("Action", "").split(":")[0])
+        if key is None or status is None:
+            return
+        self.update_container_status(key, status)
+
+    def get_all_launch_container_statuses(self) -> dict:
+        """
+        Returns the status of every launch container, keyed by launch profile,
+        with a single container listing request.
+        """
+        # The name filter matches substrings and names are listed with a leading "/",
+        # so the results are matched exactly here.
+        containers = self.docker.submit(
+            self.docker.list_containers(all=True, filters={"name": list(self._container_keys)})).result()
+        statuses = dict.fromkeys(self.containers_config, "not created")
+        for container in containers:
+            for name in container.get("Names") or []:
+                key = self._container_keys.get(name.lstrip("/"))
+                if key is not None:
+                    statuses[key] = container["State"]
+        return statuses
 
     def check_all_launch_containers(self) -> None:
-        for key in self.containers_config.keys():
-            self.check_launch_container(key)
+        try:
+            statuses = self.get_all_launch_container_statuses()
+        except DockerAPIError as e:
+            logger.warning(f"Could not list launch containers: {e}")
+            return
+        for key, status in statuses.items():
+            self.update_container_status(key, status)
 
     def remove_launch_container(self, key: str) -> None:
+        self.docker.submit(self._remove_launch_container(key)).result()
+
+    async def _remove_launch_container(self, key: str) -> None:
         try:
-            name = self.containers_config[key]["name"]
-            container = self.docker_client.containers.get(name)
-            container.remove(force=True)
+            await self.docker.remove_container(self.containers_config[key]["name"], force=True)
             logger.info(f"Removed container: {key}")
-        except docker.errors.NotFound:
+        except DockerNotFound:
             logger.warning(f"Container not found for removal: {key}")
             
-    def remove_all_launch_containers(self) -> None:
-        for key in self.containers_config.keys():
-            self.remove_launch_container(key=key)
-            logger.info(f"Removed container: {key}")
+    def remove_all_launch_containers(self) -> Dict[str, Future]:
+        """
+        Removes all launch containers concurrently in the background.
+        """
+        return self.run_lifecycle_operation("remove", self.containers_config.keys())
+
+    def shutdown_launch_containers(self) -> Future:
+        """
+        Ends all launch containers on exit without blocking: with `container_warm_pool`
+        they are stopped and kept for the next session, otherwise removed. Emits
+        signal_shutdown_finished when they are done, whether or not they succeeded;
+        close the Docker client with close_docker() after that.
+
+        Returns:
+            Future: Done when all containers were stopped or removed.
+        """
+        operation = "stop" if self._config.get("container_warm_pool", True) else "remove"
+        futures = self.run_lifecycle_operation(operation, self.containers_config.keys())
+        future = self.docker.submit(self._wait_for_operations(list(futures.values())))
+        future.add_done_callback(lambda _: self.signal_shutdown_finished.emit())
+        return future
+
+    @staticmethod
+    async def _wait_for_operations(futures: List[Future]) -> None:
+        if futures:
+            await asyncio.wait([asyncio.wrap_future(future) for future in futures])
+
+    def close_docker(self) -> None:
+        """
+        Closes the connections of the Docker clients and stops the loop thread of
+        the async one.
+        """
+        with self._docker_client_lock:
+            if self._docker_client is not None:
+                self._docker_client.close()
+                self._docker_client = None
+        self.docker.close()
+
+    def _on_docker_ping(self, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Failed to connect to Docker: {error}")
+        else:
+            logger.info("Docker connection established.")
+
+    # --- Concurrent Lifecycle Operations ---
+    def start_launch_containers(self, keys: Iterable[str]) -> Dict[str, Future]:
+        """
+        Starts containers concurrently, each after the containers it depends on.
+        """
+        return self.run_lifecycle_operation("start", keys)
+
+    def stop_launch_containers(self, keys: Iterable[str]) -> Dict[str, Future]:
+        """
+        Stops containers concurrently, each before the containers it depends on.
+        """
+        return self.run_lifecycle_operation("stop", keys)
+
+    def run_lifecycle_operation(self, operation: str, keys: Iterable[str]) -> Dict[str, Future]:
+        """
+        Runs "start", "stop", "remove" or "warm_up" for several containers on the Docker
+        client loop without blocking. Containers start after the containers in
+        their `depends_on` and are stopped or removed before them; otherwise the
+        operations run in parallel. Operations on the same container run in the
+        order they were requested. Emits signal_container_operation_progress as
+        the operations finish.
+
+        Args:
+            operation (str): "start", "stop", "remove" or "warm_up".
+            keys (Iterable[str]): Launch profile names.
+
+        Returns:
+            Dict[str, Future]: The operation of each container; a start whose
+                dependency failed to start is skipped and raises its error.
+        """
+        actions: Dict[str, Callable[[str], Awaitable[None]]] = {
+            "start": self._start_launch_container,
+            "stop": lambda key: self._stop_launch_container(key, timeout=self._config["container_stop_timeout"]),
+            "remove": self._remove_launch_container,
+            "warm_up": self._warm_up_launch_container,
+        }
+        action = actions[operation]
+        keys = self._dependency_order(keys, reverse=operation != "start")
+        progress = {"done": 0}
+        futures: Dict[str, Future] = {}
+        with self._lifecycle_lock:
+            for key in keys:
+                if operation == "start":
+                    follows = self.containers_config[key].get("depends_on", [])
+                elif operation in ("stop", "remove"):
+                    follows = [other for other in keys if key in self.containers_config[other].get("depends_on", [])]
+                else:
+                    follows = []
+                after = [futures[other] for other in follows if other in futures]
+                previous = self._last_operations.get(key)
+                future = self.docker.submit(
+                    self._run_lifecycle_action(operation, key, action, after, previous))
+                future.add_done_callback(
+                    lambda _, total=len(keys): self._on_lifecycle_action_done(operation, progress, total))
+                futures[key] = self._last_operations[key] = future
+        return futures
+
+    async def _run_lifecycle_action(
+            self, operation: str, key: str, action: Callable[[str], Awaitable[None]],
+            after: List[Future], previous: Future) -> None:
+        """
+        Runs one lifecycle action on the Docker client loop once the operations it follows are done.
+        """
+        if previous is not None:
+            await asyncio.wait([asyncio.wrap_future(previous)])
+        if after:
+            await asyncio.wait([asyncio.wrap_future(future) for future in after])
+        if operation in ("start", "warm_up") and self._image_ready is not None:
+            await asyncio.wait([asyncio.wrap_future(self._image_ready)])
+        if operation == "start":
+            failed = [future for future in after if future.exception() is not None]
+            if failed:
+                logger.warning(f"Not starting container {key}: a container it depends on failed to start.")
+                raise failed[0].exception()
+        try:
+            await action(key)
+        except DockerAPIError as e:
+            logger.error(f"Failed to {operation} container {key}: {e}")
+            raise
+
+    def _on_lifecycle_action_done(self, operation: str, progress: dict, total: int) -> None:
+        with self._lifecycle_lock:
+            progress["done"] += 1
+            done = progress["done"]
+        self.signal_container_operation_progress.emit(operation, done, total)
+
+    def _dependency_order(self, keys: Iterable[str], reverse: bool = False) -> List[str]:
+        """
+        Sorts container keys so every container comes after the containers it
+        depends on (before them if `reverse`).
+        """
+        keys = list(dict.fromkeys(keys))
+        ordered: List[str] = []
+
+        def visit(key: str, path: tuple) -> None:
+            if key in ordered:
+                return
+            if key in path:
+                raise ValueError(f"Circular container dependencies: {' -> '.join(path + (key,))}")
+            for dependency in self.containers_config[key].get("depends_on", []):
+                if dependency in keys:
+                    visit(dependency, path + (key,))
+            ordered.append(key)
+
+        for key in keys:
+            visit(key, ())
+        return ordered[::-1] if reverse else ordered
 
     # --- Periodic Task Management ---
-    def start_periodic_tasks(self, status_interval_ms: int = 1000, container_interval_ms: int = 1000):
+    def start_periodic_tasks(self, status_interval_ms: int = 30000):
         """
-        Starts a worker thread that handles two periodic tasks:
-          1. Periodically checks all launch container statuses.
-          2. Processes start/stop container requests.
+        Starts a worker thread that handles two tasks:
+          1. Periodically checks all launch container statuses, as a safety net
+             for missed Docker events.
+          2. Processes start/stop container requests as they arrive.
+        Also starts the thread following the Docker events of the launch containers
+        and the log and (with `container_stats_enabled`) stats streams of the running ones.
         """
         if self._container_manage_worker is None:
             self._container_manage_worker = _ContainerManageWorker(
                 model=self, 
-                status_interval=status_interval_ms, 
-                container_interval=container_interval_ms
+                status_interval=status_interval_ms,
             )
             self._worker_thread = QThread()
             self._container_manage_worker.moveToThread(self._worker_thread)
             self._worker_thread.started.connect(self._container_manage_worker.start_timers)
             self._worker_thread.start()
             logger.info("Periodic tasks started.")
+        if self._events_worker is None:
+            self._events_worker = _ContainerEventsWorker(model=self)
+            self._events_thread = QThread()
+            self._events_worker.moveToThread(self._events_thread)
+            self._events_thread.started.connect(self._events_worker.run)
+            self._events_thread.start()
+            logger.info("Container events watcher started.")
+        with self._status_lock:
+            running = [key for key, status in self._container_statuses.items() if status == "running"]
+        if not self._logs_enabled:
+            with self._status_lock:
+                self._logs_enabled = True
+            for key in running:
+                self._start_log_stream(key)
+        if not self._stats_enabled and self._config.get("container_stats_enabled", True):
+            with self._status_lock:
+                self._stats_enabled = True
+            self._stats_coalescer.start()
+            for key in running:
+                self._start_stats_stream(key)
 
     def stop_periodic_tasks(self):
         """
@@ -154,6 +623,26 @@ class ROS2LaunchContainerModel(QObject):
             logger.info("Periodic tasks stopped.")
             self._container_manage_worker = None
             self._worker_thread = None
+        if self._events_worker:
+            self._events_worker.stop()
+            self._events_thread.quit()
+            self._events_thread.wait()
+            logger.info("Container events watcher stopped.")
+            self._events_worker = None
+            self._events_thread = None
+        if self._stats_enabled:
+            with self._status_lock:
+                self._stats_enabled = False
+                keys = list(self._stats_streams)
+            for key in keys:
+                self._stop_stats_stream(key)
+            self._stats_coalescer.stop()
+        if self._logs_enabled:
+            with self._status_lock:
+                self._logs_enabled = False
+                keys = list(self._log_streams)
+            for key in keys:
+                self._stop_log_stream(key)
 
     # --- Slots to trigger start/stop container actions from external signals ---
     @pyqtSlot(str)
@@ -202,68 +691,158 @@ class ROS2LaunchContainerModel(QObject):
             self.on_signal_stop_container(key)
 
 
+class _ContainerEventsWorker(QObject):
+    """
+    Worker class running in a separate QThread that follows the Docker events
+    stream of the launch containers, so status changes are seen as they happen
+    without polling the daemon. The statuses are checked once whenever the
+    stream is (re)opened to catch up on changes made while it was closed.
+    """
+    # Container status after each lifecycle event action.
+    EVENT_STATUSES = {
+        "create": "created",
+        "start": "running",
+        "restart": "running",
+        "unpause": "running",
+        "pause": "paused",
+        "die": "exited",
+        "destroy": "not created",
+    }
+    RETRY_INTERVAL_S = 2.0
+
+    def __init__(self, model: ROS2LaunchContainerModel, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self._stop_event = threading.Event()
+        self._events = None
+
+    @pyqtSlot()
+    def run(self):
+        """Follows the events stream until stop() is called, reopening it on errors."""
+        filters = {
+            "type": "container",
+            "container": list(self.model._container_keys),
+            "event": list(self.EVENT_STATUSES),
+        }
+        while not self._stop_event.is_set():
+            client = None
+            try:
+                # A client of its own, so the stream does not hold up the other requests.
+                client = docker.from_env()
+                self._events = client.events(decode=True, filters=filters)
+                if self._stop_event.is_set():
+                    break
+                self.model.check_all_launch_containers()
+                for event in self._events:
+                    self.model.handle_container_event(event)
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    logger.warning(f"Docker events stream failed: {e}")
+            finally:
+                self._close_events()
+                if client is not None:
+                    # Each retry opens a new client; close this one's connection pool.
+                    client.close()
+            self._stop_event.wait(self.RETRY_INTERVAL_S)
+
+    def stop(self):
+        """Ends run() by closing the events stream. Safe to call from any thread."""
+        self._stop_event.set()
+        self._close_events()
+
+    def _close_events(self):
+        events, self._events = self._events, None
+        if events is not None:
+            try:
+                events.close()
+            except Exception:
+                pass
+
+
 class _ContainerManageWorker(QObject):
     """
-    Worker class running in a separate QThread to periodically perform tasks:
-      - Check the status of all launch containers.
-      - Process queued start/stop container requests.
+    Worker class running in a separate QThread that:
+      - Periodically checks the status of all launch containers, reconciling missed events.
+      - Hands queued start/stop container requests to the lifecycle operations as soon
+        as they are enqueued. Each container has at most one command in flight; a
+        newer request for a container replaces its pending one.
     """
-    def __init__(self, model: ROS2LaunchContainerModel, status_interval: int, container_interval: int, parent=None):
+    # Wakes the worker thread to process the queue; emitted from any thread.
+    signal_wake = pyqtSignal()
+
+    def __init__(self, model: ROS2LaunchContainerModel, status_interval: int, parent=None):
         super().__init__(parent)
         self.model = model
         self.status_interval = status_interval
-        self.container_interval = container_interval
 
         # Timer for checking container statuses.
         self.status_timer = QTimer(self)
         self.status_timer.setInterval(self.status_interval)
         self.status_timer.timeout.connect(self.perform_status_check)
 
-        # Timer for processing container start/stop requests.
-        self.container_process_timer = QTimer(self)
-        self.container_process_timer.setInterval(self.container_interval)
-        self.container_process_timer.timeout.connect(self.perform_container_process_task)
-
-        # Queues for pending start and stop requests.
-        self.start_queue = []
-        self.stop_queue = []
+        # Pending command per container, in request order, and the commands in flight.
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self.signal_wake.connect(self.perform_container_process_task)
 
     @pyqtSlot()
     def start_timers(self):
         self.status_timer.start()
-        self.container_process_timer.start()
 
     @pyqtSlot()
     def stop_timers(self):
         self.status_timer.stop()
-        self.container_process_timer.stop()
 
     @pyqtSlot()
     def perform_status_check(self):
-        """Periodically check all container statuses."""
+        """Periodically check all container statuses in case events were missed."""
         self.model.check_all_launch_containers()
 
     @pyqtSlot()
     def perform_container_process_task(self):
         """
-        Processes queued container start and stop requests.
-        """
-        # Process all start requests.
-        while self.start_queue:
-            key = self.start_queue.pop(0)
-            self.model.start_launch_container(key=key)
-        # Process all stop requests.
-        while self.stop_queue:
-            key = self.stop_queue.pop(0)
-            self.model.stop_launch_container(
-                key=key, timeout=self.model._config["container_stop_timeout"])
-    
+        Hands the pending commands of containers without a command in flight to
+        the lifecycle operations, batched per command.
+        """
+        batches: Dict[str, List[str]] = {"start": [], "stop": []}
+        with self._lock:
+            for key in list(self._pending):
+                future = self._in_flight.get(key)
+                if future is not None and not future.done():
+                    continue
+                batches[self._pending.pop(key)].append(key)
+        for command, keys in batches.items():
+            if not keys:
+                continue
+            futures = self.model.run_lifecycle_operation(command, keys)
+            with self._lock:
+                self._in_flight.update(futures)
+            for key, future in futures.items():
+                future.add_done_callback(
+                    lambda future, key=key, command=command: self._on_command_done(key, command, future))
+
+    def _on_command_done(self, key: str, command: str, future: Future):
+        result = "failed" if future.exception() is not None else "done"
+        self.model.signal_container_command_finished.emit(key, command, result)
+        self.signal_wake.emit()  # Pending commands of this container may go now.
+
+    def enqueue(self, key: str, command: str):
+        """
+        Queues a "start" or "stop" command and wakes the worker. A pending opposite
+        command of the same container is cancelled, as only the latest request counts.
+        """
+        with self._lock:
+            previous = self._pending.pop(key, None)
+            self._pending[key] = command
+        if previous is not None and previous != command:
+            self.model.signal_container_command_finished.emit(key, previous, "cancelled")
+        self.signal_wake.emit()
+
     def enqueue_start(self, key: str):
         """Adds a container start request to the queue."""
-        if key not in self.start_queue:
-            self.start_queue.append(key)
-    
+        self.enqueue(key, "start")
+
     def enqueue_stop(self, key: str):
         """Adds a container stop request to the queue."""
-        if key not in self.stop_queue:
-            self.stop_queue.append(key)
+        self.enqueue(key, "stop")
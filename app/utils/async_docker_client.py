@@ -0,0 +1,578 @@
+# async_docker_client.py
+"""
+Asynchronous client for the Docker Engine API over its Unix socket.
+
+The client runs its own asyncio loop on a background thread and keeps a pool of
+keep-alive HTTP/1.1 connections to the daemon, so concurrent requests run in
+parallel instead of queueing behind each other, and no caller thread blocks on
+the daemon unless it waits for the returned future.
+
+    client = AsyncDockerClient.from_env()
+    future = client.submit(client.inspect_container("name"))  # concurrent.futures.Future
+    container = future.result()
+
+Only the requests the launch containers and their image need are implemented;
+the events, stats and logs streams are not.
+"""
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from app.utils.logger import logger
+
+
+class DockerAPIError(Exception):
+    """
+    Error response of the Docker daemon, or failure to reach it.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class DockerNotFound(DockerAPIError):
+    """
+    The container or image does not exist (HTTP 404).
+    """
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncDockerClient:
+    """
+    Docker Engine API client with a pool of persistent Unix socket connections,
+    running on a shared event loop thread.
+    """
+
+    DEFAULT_SOCKET = "/var/run/docker.sock"
+    UPLOAD_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, pool_size: int = 8, timeout_s: float = 30.0):
+        """
+        Initializes the AsyncDockerClient and starts its event loop thread.
+
+        Args:
+            socket_path (str): Path of the Docker daemon socket.
+            pool_size (int): Maximum number of concurrent connections.
+            timeout_s (float): Default timeout of a request.
+        """
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self.timeout_s = timeout_s
+        self._idle: List[_Connection] = []
+        self._open_connections = 0
+        self._condition: Optional[asyncio.Condition] = None  # Created on the loop thread.
+        self._version_lock: Optional[asyncio.Lock] = None  # Created on the loop thread.
+        self._api_version: Optional[str] = None  # Negotiated with the daemon on the first request.
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="docker-client", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def from_env(pool_size: int = 8) -> 'AsyncDockerClient':
+        """
+        Creates a client for the socket in DOCKER_HOST (unix:// only) or the default socket.
+        """
+        host = os.environ.get("DOCKER_HOST", "")
+        if host and not host.startswith("unix://"):
+            raise DockerAPIError(f"Unsupported DOCKER_HOST {host}: only unix:// sockets are supported.")
+        return AsyncDockerClient(host[len("unix://"):] or AsyncDockerClient.DEFAULT_SOCKET, pool_size)
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine: Awaitable[Any]) -> Future:
+        """
+        Schedules a coroutine on the client's loop. Safe to call from any thread.
+
+        Returns:
+            Future: Resolves with the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections and stops the loop thread.
+        """
+        if not self.loop.is_running():
+            return
+
+        async def close_connections():
+            for connection in self._idle:
+                connection.close()
+            self._idle.clear()
+
+        try:
+            self.submit(close_connections()).result(timeout=1.0)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=1.0)
+
+    # --- Connection pool ---
+    @property
+    def _available(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _acquire(self) -> Tuple[_Connection, bool]:
+        """
+        Returns an idle connection or a new one, and whether it was idle.
+        """
+        async with self._available:
+            while not self._idle and self._open_connections >= self.pool_size:
+                await self._available.wait()
+            if self._idle:
+                return self._idle.pop(), True
+            self._open_connections += 1
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        except OSError as e:
+            await self._discard(None)
+            raise DockerAPIError(f"Cannot connect to the Docker daemon at {self.socket_path}: {e}") from e
+        return _Connection(reader, writer), False
+
+    async def _release(self, connection: _Connection) -> None:
+        async with self._available:
+            self._idle.append(connection)
+            self._available.notify()
+
+    async def _discard(self, connection: Optional[_Connection]) -> None:
+        if connection is not None:
+            connection.close()
+        async with self._available:
+            self._open_connections -= 1
+            self._available.notify()
+
+    # --- HTTP ---
+    async def api_version(self) -> str:
+        """
+        Returns the API version the requests use: the daemon's own, asked for once
+        through the unversioned GET /version, since Engine releases drop support
+        for old API versions.
+        """
+        if self._version_lock is None:
+            self._version_lock = asyncio.Lock()
+        async with self._version_lock:
+            if self._api_version is None:
+                _, data = await self.request("GET", "/version", versioned=False)
+                try:
+                    self._api_version = json.loads(data)["ApiVersion"]
+                except (ValueError, KeyError) as e:
+                    raise DockerAPIError(f"GET /version: malformed response: {e}") from e
+        return self._api_version
+
+    async def _target(self, path: str, params: Optional[Dict[str, Any]], versioned: bool = True) -> str:
+        target = f"/v{await self.api_version()}{path}" if versioned else path
+        if params:
+            target += "?" + urlencode(params)
+        return target
+
+    async def request(
+            self,
+            method: str,
+            path: str,
+            params: Optional[Dict[str, Any]] = None,
+            body: Any = None,
+            timeout_s: Optional[float] = None,
+            headers: Optional[Dict[str, str]] = None,
+            versioned: bool = True,
+        ) -> Tuple[int, bytes]:
+        """
+        Sends an API request on a pooled connection and reads the whole response.
+
+        Args:
+            method (str): HTTP method.
+            path (str): API path without the version prefix, e.g. "/containers/json".
+            params (Optional[Dict[str, Any]]): Query parameters.
+            body (Any): JSON body.
+            timeout_s (Optional[float]): Timeout of the request; the client default if None.
+            headers (Optional[Dict[str, str]]): Additional request headers.
+            versioned (bool): Whether to prefix the path with the API version.
+
+        Returns:
+            Tuple[int, bytes]: The status code and body of a 2xx or 304 response.
+
+        Raises:
+            DockerNotFound: On 404.
+            DockerAPIError: On other error responses, timeouts and connection errors.
+        """
+        target = await self._target(path, params, versioned)
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        head = f"{method} {target} HTTP/1.1\r\nHost: docker\r\nContent-Length: {len(payload)}\r\n"
+        if body is not None:
+            head += "Content-Type: application/json\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        message = head.encode("ascii") + b"\r\n" + payload
+
+        for attempt in range(2):
+            connection, reused = await self._acquire()
+            try:
+                status, headers, data = await asyncio.wait_for(
+                    self._exchange(connection, message), timeout_s or self.timeout_s)
+            except asyncio.TimeoutError:
+                await self._discard(connection)
+                raise DockerAPIError(f"{method} {path} timed out.")
+            except (OSError, asyncio.IncompleteReadError) as e:
+                await self._discard(connection)
+                if reused and attempt == 0:
+                    continue  # The daemon closed the idle connection; it never saw the request.
+                raise DockerAPIError(f"{method} {path} failed: {e}") from e
+            except ValueError as e:
+                await self._discard(connection)
+                raise DockerAPIError(f"{method} {path}: malformed response: {e}") from e
+            except BaseException:
+                await self._discard(connection)  # Cancelled or garbled mid-response: the connection is unusable.
+                raise
+            break
+        if headers.get("connection", "").lower() == "close":
+            await self._discard(connection)
+        else:
+            await self._release(connection)
+
+        if status >= 400:
+            raise self._error(method, path, status, data)
+        return status, data
+
+    async def _exchange(self, connection: _Connection, message: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        connection.writer.write(message)
+        await connection.writer.drain()
+        status, headers = await self._read_head(connection.reader)
+        body = b"".join([chunk async for chunk in self._iter_body(connection.reader, status, headers)])
+        return status, headers, body
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split(b" ", 2)[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                return status, headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    @staticmethod
+    async def _iter_body(
+            reader: asyncio.StreamReader,
+            status: int,
+            headers: Dict[str, str],
+            timeout_s: Optional[float] = None,
+        ) -> AsyncIterator[bytes]:
+        """
+        Yields the body of a response as it arrives, each read limited to `timeout_s`.
+        """
+        if status in (204, 304) or 100 <= status < 200:
+            return
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout_s)
+                size = int(size_line.split(b";")[0], 16)
+                if size == 0:
+                    # Trailer headers up to the final empty line.
+                    while await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout_s) != b"\r\n":
+                        pass
+                    return
+                yield await asyncio.wait_for(reader.readexactly(size), timeout_s)
+                await asyncio.wait_for(reader.readexactly(2), timeout_s)
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining:
+                chunk = await asyncio.wait_for(reader.read(min(remaining, 65536)), timeout_s)
+                if not chunk:
+                    raise asyncio.IncompleteReadError(chunk, remaining)
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            headers["connection"] = "close"  # Body delimited by the end of the connection.
+            while chunk := await asyncio.wait_for(reader.read(65536), timeout_s):
+                yield chunk
+
+    @staticmethod
+    def _error(method: str, path: str, status: int, data: bytes) -> DockerAPIError:
+        try:
+            error = json.loads(data).get("message", "")
+        except ValueError:
+            error = data.decode("utf-8", errors="replace")
+        error_type = DockerNotFound if status == 404 else DockerAPIError
+        return error_type(f"{method} {path}: {status} {error}", status)
+
+    async def stream_json(
+            self,
+            method: str,
+            path: str,
+            params: Optional[Dict[str, Any]] = None,
+            upload_path: Optional[str] = None,
+            idle_timeout_s: float = 300.0,
+            headers: Optional[Dict[str, str]] = None,
+        ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Sends a request on a connection of its own and yields the JSON messages
+        of the streamed response, such as the progress of a pull. Long-running
+        streams would otherwise hold a pooled connection for minutes.
+
+        Args:
+            method (str): HTTP method.
+            path (str): API path without the version prefix.
+            params (Optional[Dict[str, Any]]): Query parameters.
+            upload_path (Optional[str]): File sent as the tar request body.
+            idle_timeout_s (float): Longest wait for the next part of the response.
+            headers (Optional[Dict[str, str]]): Additional request headers.
+
+        Raises:
+            DockerNotFound: On 404.
+            DockerAPIError: On error responses, error messages in the stream,
+                timeouts and connection errors.
+        """
+        target = await self._target(path, params)
+        head = f"{method} {target} HTTP/1.1\r\nHost: docker\r\n"
+        if upload_path is not None:
+            head += f"Content-Type: application/x-tar\r\nContent-Length: {os.path.getsize(upload_path)}\r\n"
+        else:
+            head += "Content-Length: 0\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        except OSError as e:
+            raise DockerAPIError(f"Cannot connect to the Docker daemon at {self.socket_path}: {e}") from e
+        try:
+            writer.write(head.encode("ascii") + b"\r\n")
+            if upload_path is not None:
+                loop = asyncio.get_running_loop()
+                with open(upload_path, "rb") as file:
+                    while chunk := await loop.run_in_executor(None, file.read, self.UPLOAD_CHUNK_SIZE):
+                        writer.write(chunk)
+                        await asyncio.wait_for(writer.drain(), idle_timeout_s)
+            await writer.drain()
+            status, headers = await asyncio.wait_for(self._read_head(reader), idle_timeout_s)
+            if status >= 400:
+                data = b"".join([chunk async for chunk in self._iter_body(reader, status, headers, idle_timeout_s)])
+                raise self._error(method, path, status, data)
+            pending = b""
+            async for chunk in self._iter_body(reader, status, headers, idle_timeout_s):
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield self._stream_message(method, path, line)
+            if pending.strip():
+                yield self._stream_message(method, path, pending)
+        except asyncio.TimeoutError:
+            raise DockerAPIError(f"{method} {path} stalled for {idle_timeout_s} s.")
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            raise DockerAPIError(f"{method} {path} failed: {e}") from e
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _stream_message(method: str, path: str, line: bytes) -> Dict[str, Any]:
+        message = json.loads(line)
+        if message.get("error"):
+            raise DockerAPIError(f"{method} {path}: {message['error']}")
+        return message
+
+    async def _json(self, method: str, path: str, **kwargs: Any) -> Any:
+        _, data = await self.request(method, path, **kwargs)
+        return json.loads(data) if data else None
+
+    # --- Docker API ---
+    async def ping(self) -> bool:
+        """
+        Returns True if the daemon answers.
+        """
+        _, data = await self.request("GET", "/_ping")
+        return data == b"OK"
+
+    async def list_containers(self, all: bool = False, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Lists containers, see GET /containers/json. Entries have 'Names' and 'State'.
+        """
+        params = {"all": "1" if all else "0"}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        return await self._json("GET", "/containers/json", params=params)
+
+    async def inspect_container(self, name: str) -> Dict[str, Any]:
+        """
+        Returns the details of a container; its status is in ['State']['Status'].
+
+        Raises:
+            DockerNotFound: If the container does not exist.
+        """
+        return await self._json("GET", f"/containers/{quote(name)}/json")
+
+    async def create_container(self, name: str, config: Dict[str, Any]) -> str:
+        """
+        Creates a container from an API container config and returns its ID.
+        """
+        response = await self._json("POST", "/containers/create", params={"name": name}, body=config)
+        for warning in response.get("Warnings") or []:
+            logger.warning(f"Creating container {name}: {warning}")
+        return response["Id"]
+
+    async def start_container(self, name: str) -> bool:
+        """
+        Starts a container. Returns False if it was already running.
+        """
+        status, _ = await self.request("POST", f"/containers/{quote(name)}/start")
+        return status != 304
+
+    async def stop_container(self, name: str, timeout: int = 10) -> bool:
+        """
+        Stops a container, killing it after `timeout` seconds. Returns False if
+        it was not running.
+        """
+        status, _ = await self.request(
+            "POST", f"/containers/{quote(name)}/stop", params={"t": timeout},
+            timeout_s=timeout + self.timeout_s)
+        return status != 304
+
+    async def remove_container(self, name: str, force: bool = False) -> None:
+        """
+        Removes a container, killing it first if `force`.
+        """
+        await self.request("DELETE", f"/containers/{quote(name)}", params={"force": "1" if force else "0"})
+
+    async def inspect_image(self, name: str) -> Dict[str, Any]:
+        """
+        Returns the details of a local image.
+
+        Raises:
+            DockerNotFound: If the image is not available locally.
+        """
+        return await self._json("GET", f"/images/{quote(name, safe='/:')}/json")
+
+    async def distribution_digest(self, name: str) -> str:
+        """
+        Returns the manifest digest of an image in its registry, without pulling it.
+        Uses the registry credentials of the Docker config, see registry_auth_header().
+        """
+        response = await self._json(
+            "GET", f"/distribution/{quote(name, safe='/:')}/json", headers=await self._registry_headers(name))
+        return response["Descriptor"]["digest"]
+
+    async def pull_image(self, name: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Pulls an image, yielding the progress messages of the daemon
+        ('status', 'id' of the layer and 'progressDetail'). Uses the registry
+        credentials of the Docker config, see registry_auth_header().
+        """
+        repository, tag = split_image_reference(name)
+        async for message in self.stream_json(
+                "POST", "/images/create", params={"fromImage": repository, "tag": tag},
+                headers=await self._registry_headers(name)):
+            yield message
+
+    async def _registry_headers(self, name: str) -> Dict[str, str]:
+        # Reading the config and running a credential helper block, so they run off the loop.
+        auth = await asyncio.get_running_loop().run_in_executor(None, registry_auth_header, name)
+        return {"X-Registry-Auth": auth} if auth else {}
+
+    async def load_image(self, tar_path: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Loads the images of a `docker save` tarball, yielding the progress messages.
+        """
+        async for message in self.stream_json("POST", "/images/load", params={"quiet": "0"}, upload_path=tar_path):
+            yield message
+
+
+def split_image_reference(name: str) -> Tuple[str, str]:
+    """
+    Splits an image reference into repository and tag (or digest), e.g.
+    "ghcr.io:443/org/image:1.0" into ("ghcr.io:443/org/image", "1.0").
+    """
+    if "@" in name:
+        repository, _, digest = name.partition("@")
+        return repository, digest
+    repository, separator, tag = name.rpartition(":")
+    if separator and "/" not in tag:
+        return repository, tag
+    return name, "latest"
+
+
+DOCKER_HUB_AUTH_KEY = "https://index.docker.io/v1/"
+
+
+def image_registry(name: str) -> str:
+    """
+    Returns the registry host of an image reference, "docker.io" for Docker Hub images.
+    """
+    first, separator, _ = split_image_reference(name)[0].partition("/")
+    if separator and ("." in first or ":" in first or first == "localhost"):
+        return first
+    return "docker.io"
+
+
+def registry_auth_header(name: str) -> Optional[str]:
+    """
+    Returns the X-Registry-Auth header value with the credentials of the registry
+    of an image, read like the docker CLI does from the Docker config
+    ($DOCKER_CONFIG/config.json or ~/.docker/config.json): the credential helper
+    of the registry in 'credHelpers', else the 'credsStore' helper, else the
+    base64 'auth' entry in 'auths'. None if there are no credentials.
+    """
+    registry = image_registry(name)
+    config_path = os.path.join(
+        os.environ.get("DOCKER_CONFIG") or os.path.join(os.path.expanduser("~"), ".docker"), "config.json")
+    try:
+        with open(config_path) as f:
+            docker_config = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read Docker config {config_path}: {e}")
+        return None
+
+    server = DOCKER_HUB_AUTH_KEY if registry == "docker.io" else registry
+    helper = (docker_config.get("credHelpers") or {}).get(registry) or docker_config.get("credsStore")
+    credentials = _helper_credentials(helper, server) if helper else None
+    if credentials is None:
+        credentials = _auths_credentials(docker_config.get("auths") or {}, registry, server)
+    if credentials is None:
+        return None
+    payload = json.dumps(credentials).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _auths_credentials(auths: Dict[str, Any], registry: str, server: str) -> Optional[Dict[str, str]]:
+    for key, entry in auths.items():
+        host = key.split("://", 1)[-1].split("/", 1)[0]
+        if key != server and host != registry and not (registry == "docker.io" and host == "index.docker.io"):
+            continue
+        if entry.get("identitytoken"):
+            return {"identitytoken": entry["identitytoken"], "serveraddress": server}
+        if entry.get("auth"):
+            username, _, password = base64.b64decode(entry["auth"]).decode("utf-8").partition(":")
+            return {"username": username, "password": password, "serveraddress": server}
+    return None
+
+
+def _helper_credentials(helper: str, server: str) -> Optional[Dict[str, str]]:
+    try:
+        result = subprocess.run(
+            [f"docker-credential-{helper}", "get"], input=server.encode("utf-8"),
+            capture_output=True, timeout=10, check=True)
+        response = json.loads(result.stdout)
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        logger.warning(f"Docker credential helper {helper} failed for {server}: {e}")
+        return None
+    if response.get("Username") == "<token>":
+        return {"identitytoken": response.get("Secret", ""), "serveraddress": server}
+    return {"username": response.get("Username", ""), "password": response.get("Secret", ""), "serveraddress": server}
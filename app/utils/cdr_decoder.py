@@ -1,257 +1,1068 @@
+# cdr_decoder.py
+"""
+Schema-driven CDR decoder for ROS 2 messages received through the Foxglove bridge.
+
+The Foxglove `advertise` op carries the full message definition of every channel
+(`ros2msg` or `ros2idl` schema encoding). `compile_schema` parses that text once
+and compiles a per-type decode plan: consecutive fixed-size fields are merged
+into a single precompiled `struct.Struct`, and CDR alignment is resolved at
+compile time wherever the offset is statically known. Only strings and
+sequences need work at decode time.
+"""
+import re
 import struct
+from functools import lru_cache
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-#TODO: We need to make a proper CDR decoder for the messages, no matter the different frame_id values.
-# However, for now, we just handle specific message types with specific frame_id individually
+import numpy as np
 
-def decode_imu(data: bytes):
-    # Skip the 4-byte CDR encapsulation header
-    # Typically: 00 01 00 00 indicates little-endian CDR
-    offset = 4
-
-    # 1) Decode Header
-    #   a) stamp.sec (int32), stamp.nanosec (uint32)
-    sec, = struct.unpack_from('<i', data, offset)
-    offset += 4
-    nanosec, = struct.unpack_from('<I', data, offset)
-    offset += 4
-
-    #   b) frame_id (string)
-    #      Read length (including null terminator)
-    # Read frame_id string length (includes null terminator)
-    frame_id_len, = struct.unpack_from('<I', data, offset)
-    offset += 4  # Move past the length field (4 bytes)
-    # Extract the frame_id string (excluding null terminator)
-    frame_id = data[offset:offset+frame_id_len-1].decode('utf-8')
-    offset += frame_id_len  # Move past the string (including null terminator)
-    # CDR alignment: strings with their length field must be aligned to 8-byte boundaries
-    # Calculate required padding to reach next 8-byte boundary
-    total_string_size = 4 + frame_id_len  # 4 bytes for length field + string bytes
-    padding_bytes = (8 - (total_string_size % 8)) % 8  # Calculate needed padding (0-7 bytes)
-    offset += padding_bytes  # Move past the padding
-    
-    if frame_id != 'gps_left_link':
-        # Skip the rest of the message if frame_id is not 'left_gps_link'
+# Size of the CDR encapsulation header (representation id + options).
+CDR_HEADER_SIZE = 4
+
+# ros2msg primitive type -> (struct format char, size in bytes)
+PRIMITIVE_TYPES = {
+    "bool": ("?", 1),
+    "byte": ("B", 1),
+    "char": ("B", 1),
+    "int8": ("b", 1),
+    "uint8": ("B", 1),
+    "int16": ("h", 2),
+    "uint16": ("H", 2),
+    "int32": ("i", 4),
+    "uint32": ("I", 4),
+    "int64": ("q", 8),
+    "uint64": ("Q", 8),
+    "float32": ("f", 4),
+    "float64": ("d", 8),
+}
+
+STRING_TYPES = ("string", "wstring")
+
+# ros2msg primitive type -> numpy type code (without byte order)
+_NUMPY_TYPES = {
+    "bool": "?",
+    "byte": "u1",
+    "char": "u1",
+    "int8": "i1",
+    "uint8": "u1",
+    "int16": "i2",
+    "uint16": "u2",
+    "int32": "i4",
+    "uint32": "u4",
+    "int64": "i8",
+    "uint64": "u8",
+    "float32": "f4",
+    "float64": "f8",
+}
+
+_FRAME_ID_SIZE = {"<": struct.Struct("<I"), ">": struct.Struct(">I")}
+# header.stamp (int32 sec, uint32 nanosec) directly follows the encapsulation header.
+_HEADER_STAMP = {"<": struct.Struct("<iI"), ">": struct.Struct(">iI")}
+
+# IDL type names -> ros2msg type names
+_IDL_TYPES = {
+    "boolean": "bool",
+    "octet": "byte",
+    "char": "char",
+    "wchar": "uint16",
+    "short": "int16",
+    "unsigned short": "uint16",
+    "long": "int32",
+    "unsigned long": "uint32",
+    "long long": "int64",
+    "unsigned long long": "uint64",
+    "float": "float32",
+    "double": "float64",
+    "long double": "float64",
+    "int8": "int8",
+    "uint8": "uint8",
+    "int16": "int16",
+    "uint16": "uint16",
+    "int32": "int32",
+    "uint32": "uint32",
+    "int64": "int64",
+    "uint64": "uint64",
+    "string": "string",
+    "wstring": "wstring",
+}
+
+# Definitions that are always available, even if a schema omits them.
+_BUILTIN_DEFINITIONS = {
+    "builtin_interfaces/Time": "int32 sec\nuint32 nanosec\n",
+    "builtin_interfaces/Duration": "int32 sec\nuint32 nanosec\n",
+}
+
+_SECTION_SEPARATOR = re.compile(r"^={10,}\s*$", re.MULTILINE)
+_MSG_TYPE_PATTERN = re.compile(
+    r"^(?P<type>[A-Za-z][\w/]*)(?:<=\d+)?(?:\[(?P<bound><=)?(?P<len>\d*)\])?$")
+
+
+class Field(NamedTuple):
+    """A single field of a message definition."""
+    name: str
+    type: str                # primitive name, 'string'/'wstring' or 'pkg/Type'
+    array: Optional[str]     # None, 'fixed' or 'sequence'
+    length: int = 0          # element count of fixed arrays
+
+
+class SchemaError(ValueError):
+    """Raised when a channel schema cannot be parsed or compiled."""
+
+
+def normalize_type_name(name: str) -> str:
+    """
+    Normalizes 'pkg/msg/Type' and 'pkg::msg::Type' to 'pkg/Type'.
+    """
+    parts = [p for p in re.split(r"/|::", name) if p]
+    if len(parts) == 3 and parts[1] in ("msg", "srv", "action"):
+        parts = [parts[0], parts[2]]
+    return "/".join(parts)
+
+
+# --- ros2msg parsing ---
+
+def _resolve_msg_type(type_name: str, package: str) -> str:
+    if type_name in PRIMITIVE_TYPES or type_name in STRING_TYPES:
+        return type_name
+    if type_name == "Header":
+        return "std_msgs/Header"
+    if "/" not in type_name:
+        return f"{package}/{type_name}"
+    return normalize_type_name(type_name)
+
+
+def _parse_msg_fields(text: str, package: str) -> List[Field]:
+    fields = []
+    for raw_line in text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        tokens = line.split()
+        if len(tokens) < 2:
+            raise SchemaError(f"Invalid field definition: '{raw_line}'")
+        if "=" in tokens[1] or (len(tokens) > 2 and tokens[2].startswith("=")):
+            continue  # constant
+        match = _MSG_TYPE_PATTERN.match(tokens[0])
+        if match is None:
+            raise SchemaError(f"Invalid field type: '{tokens[0]}'")
+        field_type = _resolve_msg_type(match.group("type"), package)
+        if match.group(0).endswith("]"):
+            if match.group("len") and not match.group("bound"):
+                fields.append(Field(tokens[1], field_type, "fixed", int(match.group("len"))))
+            else:
+                fields.append(Field(tokens[1], field_type, "sequence"))
+        else:
+            fields.append(Field(tokens[1], field_type, None))
+    return fields
+
+
+def parse_ros2msg(schema_name: str, schema: str) -> Dict[str, List[Field]]:
+    """
+    Parses a `ros2msg` schema (the root definition followed by dependent
+    definitions separated by '=' lines and introduced by 'MSG: pkg/Type').
+
+    Returns:
+        Dict[str, List[Field]]: Field lists keyed by normalized type name.
+    """
+    root = normalize_type_name(schema_name)
+    definitions: Dict[str, List[Field]] = {}
+    for index, section in enumerate(_SECTION_SEPARATOR.split(schema)):
+        name = root
+        body = section
+        if index > 0:
+            section = section.strip("\n")
+            header, _, body = section.partition("\n")
+            if not header.startswith("MSG:"):
+                raise SchemaError(f"Invalid schema section header: '{header}'")
+            name = normalize_type_name(header[4:].strip())
+        definitions[name] = _parse_msg_fields(body, name.split("/")[0])
+    return definitions
+
+
+# --- ros2idl parsing ---
+
+_IDL_TOKEN = re.compile(r'"(?:\\.|[^"])*"|::|[A-Za-z_]\w*|-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|\S')
+# Comments and preprocessor lines (#include, #pragma) carry nothing we need.
+_IDL_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/|^\s*#[^\n]*", re.DOTALL | re.MULTILINE)
+
+
+class _IdlParser:
+    """Minimal recursive-descent parser for the IDL subset emitted by rosidl."""
+
+    def __init__(self, text: str):
+        self.tokens = _IDL_TOKEN.findall(_IDL_COMMENT.sub(" ", text))
+        self.pos = 0
+        self.definitions: Dict[str, List[Field]] = {}
+        self.typedefs: Dict[str, Tuple[str, Optional[str], int]] = {}
+        self.constants: Dict[str, int] = {}
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise SchemaError("Unexpected end of IDL schema")
+        self.pos += 1
+        return token
+
+    def _expect(self, token: str) -> None:
+        found = self._next()
+        if found != token:
+            raise SchemaError(f"Expected '{token}' in IDL schema, found '{found}'")
+
+    def _skip_annotation(self) -> None:
+        self._next()  # annotation name
+        if self._peek() == "(":
+            depth = 0
+            while True:
+                token = self._next()
+                depth += token == "("
+                depth -= token == ")"
+                if depth == 0:
+                    break
+
+    def _scoped_name(self) -> str:
+        parts = [self._next()]
+        while self._peek() == "::":
+            self._next()
+            parts.append(self._next())
+        return "::".join(parts)
+
+    def _int_value(self) -> int:
+        token = self._next()
+        if token.lstrip("-").isdigit():
+            return int(token)
+        name = token
+        while self._peek() == "::":
+            self._next()
+            name = self._next()
+        if name not in self.constants:
+            raise SchemaError(f"Unknown IDL constant '{token}'")
+        return self.constants[name]
+
+    def _type_spec(self, scope: List[str]) -> Tuple[str, Optional[str], int]:
+        token = self._peek()
+        if token == "sequence":
+            self._next()
+            self._expect("<")
+            element, _, _ = self._type_spec(scope)
+            if self._peek() == ",":
+                self._next()
+                self._int_value()
+            self._expect(">")
+            return element, "sequence", 0
+        if token in ("string", "wstring"):
+            self._next()
+            if self._peek() == "<":
+                self._next()
+                self._int_value()
+                self._expect(">")
+            return token, None, 0
+        if token in ("unsigned", "long"):
+            words = []
+            while self._peek() in ("unsigned", "long", "short"):
+                words.append(self._next())
+            if words[-1] == "long" and self._peek() == "double":
+                words.append(self._next())
+            return _IDL_TYPES[" ".join(words)], None, 0
+        name = self._scoped_name()
+        if name in _IDL_TYPES:
+            return _IDL_TYPES[name], None, 0
+        if name in self.typedefs:
+            return self.typedefs[name]
+        if "::" not in name:
+            name = "::".join(scope + [name])
+        return normalize_type_name(name), None, 0
+
+    def _declarator(self) -> Tuple[str, int]:
+        name = self._next()
+        length = 0
+        while self._peek() == "[":
+            self._next()
+            length = (length or 1) * self._int_value()
+            self._expect("]")
+        return name, length
+
+    def parse(self, scope: Optional[List[str]] = None) -> None:
+        scope = scope or []
+        while self._peek() not in (None, "}"):
+            token = self._next()
+            if token == "@":
+                self._skip_annotation()
+            elif token == "module":
+                name = self._next()
+                self._expect("{")
+                self.parse(scope + [name])
+                self._expect("}")
+                self._expect(";")
+            elif token == "struct":
+                self._parse_struct(scope)
+            elif token == "const":
+                self._type_spec(scope)
+                name = self._next()
+                self._expect("=")
+                value = self._next()
+                self._expect(";")
+                if value.lstrip("-").isdigit():
+                    self.constants[name] = int(value)
+            elif token == "typedef":
+                element, array, _ = self._type_spec(scope)
+                name, length = self._declarator()
+                self._expect(";")
+                self.typedefs[name] = (element, "fixed", length) if length else (element, array, 0)
+            elif token in ("enum", "union"):
+                raise SchemaError(f"Unsupported IDL construct '{token}'")
+
+    def _parse_struct(self, scope: List[str]) -> None:
+        name = self._next()
+        self._expect("{")
+        fields = []
+        while self._peek() != "}":
+            if self._peek() == "@":
+                self._next()
+                self._skip_annotation()
+                continue
+            element, array, length = self._type_spec(scope)
+            while True:
+                field_name, field_length = self._declarator()
+                if field_length:
+                    fields.append(Field(field_name, element, "fixed", field_length))
+                else:
+                    fields.append(Field(field_name, element, array, length))
+                if self._peek() != ",":
+                    break
+                self._next()
+            self._expect(";")
+        self._expect("}")
+        self._expect(";")
+        self.definitions[normalize_type_name("::".join(scope + [name]))] = fields
+
+
+def parse_ros2idl(schema_name: str, schema: str) -> Dict[str, List[Field]]:
+    """
+    Parses a `ros2idl` schema (IDL sections separated by '=' lines and
+    introduced by 'IDL: pkg/msg/Type').
+
+    Returns:
+        Dict[str, List[Field]]: Field lists keyed by normalized type name.
+    """
+    definitions: Dict[str, List[Field]] = {}
+    for section in _SECTION_SEPARATOR.split(schema):
+        section = section.strip("\n")
+        if section.startswith("IDL:"):
+            section = section.partition("\n")[2]
+        parser = _IdlParser(section)
+        parser.parse()
+        definitions.update(parser.definitions)
+    if normalize_type_name(schema_name) not in definitions:
+        raise SchemaError(f"Schema does not define '{schema_name}'")
+    return definitions
+
+
+# --- Decode plan compilation ---
+
+Step = Callable[[Any, int, list], int]
+
+
+def _block_step(fmt: str, align: int) -> Step:
+    unpack_from = struct.Struct(fmt).unpack_from
+    size = struct.calcsize(fmt)
+    mask = align - 1
+    base = CDR_HEADER_SIZE
+
+    if mask:
+        def step(buf, pos, out):
+            pos += -pos & mask
+            out.extend(unpack_from(buf, base + pos))
+            return pos + size
+    else:
+        def step(buf, pos, out):
+            out.extend(unpack_from(buf, base + pos))
+            return pos + size
+    return step
+
+
+class CdrString:
+    """
+    A string field that keeps a zero-copy view of the received frame and is only
+    decoded when it is read. Compares equal to both `str` and raw `bytes`, so
+    filters such as frame_id checks can run without decoding.
+    """
+    __slots__ = ("raw", "_text")
+
+    def __init__(self, raw: memoryview):
+        self.raw = raw
+        self._text: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = str(self.raw, "utf-8")
+        return self._text
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, str):
+            return str(self) == other
+        if isinstance(other, (bytes, bytearray, memoryview, CdrString)):
+            return self.raw == (other.raw if isinstance(other, CdrString) else other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+
+def _string_step(byteorder: str, wide: bool, lazy: bool) -> Step:
+    unpack_len = struct.Struct(byteorder + "I").unpack_from
+    base = CDR_HEADER_SIZE
+    encoding = ("utf-32-le" if byteorder == "<" else "utf-32-be") if wide else "utf-8"
+    char_size = 4 if wide else 1
+    terminator = 0 if wide else 1
+    wrap = CdrString if lazy and not wide else None
+
+    def step(buf, pos, out):
+        pos += -pos & 3
+        length, = unpack_len(buf, base + pos)
+        pos += 4
+        start = base + pos
+        size = length * char_size
+        # Slicing the memoryview is zero-copy; str() decodes straight from the frame.
+        raw = buf[start:start + size - terminator] if length else buf[start:start]
+        out.append(wrap(raw) if wrap is not None else str(raw, encoding))
+        return pos + size
+    return step
+
+
+def _primitive_sequence_step(byteorder: str, type_name: str, skip: bool = False) -> Step:
+    unpack_len = struct.Struct(byteorder + "I").unpack_from
+    char, size = PRIMITIVE_TYPES[type_name]
+    mask = size - 1
+    base = CDR_HEADER_SIZE
+    as_bytes = type_name in ("byte", "uint8", "char")
+
+    def step(buf, pos, out):
+        pos += -pos & 3
+        count, = unpack_len(buf, base + pos)
+        pos += 4
+        if count and mask:
+            pos += -pos & mask
+        if skip:
+            return pos + count * size
+        start = base + pos
+        if as_bytes:
+            out.append(bytes(buf[start:start + count]))
+        else:
+            out.append(list(struct.unpack_from(f"{byteorder}{count}{char}", buf, start)))
+        return pos + count * size
+    return step
+
+
+def _element_sequence_step(byteorder: str, element: "_Plan", skip: bool = False) -> Step:
+    unpack_len = struct.Struct(byteorder + "I").unpack_from
+    steps = element.steps
+    build = element.build
+    base = CDR_HEADER_SIZE
+
+    def step(buf, pos, out):
+        pos += -pos & 3
+        count, = unpack_len(buf, base + pos)
+        pos += 4
+        items = []
+        for _ in range(count):
+            values = []
+            for element_step in steps:
+                pos = element_step(buf, pos, values)
+            if not skip:
+                items.append(build(values))
+        if not skip:
+            out.append(items)
+        return pos
+    return step
+
+
+def _string_skip_step(byteorder: str, wide: bool) -> Step:
+    unpack_len = struct.Struct(byteorder + "I").unpack_from
+    base = CDR_HEADER_SIZE
+    char_size = 4 if wide else 1
+
+    def step(buf, pos, out):
+        pos += -pos & 3
+        length, = unpack_len(buf, base + pos)
+        return pos + 4 + length * char_size
+    return step
+
+
+def _skip_step(size: int, align: int) -> Step:
+    mask = align - 1
+
+    def step(buf, pos, out):
+        return pos + (-pos & mask) + size
+    return step
+
+
+class _Plan(NamedTuple):
+    steps: Tuple[Step, ...]
+    build: Callable[[list], Any]
+
+
+def _builder(expression: str) -> Callable[[list], Any]:
+    # The expression only contains repr()'d field names and integer indices.
+    return eval(f"lambda v: {expression}", {"__builtins__": {}})
+
+
+# Field selection tree: None selects a whole field, a dict selects sub-fields.
+Selection = Optional[Dict[str, Any]]
+
+
+def _selection_tree(paths: Iterable[str]) -> Dict[str, Any]:
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                break  # The parent field is already selected as a whole.
+            node[part] = child
+            node = child
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+class _PlanCompiler:
+    """
+    Compiles a message definition into a flat list of decode steps plus a
+    builder expression that rebuilds the nested dict from the flat value list.
+
+    The compiler tracks the payload offset modulo `_modulus` (`_phase`). While
+    the offset is statically known, alignment padding is baked into the
+    pending `struct` format; a dynamic alignment is only emitted after
+    variable-length fields (strings, sequences).
+
+    Fields outside the selection are skipped: fixed-size ones become pad bytes
+    of the surrounding struct, variable-size ones only have their length read.
+    """
+
+    def __init__(self, definitions: Dict[str, List[Field]], byteorder: str, modulus: int, lazy_strings: bool):
+        self._definitions = definitions
+        self._byteorder = byteorder
+        self._lazy_strings = lazy_strings
+        self._steps: List[Step] = []
+        self._produces: List[bool] = []
+        self._count = 0
+        self._fmt: List[str] = []
+        self._block_values = 0
+        self._block_align = 1
+        self._phase = 0
+        self._modulus = modulus
+
+    def compile(self, type_name: str, selection: Selection = None, truncate: bool = False) -> _Plan:
+        """
+        Args:
+            type_name (str): The normalized message type.
+            selection (Selection): Fields to decode, None for all of them.
+            truncate (bool): Stop reading after the last selected field. Only valid
+                for top-level plans, since sequence elements must consume their size.
+        """
+        expression = self._message(type_name, selection)
+        if truncate:
+            while self._fmt and self._fmt[-1].endswith("x"):
+                self._fmt.pop()
+        self._flush()
+        if truncate:
+            while self._produces and not self._produces[-1]:
+                self._produces.pop()
+                self._steps.pop()
+        return _Plan(tuple(self._steps), _builder(expression))
+
+    def _fields(self, type_name: str) -> List[Field]:
+        if type_name not in self._definitions:
+            raise SchemaError(f"Missing definition for '{type_name}'")
+        return self._definitions[type_name]
+
+    def _flush(self) -> None:
+        if self._fmt:
+            fmt = self._byteorder + "".join(self._fmt)
+            if self._block_values:
+                self._steps.append(_block_step(fmt, self._block_align))
+            else:
+                self._steps.append(_skip_step(struct.calcsize(fmt), self._block_align))
+            self._produces.append(self._block_values > 0)
+        self._fmt = []
+        self._block_values = 0
+        self._block_align = 1
+
+    def _align(self, alignment: int) -> None:
+        if alignment <= self._modulus:
+            pad = -self._phase % alignment
+            if pad:
+                self._fmt.append(f"{pad}x")
+                self._phase = (self._phase + pad) % self._modulus
+        else:
+            # Offset is not known well enough: start a new block aligned at runtime.
+            self._flush()
+            self._block_align = alignment
+            self._phase = 0
+            self._modulus = alignment
+
+    def _fixed(self, type_name: str, count: int, skip: bool = False) -> int:
+        char, size = PRIMITIVE_TYPES[type_name]
+        self._align(size)
+        if skip:
+            self._fmt.append(f"{size * count}x")
+        else:
+            self._fmt.append(f"{count}{char}" if count > 1 else char)
+            self._block_values += count
+        self._phase = (self._phase + size * count) % self._modulus
+        index = self._count
+        if not skip:
+            self._count += count
+        return index
+
+    def _dynamic(self, step: Step, skip: bool = False) -> str:
+        self._flush()
+        self._steps.append(step)
+        self._produces.append(not skip)
+        self._phase = 0
+        self._modulus = 1
+        if skip:
+            return ""
+        self._count += 1
+        return f"v[{self._count - 1}]"
+
+    def _value(self, field_type: str, selection: Selection = None, skip: bool = False) -> str:
+        if field_type in PRIMITIVE_TYPES:
+            return f"v[{self._fixed(field_type, 1, skip)}]"
+        if field_type in STRING_TYPES:
+            wide = field_type == "wstring"
+            if skip:
+                return self._dynamic(_string_skip_step(self._byteorder, wide), skip=True)
+            return self._dynamic(_string_step(self._byteorder, wide, self._lazy_strings))
+        return self._message(field_type, {} if skip else selection)
+
+    def _field(self, field: Field, selection: Selection, skip: bool) -> str:
+        if field.array is None:
+            return self._value(field.type, selection, skip)
+        if field.array == "fixed":
+            if field.type in PRIMITIVE_TYPES:
+                start = self._fixed(field.type, field.length, skip)
+                return f"v[{start}:{start + field.length}]"
+            return "[" + ", ".join(self._value(field.type, selection, skip) for _ in range(field.length)) + "]"
+        if field.type in PRIMITIVE_TYPES:
+            return self._dynamic(_primitive_sequence_step(self._byteorder, field.type, skip), skip)
+        if field.type in STRING_TYPES:
+            wide = field.type == "wstring"
+            string_step = _string_skip_step(self._byteorder, wide) if skip \
+                else _string_step(self._byteorder, wide, self._lazy_strings)
+            element = _Plan((string_step,), _builder("v[0]" if not skip else "None"))
+        else:
+            element = _PlanCompiler(self._definitions, self._byteorder, 1, self._lazy_strings).compile(
+                field.type, {} if skip else selection)
+        return self._dynamic(_element_sequence_step(self._byteorder, element, skip), skip)
+
+    def _message(self, type_name: str, selection: Selection = None) -> str:
+        fields = self._fields(type_name)
+        if selection:
+            unknown = set(selection) - {field.name for field in fields}
+            if unknown:
+                raise SchemaError(f"'{type_name}' has no field(s) {sorted(unknown)}")
+        items = []
+        for field in fields:
+            if selection is None:
+                items.append(f"{field.name!r}: {self._field(field, None, False)}")
+            elif field.name in selection:
+                items.append(f"{field.name!r}: {self._field(field, selection[field.name], False)}")
+            else:
+                self._field(field, None, True)
+        return "{" + ", ".join(items) + "}"
+
+
+class MessageDecoder:
+    """
+    Decoder for one ROS 2 message type, compiled from its definitions.
+    Plans are compiled lazily per byte order and reused for every message.
+
+    With `lazy_strings`, string fields are returned as `CdrString` views of
+    the input buffer instead of decoded `str` objects. With `fields`, only the
+    given dotted field paths (e.g. 'orientation', 'header.frame_id') are
+    decoded and reading stops after the last of them; see `project`.
+    """
+
+    def __init__(
+            self,
+            schema_name: str,
+            definitions: Dict[str, List[Field]],
+            lazy_strings: bool = False,
+            fields: Optional[Tuple[str, ...]] = None,
+        ):
+        self.schema_name = schema_name
+        self.type_name = normalize_type_name(schema_name)
+        self.lazy_strings = lazy_strings
+        self.fields = fields
+        self._definitions = dict(definitions)
+        for name, text in _BUILTIN_DEFINITIONS.items():
+            self._definitions.setdefault(name, _parse_msg_fields(text, name.split("/")[0]))
+        self._selection = _selection_tree(fields) if fields is not None else None
+        self._plans: Dict[str, _Plan] = {}
+        self._projections: Dict[Tuple[str, ...], "MessageDecoder"] = {}
+        self._frame_id_decoder: Optional["MessageDecoder"] = None
+        self._batch_dtypes: Dict[Tuple[str, int, int], Optional[np.dtype]] = {}
+        self._batch_supported: Optional[bool] = None
+        # Compile eagerly for the common little-endian case so schema errors surface early.
+        self._plan("<")
+
+    def _plan(self, byteorder: str) -> _Plan:
+        plan = self._plans.get(byteorder)
+        if plan is None:
+            plan = _PlanCompiler(self._definitions, byteorder, 8, self.lazy_strings).compile(
+                self.type_name, self._selection, truncate=self._selection is not None)
+            self._plans[byteorder] = plan
+        return plan
+
+    def project(self, fields: Iterable[str]) -> "MessageDecoder":
+        """
+        Returns a (cached) decoder for the same type that only decodes `fields`.
+        Paths are always relative to the full message type.
+
+        Args:
+            fields (Iterable[str]): Dotted field paths, e.g. ('orientation',).
+
+        Returns:
+            MessageDecoder: The projected decoder.
+        """
+        key = tuple(sorted(set(fields)))
+        decoder = self._projections.get(key)
+        if decoder is None:
+            decoder = MessageDecoder(self.schema_name, self._definitions, self.lazy_strings, key)
+            self._projections[key] = decoder
+        return decoder
+
+    def has_header(self) -> bool:
+        """
+        Returns whether the message starts with a std_msgs/Header field named 'header'.
+        """
+        fields = self._definitions[self.type_name]
+        return bool(fields) and fields[0].name == "header" and fields[0].type == "std_msgs/Header"
+
+    def read_frame_id(self, data: Union[bytes, memoryview]) -> Any:
+        """
+        Reads only header.frame_id, so frame filters can reject a message before
+        the rest of the payload is touched.
+
+        Returns:
+            The frame_id (a `CdrString` with lazy strings), or None without a header.
+        """
+        if self._frame_id_decoder is None:
+            if not self.has_header():
+                return None
+            self._frame_id_decoder = self.project(("header.frame_id",))
+        return self._frame_id_decoder.decode(data)["header"]["frame_id"]
+
+    def read_stamp(self, data: Union[bytes, memoryview]) -> Optional[int]:
+        """
+        Reads only header.stamp.
+
+        Returns:
+            Optional[int]: The stamp in nanoseconds since epoch, or None without a header.
+        """
+        if not self.has_header() or len(data) < CDR_HEADER_SIZE + 8:
+            return None
+        sec, nanosec = _HEADER_STAMP["<" if data[1] & 0x01 else ">"].unpack_from(data, CDR_HEADER_SIZE)
+        return sec * 1_000_000_000 + nanosec
+
+    def decode(self, data: Union[bytes, memoryview]) -> dict:
+        """
+        Decodes a CDR payload (including its 4-byte encapsulation header).
+        The payload is read through a memoryview, so no part of it is copied.
+
+        Args:
+            data (Union[bytes, memoryview]): The serialized message.
+
+        Returns:
+            dict: The decoded message as nested dicts and lists.
+        """
+        if len(data) < CDR_HEADER_SIZE:
+            raise struct.error("CDR payload is shorter than its encapsulation header.")
+        if not isinstance(data, memoryview):
+            data = memoryview(data)
+        steps, build = self._plan("<" if data[1] & 0x01 else ">")
+        values: list = []
+        pos = 0
+        for step in steps:
+            pos = step(data, pos, values)
+        return build(values)
+
+    # --- Batch decoding of fixed-layout messages ---
+
+    def _batch_fields(self, type_name: str, prefix: str, selection: Selection,
+                      byteorder: str, frame_id_size: int, pos: int, entries: list) -> Optional[int]:
+        for field in self._definitions[type_name]:
+            name = prefix + field.name
+            selected = selection is None or field.name in selection
+            sub_selection = None if selection is None else selection.get(field.name, {})
+            if field.type in STRING_TYPES:
+                # header.frame_id is always returned; it keys the layout anyway.
+                if name != "header.frame_id" or field.array is not None:
+                    return None
+                pos += -pos & 3
+                entries.append((name, f"S{max(frame_id_size - 1, 1)}", pos + 4))
+                pos += 4 + frame_id_size
+            elif field.array == "sequence":
+                return None
+            elif field.type in PRIMITIVE_TYPES:
+                size = PRIMITIVE_TYPES[field.type][1]
+                pos += -pos & (size - 1)
+                count = field.length if field.array == "fixed" else 1
+                if selected:
+                    dtype = byteorder + _NUMPY_TYPES[field.type]
+                    entries.append((name, (dtype, (count,)) if field.array == "fixed" else dtype, pos))
+                pos += size * count
+            else:
+                for index in range(field.length if field.array == "fixed" else 1):
+                    element_prefix = f"{name}.{index}." if field.array == "fixed" else f"{name}."
+                    pos = self._batch_fields(
+                        field.type, element_prefix, sub_selection, byteorder, frame_id_size, pos, entries)
+                    if pos is None:
+                        return None
+        return pos
+
+    def _batch_dtype(self, byteorder: str, frame_id_size: int, itemsize: int) -> Optional[np.dtype]:
+        key = (byteorder, frame_id_size, itemsize)
+        if key not in self._batch_dtypes:
+            entries: list = []
+            end = self._batch_fields(self.type_name, "", self._selection, byteorder, frame_id_size, 0, entries)
+            dtype = None
+            if end is not None and CDR_HEADER_SIZE + end <= itemsize:
+                dtype = np.dtype({
+                    "names": [name for name, _, _ in entries],
+                    "formats": [fmt for _, fmt, _ in entries],
+                    "offsets": [CDR_HEADER_SIZE + offset for _, _, offset in entries],
+                    "itemsize": itemsize,
+                })
+            self._batch_dtypes[key] = dtype
+        return self._batch_dtypes[key]
+
+    def supports_batch(self) -> bool:
+        """
+        Returns whether the layout of this type is fixed once the header.frame_id
+        length is known (e.g. sensor_msgs/Imu, sensor_msgs/NavSatFix).
+        """
+        if self._batch_supported is None:
+            self._batch_supported = self.has_header() and \
+                self._batch_fields(self.type_name, "", self._selection, "<", 1, 0, []) is not None
+        return self._batch_supported
+
+    def decode_batch(self, payloads: Sequence[Union[bytes, memoryview]]) -> Dict[str, np.ndarray]:
+        """
+        Decodes many payloads of a fixed-layout type at once. Payloads are grouped
+        by byte order, frame_id length and size, and each group is viewed with
+        `np.frombuffer` through a cached structured dtype.
+
+        Args:
+            payloads (Sequence[Union[bytes, memoryview]]): Serialized messages.
+
+        Returns:
+            Dict[str, np.ndarray]: One column per selected leaf field, keyed by dotted
+                path (e.g. 'orientation.x'), in the order of `payloads`. Fixed arrays
+                become 2-D columns; 'header.frame_id' is a bytes column.
+        """
+        if not self.supports_batch():
+            raise SchemaError(f"'{self.type_name}' does not have a fixed layout.")
+        # The frame_id length directly follows the 8-byte stamp.
+        groups: Dict[Tuple[str, int, int], List[int]] = {}
+        for index, payload in enumerate(payloads):
+            byteorder = "<" if payload[1] & 0x01 else ">"
+            frame_id_size, = _FRAME_ID_SIZE[byteorder].unpack_from(payload, CDR_HEADER_SIZE + 8)
+            groups.setdefault((byteorder, frame_id_size, len(payload)), []).append(index)
+
+        columns: Dict[str, np.ndarray] = {}
+        for (byteorder, frame_id_size, itemsize), indices in groups.items():
+            dtype = self._batch_dtype(byteorder, frame_id_size, itemsize)
+            if dtype is None:
+                raise struct.error(f"Payload of {itemsize} bytes is too short for '{self.type_name}'.")
+            records = np.frombuffer(b"".join(payloads[i] for i in indices), dtype=dtype)
+            for name in dtype.names:
+                values = records[name]
+                if len(groups) == 1:
+                    columns[name] = values
+                    continue
+                if name not in columns:
+                    columns[name] = np.empty((len(payloads),) + values.shape[1:], dtype=values.dtype.newbyteorder("="))
+                elif columns[name].dtype.itemsize < values.dtype.itemsize:
+                    columns[name] = columns[name].astype(values.dtype)
+                columns[name][indices] = values
+        return columns
+
+    def lazy(self, data: Union[bytes, memoryview]) -> "LazyRecord":
+        """
+        Wraps a payload in a `LazyRecord` that is only decoded when first read.
+        """
+        return LazyRecord(self, data)
+
+
+class LazyRecord(Mapping):
+    """
+    Read-only mapping over an undecoded payload. Creating it costs nothing;
+    the (projected) decoder runs once, on first access, and the result is cached.
+    Records that are dropped before being read are never decoded.
+    """
+    __slots__ = ("_decoder", "_data", "_values")
+
+    def __init__(self, decoder: MessageDecoder, data: Union[bytes, memoryview]):
+        self._decoder = decoder
+        self._data = data
+        self._values: Optional[dict] = None
+
+    def _decoded(self) -> dict:
+        if self._values is None:
+            self._values = self._decoder.decode(self._data)
+            self._data = None
+        return self._values
+
+    def __getitem__(self, name: str) -> Any:
+        return self._decoded()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        return len(self._decoded())
+
+    def to_dict(self) -> dict:
+        """
+        Returns the decoded message as a plain dict.
+        """
+        return self._decoded()
+
+
+@lru_cache(maxsize=64)
+def compile_schema(
+        schema_name: str,
+        schema_encoding: str,
+        schema: str,
+        lazy_strings: bool = False,
+    ) -> MessageDecoder:
+    """
+    Compiles (and caches) a decoder from a Foxglove channel schema.
+
+    Args:
+        schema_name (str): The channel's `schemaName`, e.g. 'sensor_msgs/msg/Imu'.
+        schema_encoding (str): 'ros2msg' or 'ros2idl'.
+        schema (str): The channel's `schema` text.
+        lazy_strings (bool): Return string fields as `CdrString` views.
+
+    Returns:
+        MessageDecoder: The compiled decoder.
+    """
+    if schema_encoding == "ros2msg":
+        definitions = parse_ros2msg(schema_name, schema)
+    elif schema_encoding == "ros2idl":
+        definitions = parse_ros2idl(schema_name, schema)
+    else:
+        raise SchemaError(f"Unsupported schema encoding: '{schema_encoding}'")
+    return MessageDecoder(schema_name, definitions, lazy_strings=lazy_strings)
+
+
+# --- Built-in definitions for the topics the GUI relies on ---
+
+_SEPARATOR = "=" * 80
+
+BUILTIN_SCHEMAS = {
+    "sensor_msgs/msg/Imu": "\n".join([
+        "std_msgs/Header header",
+        "geometry_msgs/Quaternion orientation",
+        "float64[9] orientation_covariance",
+        "geometry_msgs/Vector3 angular_velocity",
+        "float64[9] angular_velocity_covariance",
+        "geometry_msgs/Vector3 linear_acceleration",
+        "float64[9] linear_acceleration_covariance",
+        _SEPARATOR,
+        "MSG: std_msgs/Header",
+        "builtin_interfaces/Time stamp",
+        "string frame_id",
+        _SEPARATOR,
+        "MSG: geometry_msgs/Quaternion",
+        "float64 x",
+        "float64 y",
+        "float64 z",
+        "float64 w",
+        _SEPARATOR,
+        "MSG: geometry_msgs/Vector3",
+        "float64 x",
+        "float64 y",
+        "float64 z",
+    ]),
+    "sensor_msgs/msg/NavSatFix": "\n".join([
+        "std_msgs/Header header",
+        "NavSatStatus status",
+        "float64 latitude",
+        "float64 longitude",
+        "float64 altitude",
+        "float64[9] position_covariance",
+        "uint8 position_covariance_type",
+        _SEPARATOR,
+        "MSG: std_msgs/Header",
+        "builtin_interfaces/Time stamp",
+        "string frame_id",
+        _SEPARATOR,
+        "MSG: sensor_msgs/NavSatStatus",
+        "int8 status",
+        "uint16 service",
+    ]),
+    "diagnostic_msgs/msg/DiagnosticArray": "\n".join([
+        "std_msgs/Header header",
+        "DiagnosticStatus[] status",
+        _SEPARATOR,
+        "MSG: std_msgs/Header",
+        "builtin_interfaces/Time stamp",
+        "string frame_id",
+        _SEPARATOR,
+        "MSG: diagnostic_msgs/DiagnosticStatus",
+        "byte level",
+        "string name",
+        "string message",
+        "string hardware_id",
+        "KeyValue[] values",
+        _SEPARATOR,
+        "MSG: diagnostic_msgs/KeyValue",
+        "string key",
+        "string value",
+    ]),
+}
+
+
+def get_builtin_decoder(schema_name: str, lazy_strings: bool = False) -> Optional[MessageDecoder]:
+    """
+    Returns a decoder compiled from the built-in definition of `schema_name`,
+    or None if the type is unknown. Used when a channel carries no schema.
+    """
+    schema = BUILTIN_SCHEMAS.get(schema_name)
+    if schema is None:
         return None
+    return compile_schema(schema_name, "ros2msg", schema, lazy_strings)
 
-    # 2) orientation (4 x float64)
-    orientation = struct.unpack_from('<dddd', data, offset)
-    offset += 32  # 4 * 8 bytes = 32
-
-    # 3) orientation_covariance (9 x float64)
-    orientation_covariance = struct.unpack_from('<' + 'd'*9, data, offset)
-    offset += 72  # 9 * 8 bytes = 72
-
-    # 4) angular_velocity (3 x float64)
-    angular_velocity = struct.unpack_from('<ddd', data, offset)
-    offset += 24  # 3 * 8 bytes = 24
-
-    # 5) angular_velocity_covariance (9 x float64)
-    angular_velocity_covariance = struct.unpack_from('<' + 'd'*9, data, offset)
-    offset += 72
-
-    # 6) linear_acceleration (3 x float64)
-    linear_acceleration = struct.unpack_from('<ddd', data, offset)
-    offset += 24
-
-    # 7) linear_acceleration_covariance (9 x float64)
-    linear_acceleration_covariance = struct.unpack_from('<' + 'd'*9, data, offset)
-    offset += 72
-
-    # Build a dictionary to represent the decoded IMU message
-    imu_msg = {
-        'header': {
-            'stamp': {
-                'sec': sec,
-                'nanosec': nanosec
-            },
-            'frame_id': frame_id
-        },
-        'orientation': {
-            'x': orientation[0],
-            'y': orientation[1],
-            'z': orientation[2],
-            'w': orientation[3]
-        },
-        'orientation_covariance': list(orientation_covariance),
-        'angular_velocity': {
-            'x': angular_velocity[0],
-            'y': angular_velocity[1],
-            'z': angular_velocity[2]
-        },
-        'angular_velocity_covariance': list(angular_velocity_covariance),
-        'linear_acceleration': {
-            'x': linear_acceleration[0],
-            'y': linear_acceleration[1],
-            'z': linear_acceleration[2]
-        },
-        'linear_acceleration_covariance': list(linear_acceleration_covariance)
-    }
 
+def decode_imu(data: bytes):
+    imu_msg = get_builtin_decoder("sensor_msgs/msg/Imu").decode(data)
+    if imu_msg["header"]["frame_id"] != "gps_left_link":
+        return None
     return imu_msg
 
 
 def decode_navsatfix(data: bytes):
-    offset = 0
-
-    # 1) Skip 4-byte CDR encapsulation header (usually 00 01 00 00 for little-endian)
-    # If your data does not have this header, remove these lines.
-    offset += 4
-
-    # 2) Decode Header
-    # Header.stamp
-    sec, = struct.unpack_from('<i', data, offset)
-    offset += 4
-    nanosec, = struct.unpack_from('<I', data, offset)
-    offset += 4
-
-    # Header.frame_id (string)
-    frame_id_len, = struct.unpack_from('<I', data, offset)
-    offset += 4
-    frame_id = data[offset:offset+frame_id_len-1].decode('utf-8')
-    offset += frame_id_len
-    # Align to 4-byte boundary after string
-    pad = (4 - (frame_id_len % 4)) % 4
-    offset += pad
-    
-    if frame_id != 'gps_left_link' and frame_id != 'base_footprint':
-        # Skip the rest of the message if frame_id is not 'left_gps_link' or 'base_footprint'
-        print(f"frame_id: {frame_id} is not supported")
+    navsatfix_msg = get_builtin_decoder("sensor_msgs/msg/NavSatFix").decode(data)
+    if navsatfix_msg["header"]["frame_id"] not in ("gps_left_link", "base_footprint"):
         return None
-
-    # print(f"frame_id: {frame_id}")
-    
-    # 3) NavSatStatus
-    # status (int8)
-    status_val, = struct.unpack_from('<b', data, offset)
-    offset += 1
-    # Align for next field if needed
-    # Next field is uint16. It's 2-byte aligned. If offset is not even, pad by 1 byte.
-    if offset % 2 != 0:
-        offset += 1
-    # service (uint16)
-    service_val, = struct.unpack_from('<H', data, offset)
-    offset += 2
-
-    # 4) NavSatFix fields
-    # latitude, longitude, altitude (each float64)
-    latitude, longitude, altitude = struct.unpack_from('<ddd', data, offset)
-    offset += 24  # 3 * 8 bytes
-
-    # position_covariance (9 x float64)
-    position_covariance = struct.unpack_from('<' + 'd'*9, data, offset)
-    offset += 72  # 9 * 8 bytes
-
-    # position_covariance_type (uint8)
-    position_covariance_type, = struct.unpack_from('<B', data, offset)
-    offset += 1
-    # Since this is the last field, no need for special padding afterward
-
-    # Construct a dictionary with the decoded data
-    navsatfix_msg = {
-        'header': {
-            'stamp': {
-                'sec': sec,
-                'nanosec': nanosec
-            },
-            'frame_id': frame_id
-        },
-        'status': {
-            'status': status_val,
-            'service': service_val
-        },
-        'latitude': latitude,
-        'longitude': longitude,
-        'altitude': altitude,
-        'position_covariance': list(position_covariance),
-        'position_covariance_type': position_covariance_type
-    }
-
     return navsatfix_msg
 
-def decode_sensorstatus(data: bytes):
-    offset = 0
-
-    # Skip 4-byte CDR encapsulation header
-    offset += 4
-
-    # Decode Header (std_msgs/Header)
-    sec, = struct.unpack_from('<i', data, offset)
-    offset += 4
-    nanosec, = struct.unpack_from('<I', data, offset)
-    offset += 4
-
-    # frame_id (string)
-    frame_id_len, = struct.unpack_from('<I', data, offset)
-    offset += 4
-    frame_id = data[offset:offset + frame_id_len - 1].decode('utf-8')
-    offset += frame_id_len
-    pad = (4 - (frame_id_len % 4)) % 4
-    offset += pad
-
-    # status array length
-    status_len, = struct.unpack_from('<I', data, offset)
-    offset += 4
-
-    name_message_dict = {}
-
-    for _ in range(status_len):
-        # level (byte)
-        level, = struct.unpack_from('<b', data, offset)
-        offset += 1
-        # Align to 4-byte boundary
-        pad = (4 - (offset % 4)) % 4
-        offset += pad
-
-        # name (string)
-        name_len, = struct.unpack_from('<I', data, offset)
-        offset += 4
-        name_str = data[offset:offset + name_len - 1].decode('utf-8')
-        offset += name_len
-        pad = (4 - (name_len % 4)) % 4
-        offset += pad
-
-        # message (string)
-        message_len, = struct.unpack_from('<I', data, offset)
-        offset += 4
-        message_str = data[offset:offset + message_len - 1].decode('utf-8')
-        offset += message_len
-        pad = (4 - (message_len % 4)) % 4
-        offset += pad
-
-        # hardware_id (string)
-        hardware_id_len, = struct.unpack_from('<I', data, offset)
-        offset += 4
-        hardware_id_str = data[offset:offset + hardware_id_len - 1].decode('utf-8')
-        offset += hardware_id_len
-        pad = (4 - (hardware_id_len % 4)) % 4
-        offset += pad
-
-        # values (KeyValue[])
-        values_len, = struct.unpack_from('<I', data, offset)
-        offset += 4
-
-        # Skip parsing values since we only need name:message.
-        for __ in range(values_len):
-            # key (string)
-            pad = (4 - (offset % 4)) % 4
-            offset += pad
-            key_len, = struct.unpack_from('<I', data, offset)
-            offset += 4
-            offset += key_len
-            pad = (4 - (key_len % 4)) % 4
-            offset += pad
-
-            # value (string)
-            pad = (4 - (offset % 4)) % 4
-            offset += pad
-            val_len, = struct.unpack_from('<I', data, offset)
-            offset += 4
-            offset += val_len
-            pad = (4 - (val_len % 4)) % 4
-            offset += pad
-
-        # Add the name:message pair to our dictionary
-        name_message_dict[name_str] = message_str
-
-    return name_message_dict
 
+def decode_sensorstatus(data: bytes):
+    diagnostic_array = get_builtin_decoder("diagnostic_msgs/msg/DiagnosticArray").decode(data)
+    return {status["name"]: status["message"] for status in diagnostic_array["status"]}
@@ -0,0 +1,153 @@
+# container_stats.py
+"""
+Rolling resource usage of a container from the samples of the Docker stats stream.
+
+The stream delivers one cumulative sample per second. CPU usage and the network
+and block I/O rates are computed between the oldest and newest sample of a time
+window, so short spikes are averaged out; the highest single-interval CPU usage
+of the window is kept as well, so a container pegging the CPU stays visible.
+"""
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Optional
+
+
+class StatsSample(NamedTuple):
+    time_s: float  # local monotonic time the sample was received
+    cpu_total: int  # container CPU time, ns
+    cpu_system: int  # host CPU time, ns
+    online_cpus: int
+    memory_bytes: int  # usage without the reclaimable page cache
+    memory_limit_bytes: int
+    net_rx_bytes: Optional[int]  # None without a container network (network_mode host)
+    net_tx_bytes: Optional[int]
+    block_read_bytes: Optional[int]
+    block_write_bytes: Optional[int]
+
+
+def parse_stats(raw: Dict[str, Any], time_s: float) -> StatsSample:
+    """
+    Extracts the cumulative counters of a decoded Docker stats stream entry.
+    Handles the cgroup v1 and v2 layouts of the memory statistics.
+
+    Args:
+        raw (Dict[str, Any]): The decoded JSON object of the stats stream.
+        time_s (float): Monotonic time the entry was received.
+
+    Returns:
+        StatsSample: The counters of the entry.
+    """
+    cpu_stats = raw.get("cpu_stats") or {}
+    cpu_usage = cpu_stats.get("cpu_usage") or {}
+    online_cpus = cpu_stats.get("online_cpus") or len(cpu_usage.get("percpu_usage") or ()) or 1
+
+    memory_stats = raw.get("memory_stats") or {}
+    memory_details = memory_stats.get("stats") or {}
+    cache = memory_details.get("inactive_file",  # cgroup v2
+            memory_details.get("total_inactive_file", memory_details.get("cache", 0)))  # cgroup v1
+    memory_bytes = max(0, memory_stats.get("usage", 0) - cache)
+
+    networks = raw.get("networks")
+    net_rx = net_tx = None
+    if networks:
+        net_rx = sum(interface.get("rx_bytes", 0) for interface in networks.values())
+        net_tx = sum(interface.get("tx_bytes", 0) for interface in networks.values())
+
+    block_read = block_write = None
+    io_entries = (raw.get("blkio_stats") or {}).get("io_service_bytes_recursive")
+    if io_entries is not None:
+        block_read = sum(entry.get("value", 0) for entry in io_entries if entry.get("op", "").lower() == "read")
+        block_write = sum(entry.get("value", 0) for entry in io_entries if entry.get("op", "").lower() == "write")
+
+    return StatsSample(
+        time_s,
+        cpu_usage.get("total_usage", 0),
+        cpu_stats.get("system_cpu_usage", 0),
+        online_cpus,
+        memory_bytes,
+        memory_stats.get("limit", 0),
+        net_rx,
+        net_tx,
+        block_read,
+        block_write,
+    )
+
+
+class ContainerStatsWindow:
+    """
+    Keeps the stats samples of one container received within the last `window_s`
+    seconds and summarizes them.
+    """
+
+    def __init__(self, window_s: float = 10.0):
+        """
+        Initializes the ContainerStatsWindow.
+
+        Args:
+            window_s (float): Length of the rolling window in seconds.
+        """
+        self.window_s = window_s
+        self._samples: Deque[StatsSample] = deque()
+
+    def add(self, sample: StatsSample) -> None:
+        """
+        Adds a sample and drops the samples that fell out of the window. The
+        newest sample older than the window is kept as the window's baseline.
+        """
+        self._samples.append(sample)
+        while len(self._samples) > 2 and sample.time_s - self._samples[1].time_s >= self.window_s:
+            self._samples.popleft()
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """
+        Returns the usage over the window. CPU percentages are of one CPU, like
+        `docker stats` (a container using two CPUs fully reports 200 %). Rates are
+        None until two samples arrived or if the counters are unavailable.
+
+        Returns:
+            Dict[str, Optional[float]]: 'cpu_percent', 'cpu_percent_max',
+                'memory_bytes', 'memory_limit_bytes', 'memory_percent',
+                'net_rx_bps', 'net_tx_bps', 'block_read_bps' and 'block_write_bps'.
+        """
+        if not self._samples:
+            return {}
+        first, last = self._samples[0], self._samples[-1]
+        summary: Dict[str, Optional[float]] = {
+            'cpu_percent': self._cpu_percent(first, last),
+            'cpu_percent_max': None,
+            'memory_bytes': float(last.memory_bytes),
+            'memory_limit_bytes': float(last.memory_limit_bytes),
+            'memory_percent': 100.0 * last.memory_bytes / last.memory_limit_bytes if last.memory_limit_bytes else None,
+        }
+        intervals = [
+            self._cpu_percent(older, newer)
+            for older, newer in zip(self._samples, list(self._samples)[1:])
+        ]
+        intervals = [value for value in intervals if value is not None]
+        if intervals:
+            summary['cpu_percent_max'] = max(intervals)
+        for key, field in (
+                ('net_rx_bps', 'net_rx_bytes'),
+                ('net_tx_bps', 'net_tx_bytes'),
+                ('block_read_bps', 'block_read_bytes'),
+                ('block_write_bps', 'block_write_bytes')):
+            summary[key] = self._rate(first, last, field)
+        return summary
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+    @staticmethod
+    def _cpu_percent(older: StatsSample, newer: StatsSample) -> Optional[float]:
+        system_delta = newer.cpu_system - older.cpu_system
+        cpu_delta = newer.cpu_total - older.cpu_total
+        if system_delta <= 0 or cpu_delta < 0:
+            return None
+        return 100.0 * cpu_delta / system_delta * newer.online_cpus
+
+    @staticmethod
+    def _rate(older: StatsSample, newer: StatsSample, field: str) -> Optional[float]:
+        elapsed = newer.time_s - older.time_s
+        start, end = getattr(older, field), getattr(newer, field)
+        if elapsed <= 0 or start is None or end is None:
+            return None
+        return max(0.0, (end - start) / elapsed)
@@ -0,0 +1,198 @@
+# decode_pool.py
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from app.utils.logger import logger
+
+
+class DropOldestQueue:
+    """
+    Bounded, thread-safe FIFO. When full, `put` discards the oldest item instead of
+    blocking, so the producer never waits on the consumer.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initializes the DropOldestQueue.
+
+        Args:
+            maxsize (int): Maximum number of queued items.
+        """
+        self._items: deque = deque()
+        self._maxsize = max(1, maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.drop_count = 0
+
+    def put(self, item: Any) -> None:
+        """
+        Appends `item`, dropping the oldest item if the queue is full.
+        """
+        with self._cond:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.drop_count += 1
+            self._items.append(item)
+            self.put_count += 1
+            self._cond.notify()
+
+    def get_all(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Waits until at least one item is queued or the queue is closed, then removes
+        and returns every queued item, oldest first.
+
+        Args:
+            timeout (Optional[float]): Maximum wait in seconds; None waits indefinitely.
+
+        Returns:
+            List[Any]: The queued items; empty on timeout or when closed.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+    def close(self) -> None:
+        """
+        Discards the queued items, counting them as dropped, and wakes up waiting
+        consumers; `closed` becomes True.
+        """
+        with self._cond:
+            self.drop_count += len(self._items)
+            self._items.clear()
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DecodeWorkerPool:
+    """
+    Worker threads that process submitted items in batches.
+    Items are sharded by key, so items with the same key are handled by the same
+    worker in submission order. Each worker has its own DropOldestQueue.
+    """
+
+    # Minimum interval between two warnings about dropped items.
+    DROP_WARNING_INTERVAL_S = 5.0
+
+    def __init__(
+            self,
+            handler: Callable[[List[Any]], None],
+            num_workers: int = 1,
+            queue_size: int = 1024,
+            name: str = "decode",
+        ):
+        """
+        Initializes the DecodeWorkerPool.
+
+        Args:
+            handler (Callable[[List[Any]], None]): Called on a worker thread with the
+                items drained from its queue, oldest first.
+            num_workers (int): Number of worker threads.
+            queue_size (int): Capacity of each worker's queue.
+            name (str): Prefix of the worker thread names.
+        """
+        self._handler = handler
+        self._num_workers = max(1, num_workers)
+        self._queue_size = queue_size
+        self._name = name
+        self._queues: List[DropOldestQueue] = []
+        self._threads: List[threading.Thread] = []
+        self._handled_counts: List[int] = []
+
+    def start(self) -> None:
+        """
+        Starts the worker threads with empty queues.
+        """
+        if self._threads:
+            logger.warning(f"{self._name} workers are already running.")
+            return
+        self._queues = [DropOldestQueue(self._queue_size) for _ in range(self._num_workers)]
+        self._handled_counts = [0] * self._num_workers
+        for index, queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._work, args=(index, queue), name=f"{self._name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stops the worker threads. Items still queued are discarded.
+
+        Args:
+            timeout (float): Maximum wait in seconds for each worker to finish.
+        """
+        for queue in self._queues:
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, key: Hashable, item: Any) -> None:
+        """
+        Queues `item` on the worker owning `key`. Never blocks. Safe to call from any thread.
+        """
+        queues = self._queues
+        if queues:
+            queues[hash(key) % len(queues)].put(item)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the queue counters summed over all workers.
+
+        Returns:
+            Dict[str, int]: 'submitted', 'dropped', 'handled' and currently 'queued' items.
+        """
+        return {
+            'submitted': sum(queue.put_count for queue in self._queues),
+            'dropped': sum(queue.drop_count for queue in self._queues),
+            'handled': sum(self._handled_counts),
+            'queued': sum(len(queue) for queue in self._queues),
+        }
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue_size
+
+    def backlog(self) -> int:
+        """
+        Returns the number of items waiting in the fullest worker queue.
+        """
+        return max((len(queue) for queue in self._queues), default=0)
+
+    def is_idle(self) -> bool:
+        """
+        Returns whether every submitted item has been handled or dropped.
+        """
+        stats = self.stats()
+        return stats['handled'] + stats['dropped'] >= stats['submitted']
+
+    def _work(self, index: int, queue: DropOldestQueue) -> None:
+        reported_drops = 0
+        last_warning = 0.0
+        while not queue.closed:
+            items = queue.get_all()
+            if not items:
+                continue
+            try:
+                self._handler(items)
+            except Exception as e:
+                logger.error(f"Error in {self._name} worker: {e}")
+            self._handled_counts[index] += len(items)
+
+            if not queue.closed and queue.drop_count > reported_drops and \
+                    time.monotonic() - last_warning >= self.DROP_WARNING_INTERVAL_S:
+                logger.warning(
+                    f"{self._name} queue full, dropped {queue.drop_count - reported_drops} oldest items.")
+                reported_drops = queue.drop_count
+                last_warning = time.monotonic()
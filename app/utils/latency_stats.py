@@ -0,0 +1,175 @@
+# latency_stats.py
+"""
+Per-topic latency histograms for the Foxglove data path.
+
+A sample is timestamped at each stage it passes:
+
+    header.stamp  -> robot-side sensor stamp of the message (if it has a header)
+    frame         -> timestamp of the Foxglove binary frame (robot publish time)
+    receive       -> frame read from the socket
+    decode        -> payload decoded on a worker thread
+    view          -> signal emitted to the views on the render tick
+
+The 'sensor' stage (header.stamp to frame) is measured on the robot clock alone;
+'network' and 'end_to_end' compare the frame timestamp with the local wall clock
+and so include the clock offset between the robot and this machine.
+"""
+import bisect
+import math
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+
+class LatencySample(NamedTuple):
+    topic: str
+    stamp_ns: Optional[int]  # header.stamp, None for messages without a header
+    frame_ns: Optional[int]  # Foxglove frame timestamp, None if the server sent 0
+    receive_ns: int
+    decoded_ns: int
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory histogram with logarithmic buckets (4 per octave) from 10 us to
+    about 10 min. Percentiles are reported as the upper bound of their bucket,
+    i.e. with at most ~19 % relative error.
+    """
+
+    NUM_BUCKETS = 96
+    BOUNDS_MS: List[float] = [0.01 * 2 ** (index / 4) for index in range(NUM_BUCKETS)]
+
+    def __init__(self):
+        self._counts = [0] * (self.NUM_BUCKETS + 1)  # Last bucket: above the largest bound.
+        self.count = 0
+        self.negative_count = 0  # Samples where the later stage was stamped earlier.
+        self.max_ms = 0.0
+        self._sum_ms = 0.0
+
+    def record(self, value_ms: float) -> None:
+        """
+        Adds a sample. Negative values (clock offset) are counted and recorded as 0.
+        """
+        if value_ms < 0:
+            self.negative_count += 1
+            value_ms = 0.0
+        self._counts[bisect.bisect_left(self.BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self._sum_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the upper bucket bound below which `fraction` of the samples fall.
+
+        Args:
+            fraction (float): Between 0 and 1, e.g. 0.99 for p99.
+
+        Returns:
+            float: The percentile in milliseconds, 0.0 without samples.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self.BOUNDS_MS[index], self.max_ms) if index < self.NUM_BUCKETS else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns count, mean, p50, p90, p99 and max (milliseconds).
+        """
+        return {
+            'count': self.count,
+            'mean': self._sum_ms / self.count if self.count else 0.0,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p99': self.percentile(0.99),
+            'max': self.max_ms,
+            'negative': self.negative_count,
+        }
+
+
+class LatencyMonitor:
+    """
+    Collects latency histograms per topic and stage. Decode workers record the
+    receive-side stages, the GUI thread records the view-side stages.
+    """
+
+    # sensor: header.stamp -> frame, network: frame -> receive, decode: receive -> decoded
+    # (including the wait in the decode queue), view: decoded -> views updated,
+    # end_to_end: frame (or header.stamp without a frame timestamp) -> views updated.
+    STAGES = ('sensor', 'network', 'decode', 'view', 'end_to_end')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def _histogram(self, topic: str, stage: str) -> LatencyHistogram:
+        stages = self._histograms.setdefault(topic, {})
+        histogram = stages.get(stage)
+        if histogram is None:
+            histogram = stages[stage] = LatencyHistogram()
+        return histogram
+
+    def record_decoded(self, sample: LatencySample) -> None:
+        """
+        Records the stages up to the end of decoding. Called on a decode worker.
+        """
+        with self._lock:
+            if sample.frame_ns:
+                if sample.stamp_ns:
+                    self._histogram(sample.topic, 'sensor').record((sample.frame_ns - sample.stamp_ns) / 1e6)
+                self._histogram(sample.topic, 'network').record((sample.receive_ns - sample.frame_ns) / 1e6)
+            self._histogram(sample.topic, 'decode').record((sample.decoded_ns - sample.receive_ns) / 1e6)
+
+    def record_view(self, sample: LatencySample, view_ns: int) -> None:
+        """
+        Records the stages ending when the views were updated with the sample.
+        """
+        with self._lock:
+            self._histogram(sample.topic, 'view').record((view_ns - sample.decoded_ns) / 1e6)
+            origin_ns = sample.frame_ns or sample.stamp_ns
+            if origin_ns:
+                self._histogram(sample.topic, 'end_to_end').record((view_ns - origin_ns) / 1e6)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the summary of every histogram.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: topic -> stage -> summary, stages
+                ordered as in STAGES.
+        """
+        with self._lock:
+            return {
+                topic: {
+                    stage: stages[stage].summary() for stage in self.STAGES if stage in stages
+                }
+                for topic, stages in sorted(self._histograms.items())
+            }
+
+    def reset(self) -> None:
+        """
+        Drops all samples.
+        """
+        with self._lock:
+            self._histograms.clear()
+
+    @staticmethod
+    def format_summary(snapshot: Dict[str, Dict[str, Dict[str, float]]]) -> str:
+        """
+        Formats a snapshot as one line per topic, e.g.
+        `/gps/heading: network p50=1.2 p99=3.4 | decode p50=0.1 p99=0.4 ms`.
+        """
+        lines = []
+        for topic, stages in snapshot.items():
+            parts = [
+                f"{stage} p50={summary['p50']:.1f} p99={summary['p99']:.1f}"
+                for stage, summary in stages.items()
+            ]
+            lines.append(f"{topic}: {' | '.join(parts)} ms")
+        return '\n'.join(lines)
@@ -0,0 +1,161 @@
+# log_buffer.py
+"""
+Bounded buffer of container log lines, filled by a log stream reader thread and
+read in increments by the views.
+
+Lines get increasing sequence numbers, so a reader asks for everything after
+the last line it has seen; lines that fell out of the buffer in the meantime
+are reported as skipped instead of blocking the writer.
+"""
+import codecs
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, NamedTuple, Optional, Tuple
+
+
+class LogLine(NamedTuple):
+    seq: int
+    time_s: float  # local wall clock time the line was read
+    level: str  # one of LogRingBuffer.LEVELS
+    text: str
+
+
+class LogRingBuffer:
+    """
+    Thread-safe ring buffer of the newest `max_lines` log lines of a container.
+    The log level of each line is parsed from the ROS 2 console format
+    ("[INFO] [1700000000.123] [node]: message").
+    """
+
+    LEVELS = ("DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+
+    _LEVEL_PATTERN = re.compile(r"\[(DEBUG|INFO|WARN|WARNING|ERROR|FATAL)\]")
+    # Color and cursor sequences of tty output.
+    _ANSI_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+    def __init__(self, max_lines: int = 5000, timestamps: bool = False):
+        """
+        Initializes the LogRingBuffer.
+
+        Args:
+            max_lines (int): Number of lines kept; older lines are dropped.
+            timestamps (bool): Lines start with the timestamp Docker adds with
+                `timestamps=True`. It is stripped, and lines not newer than the
+                last appended one are dropped, so a reattached stream may overlap
+                the lines already read.
+        """
+        self._lines: Deque[LogLine] = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._next_seq = 1
+        self._partial = ""  # Text after the last newline of the previous chunk.
+        # Keeps the bytes of a character split across chunks until the next one.
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._timestamps = timestamps
+        self._last_timestamp_ns: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Appends the complete lines of a chunk of the log stream. Chunks need not
+        end at a line break; the rest is kept until the next chunk completes it.
+        """
+        text = self._partial + self._decoder.decode(chunk)
+        *lines, self._partial = text.split("\n")
+        if lines:
+            self.append_lines(lines)
+
+    def flush(self) -> None:
+        """
+        Appends the incomplete last line, e.g. when the stream ended.
+        """
+        self._partial += self._decoder.decode(b"", final=True)
+        if self._partial:
+            partial, self._partial = self._partial, ""
+            self.append_lines([partial])
+
+    def append_lines(self, lines: List[str]) -> None:
+        """
+        Appends lines, parsing their level. Lines without a level inherit "INFO".
+        """
+        now = time.time()
+        parsed = []
+        for line in lines:
+            if self._timestamps:
+                stamp, _, text = line.partition(" ")
+                timestamp_ns = _timestamp_ns(stamp)
+                if timestamp_ns is not None:
+                    if self._last_timestamp_ns is not None and timestamp_ns <= self._last_timestamp_ns:
+                        continue
+                    self._last_timestamp_ns = timestamp_ns
+                    line = text
+            line = self._ANSI_PATTERN.sub("", line).rstrip("\r")
+            if not line:
+                continue
+            match = self._LEVEL_PATTERN.search(line)
+            level = match.group(1) if match else "INFO"
+            parsed.append((now, "WARN" if level == "WARNING" else level, line))
+        with self._lock:
+            for time_s, level, line in parsed:
+                self._lines.append(LogLine(self._next_seq, time_s, level, line))
+                self._next_seq += 1
+
+    def since(self, seq: int, max_lines: Optional[int] = None) -> Tuple[List[LogLine], int]:
+        """
+        Returns the lines after sequence number `seq`, oldest first.
+
+        Args:
+            seq (int): Sequence number of the last line already read, 0 for all.
+            max_lines (Optional[int]): Return only the newest lines of the increment.
+
+        Returns:
+            Tuple[List[LogLine], int]: The lines and the number of lines after
+                `seq` that are no longer (or not) returned.
+        """
+        with self._lock:
+            if not self._lines or self._lines[-1].seq <= seq:
+                return [], 0
+            first_seq = self._lines[0].seq
+            start = max(0, seq + 1 - first_seq)
+            lines = list(self._lines)[start:] if start else list(self._lines)
+        skipped = max(0, first_seq - seq - 1)
+        if max_lines is not None and len(lines) > max_lines:
+            skipped += len(lines) - max_lines
+            lines = lines[-max_lines:]
+        return lines, skipped
+
+    def last_seq(self) -> int:
+        """
+        Returns the sequence number of the newest line, 0 if there is none yet.
+        """
+        with self._lock:
+            return self._next_seq - 1
+
+    def last_timestamp_ns(self) -> Optional[int]:
+        """
+        Returns the Docker timestamp (ns since the epoch) of the newest appended
+        line, None without timestamps or lines.
+        """
+        return self._last_timestamp_ns
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lines.clear()
+        self._partial = ""
+        self._decoder.reset()
+        self._last_timestamp_ns = None
+
+
+def _timestamp_ns(stamp: str) -> Optional[int]:
+    """
+    Returns the ns since the epoch of an RFC 3339 timestamp with up to nanosecond
+    digits ("2024-01-01T12:00:00.123456789Z"), None if it is not one.
+    """
+    seconds, _, rest = stamp.partition(".")
+    digits = len(rest) - len(rest.lstrip("0123456789"))
+    try:
+        whole = datetime.strptime(seconds + rest[digits:], "%Y-%m-%dT%H:%M:%S%z")
+    except ValueError:
+        return None
+    return int(whole.timestamp()) * 1_000_000_000 + int(rest[:digits].ljust(9, "0")[:9] or 0)
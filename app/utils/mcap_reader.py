@@ -0,0 +1,282 @@
+# mcap_reader.py
+"""
+Memory-mapped reader for MCAP files written by McapWriter (https://mcap.dev/spec).
+
+Message payloads are returned as memoryviews into the mapping, so replaying a
+recording does not copy them. Files with a summary section are navigated through
+their ChunkIndex records; files cut short (e.g. the app was killed while
+recording) are scanned record by record up to the last complete record.
+"""
+import bisect
+import mmap
+import struct
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.utils.mcap_writer import (
+    MCAP_MAGIC,
+    OP_CHANNEL,
+    OP_CHUNK,
+    OP_CHUNK_INDEX,
+    OP_FOOTER,
+    OP_MESSAGE,
+    OP_SCHEMA,
+)
+
+
+_RECORD_PREFIX = struct.Struct('<BQ')
+_MESSAGE_PREFIX = struct.Struct('<HIQQ')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+
+
+class McapFormatError(ValueError):
+    """Raised for files that are not readable MCAP files."""
+
+
+class McapSchema(NamedTuple):
+    id: int
+    name: str
+    encoding: str
+    data: bytes
+
+
+class McapChannel(NamedTuple):
+    id: int
+    schema_id: int
+    topic: str
+    message_encoding: str
+    metadata: Dict[str, str]
+
+
+class McapMessage(NamedTuple):
+    channel_id: int
+    sequence: int
+    log_time: int
+    publish_time: int
+    data: memoryview
+
+
+class _ChunkRef(NamedTuple):
+    start_time: int
+    end_time: int
+    offset: int  # File offset of the Chunk record.
+
+
+def _read_string(buffer, offset: int) -> Tuple[str, int]:
+    length = _U32.unpack_from(buffer, offset)[0]
+    offset += 4
+    return bytes(buffer[offset:offset + length]).decode('utf-8'), offset + length
+
+
+def _read_string_map(buffer, offset: int) -> Tuple[Dict[str, str], int]:
+    end = offset + 4 + _U32.unpack_from(buffer, offset)[0]
+    offset += 4
+    values = {}
+    while offset < end:
+        key, offset = _read_string(buffer, offset)
+        values[key], offset = _read_string(buffer, offset)
+    return values, end
+
+
+class McapReader:
+    """
+    Reads schemas, channels and time-ordered messages of an uncompressed MCAP file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens and maps `path`.
+
+        Args:
+            path (str): The MCAP file.
+
+        Raises:
+            McapFormatError: If the file is not an MCAP file.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file.
+            self._file.close()
+            raise McapFormatError(f"{path} is empty.")
+        self._view = memoryview(self._mmap)
+        if self._view[:len(MCAP_MAGIC)] != MCAP_MAGIC:
+            self.close()
+            raise McapFormatError(f"{path} is not an MCAP file.")
+
+        self.schemas: Dict[int, McapSchema] = {}
+        self.channels: Dict[int, McapChannel] = {}
+        self._chunks: List[_ChunkRef] = []
+        self._loose_messages: List[McapMessage] = []  # Messages outside chunks.
+        if not self._read_summary():
+            self._scan()
+        self._chunks.sort()
+        self._chunk_ends = [chunk.end_time for chunk in self._chunks]
+        self._ends_sorted = self._chunk_ends == sorted(self._chunk_ends)
+
+    def close(self) -> None:
+        """
+        Releases the mapping. Messages returned earlier must not be used afterwards.
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Payloads are still referenced; the mapping goes away with them.
+            self._file.close()
+
+    def __enter__(self) -> 'McapReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _records(self, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields (opcode, content start, content end) of the complete records in [start, end).
+        """
+        view = self._view
+        offset = start
+        while offset + _RECORD_PREFIX.size <= end:
+            opcode, length = _RECORD_PREFIX.unpack_from(view, offset)
+            content = offset + _RECORD_PREFIX.size
+            if content + length > end:
+                return
+            yield opcode, content, content + length
+            offset = content + length
+
+    def _read_summary(self) -> bool:
+        """
+        Reads schemas, channels and chunk indexes from the summary section.
+
+        Returns:
+            bool: False if the file has no usable footer or summary.
+        """
+        view = self._view
+        footer_start = len(view) - len(MCAP_MAGIC) - _RECORD_PREFIX.size - 20
+        if footer_start < len(MCAP_MAGIC) or view[len(view) - len(MCAP_MAGIC):] != MCAP_MAGIC:
+            return False
+        opcode, _ = _RECORD_PREFIX.unpack_from(view, footer_start)
+        if opcode != OP_FOOTER:
+            return False
+        summary_start = _U64.unpack_from(view, footer_start + _RECORD_PREFIX.size)[0]
+        if summary_start == 0:
+            return False
+        for opcode, start, end in self._records(summary_start, footer_start):
+            self._read_definition(opcode, start)
+            if opcode == OP_CHUNK_INDEX:
+                start_time, end_time, chunk_offset = struct.unpack_from('<QQQ', view, start)
+                self._chunks.append(_ChunkRef(start_time, end_time, chunk_offset))
+        return True
+
+    def _scan(self) -> None:
+        """
+        Collects definitions and chunks by walking the data section.
+        """
+        for opcode, start, end in self._records(len(MCAP_MAGIC), len(self._view)):
+            if opcode == OP_CHUNK:
+                start_time, end_time = struct.unpack_from('<QQ', self._view, start)
+                self._chunks.append(_ChunkRef(start_time, end_time, start - _RECORD_PREFIX.size))
+                for inner_opcode, inner_start, _ in self._chunk_records(start - _RECORD_PREFIX.size):
+                    self._read_definition(inner_opcode, inner_start)
+            elif opcode == OP_MESSAGE:
+                self._loose_messages.append(self._read_message(start, end))
+            else:
+                self._read_definition(opcode, start)
+        self._loose_messages.sort(key=lambda message: message.log_time)
+
+    def _read_definition(self, opcode: int, start: int) -> None:
+        view = self._view
+        if opcode == OP_SCHEMA:
+            schema_id = _U16.unpack_from(view, start)[0]
+            name, offset = _read_string(view, start + 2)
+            encoding, offset = _read_string(view, offset)
+            length = _U32.unpack_from(view, offset)[0]
+            data = bytes(view[offset + 4:offset + 4 + length])
+            self.schemas[schema_id] = McapSchema(schema_id, name, encoding, data)
+        elif opcode == OP_CHANNEL:
+            channel_id, schema_id = struct.unpack_from('<HH', view, start)
+            topic, offset = _read_string(view, start + 4)
+            message_encoding, offset = _read_string(view, offset)
+            metadata, _ = _read_string_map(view, offset)
+            self.channels[channel_id] = McapChannel(channel_id, schema_id, topic, message_encoding, metadata)
+
+    def _read_message(self, start: int, end: int) -> McapMessage:
+        channel_id, sequence, log_time, publish_time = _MESSAGE_PREFIX.unpack_from(self._view, start)
+        return McapMessage(channel_id, sequence, log_time, publish_time,
+                           self._view[start + _MESSAGE_PREFIX.size:end])
+
+    def _chunk_records(self, chunk_offset: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields the records stored in the chunk at `chunk_offset`.
+        """
+        view = self._view
+        content = chunk_offset + _RECORD_PREFIX.size
+        offset = content + 28  # start_time, end_time, uncompressed_size, uncompressed_crc
+        compression, offset = _read_string(view, offset)
+        if compression:
+            raise McapFormatError(f"Unsupported chunk compression '{compression}' in {self.path}.")
+        length = _U64.unpack_from(view, offset)[0]
+        offset += 8
+        return self._records(offset, offset + length)
+
+    def schema_of(self, channel_id: int) -> Optional[McapSchema]:
+        """
+        Returns the schema of a channel, or None for schemaless channels.
+        """
+        channel = self.channels.get(channel_id)
+        return self.schemas.get(channel.schema_id) if channel else None
+
+    def message_count(self) -> int:
+        """
+        Returns the number of messages, counting them if the file has no statistics.
+        """
+        return sum(1 for _ in self.iter_messages())
+
+    def iter_messages(self, start_time: Optional[int] = None, end_time: Optional[int] = None) -> Iterator[McapMessage]:
+        """
+        Yields messages ordered by log time, optionally restricted to [start_time, end_time].
+        The first chunk is found by binary search over the chunk end times.
+
+        Args:
+            start_time (Optional[int]): Earliest log time in nanoseconds.
+            end_time (Optional[int]): Latest log time in nanoseconds.
+        """
+        chunks = self._chunks
+        first = 0
+        if start_time is not None and self._ends_sorted:
+            first = bisect.bisect_left(self._chunk_ends, start_time)
+
+        pending: List[McapMessage] = [
+            message for message in self._loose_messages
+            if (start_time is None or message.log_time >= start_time)
+            and (end_time is None or message.log_time <= end_time)
+        ]
+        for index in range(first, len(chunks)):
+            chunk = chunks[index]
+            if end_time is not None and chunk.start_time > end_time:
+                break
+            if start_time is not None and chunk.end_time < start_time:
+                continue
+            messages = [
+                self._read_message(start, end)
+                for opcode, start, end in self._chunk_records(chunk.offset) if opcode == OP_MESSAGE
+            ]
+            messages = [
+                message for message in messages
+                if (start_time is None or message.log_time >= start_time)
+                and (end_time is None or message.log_time <= end_time)
+            ]
+            # Chunks may overlap in time: only release messages no later chunk can precede.
+            pending.extend(messages)
+            pending.sort(key=lambda message: message.log_time)
+            horizon = chunks[index + 1].start_time if index + 1 < len(chunks) else None
+            release = len(pending) if horizon is None else \
+                bisect.bisect_left([message.log_time for message in pending], horizon)
+            yield from pending[:release]
+            pending = pending[release:]
+        yield from pending
@@ -0,0 +1,359 @@
+# mcap_writer.py
+"""
+Minimal writer for the MCAP container format (https://mcap.dev/spec).
+
+Messages are buffered into uncompressed chunks. Each chunk is followed by one
+MessageIndex record per channel, and the summary section at the end of the file
+holds the schemas, channels, statistics and a ChunkIndex per chunk, so readers
+can binary-search by time without scanning the data section.
+"""
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from app.utils.logger import logger
+
+
+MCAP_MAGIC = b"\x89MCAP0\r\n"
+
+# Record opcodes.
+OP_HEADER = 0x01
+OP_FOOTER = 0x02
+OP_SCHEMA = 0x03
+OP_CHANNEL = 0x04
+OP_MESSAGE = 0x05
+OP_CHUNK = 0x06
+OP_MESSAGE_INDEX = 0x07
+OP_CHUNK_INDEX = 0x08
+OP_STATISTICS = 0x0B
+OP_SUMMARY_OFFSET = 0x0E
+OP_DATA_END = 0x0F
+
+_RECORD_PREFIX = struct.Struct('<BQ')  # opcode, content length
+_MESSAGE_PREFIX = struct.Struct('<HIQQ')  # channel_id, sequence, log_time, publish_time
+_INDEX_ENTRY = struct.Struct('<QQ')  # log_time, offset
+
+
+def _string(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return struct.pack('<I', len(data)) + data
+
+
+def _string_map(values: Dict[str, str]) -> bytes:
+    data = b''.join(_string(key) + _string(value) for key, value in sorted(values.items()))
+    return struct.pack('<I', len(data)) + data
+
+
+def _record(opcode: int, content: bytes) -> bytes:
+    return _RECORD_PREFIX.pack(opcode, len(content)) + content
+
+
+class McapWriter:
+    """
+    Writes an indexed, chunked MCAP file. Not thread-safe; see McapRecorder for
+    writing from a background thread.
+    """
+
+    def __init__(
+            self,
+            stream: BinaryIO,
+            chunk_size: int = 1024 * 1024,
+            profile: str = "ros2",
+            library: str = "mowbot_legacy_app",
+        ):
+        """
+        Initializes the McapWriter and writes the file header.
+
+        Args:
+            stream (BinaryIO): Seekable binary stream positioned at the start of the file.
+            chunk_size (int): Uncompressed chunk size that triggers a chunk flush.
+            profile (str): MCAP profile of the recorded messages.
+            library (str): Name of the writing library stored in the header.
+        """
+        self._stream = stream
+        self._chunk_size = chunk_size
+
+        self._schemas: Dict[Tuple[str, str, bytes], int] = {}
+        self._schema_records: List[bytes] = []
+        self._channel_records: List[bytes] = []
+        self._chunk_indexes: List[bytes] = []
+        self._channel_counts: Dict[int, int] = {}
+        self._message_count = 0
+        self._start_time: Optional[int] = None
+        self._end_time: Optional[int] = None
+
+        self._chunk = bytearray()
+        self._chunk_indexes_by_channel: Dict[int, List[Tuple[int, int]]] = {}
+        self._chunk_start_time: Optional[int] = None
+        self._chunk_end_time: Optional[int] = None
+
+        self._stream.write(MCAP_MAGIC)
+        self._stream.write(_record(OP_HEADER, _string(profile) + _string(library)))
+
+    def add_schema(self, name: str, encoding: str, data: bytes) -> int:
+        """
+        Registers a schema; identical schemas share one ID.
+
+        Returns:
+            int: The schema ID.
+        """
+        key = (name, encoding, data)
+        schema_id = self._schemas.get(key)
+        if schema_id is None:
+            schema_id = len(self._schemas) + 1
+            self._schemas[key] = schema_id
+            record = _record(OP_SCHEMA, struct.pack('<H', schema_id) + _string(name) + _string(encoding)
+                             + struct.pack('<I', len(data)) + data)
+            self._schema_records.append(record)
+            self._chunk += record
+        return schema_id
+
+    def add_channel(
+            self,
+            channel_id: int,
+            topic: str,
+            message_encoding: str,
+            schema_id: int,
+            metadata: Optional[Dict[str, str]] = None,
+        ) -> None:
+        """
+        Registers a channel. Must be called before its first message.
+
+        Args:
+            channel_id (int): The channel ID (uint16) used by `add_message`.
+            topic (str): The topic name.
+            message_encoding (str): Encoding of the message payloads, e.g. 'cdr'.
+            schema_id (int): ID returned by `add_schema`, or 0 for schemaless channels.
+            metadata (Optional[Dict[str, str]]): Additional channel metadata.
+        """
+        record = _record(OP_CHANNEL, struct.pack('<HH', channel_id, schema_id) + _string(topic)
+                         + _string(message_encoding) + _string_map(metadata or {}))
+        self._channel_records.append(record)
+        self._channel_counts.setdefault(channel_id, 0)
+        self._chunk += record
+
+    def add_message(self, channel_id: int, sequence: int, log_time: int, publish_time: int, data: bytes) -> None:
+        """
+        Appends a message to the current chunk, flushing the chunk when it is full.
+
+        Args:
+            channel_id (int): The channel ID.
+            sequence (int): Per-channel sequence number.
+            log_time (int): Receive time in nanoseconds since epoch.
+            publish_time (int): Publish time in nanoseconds since epoch.
+            data (bytes): The serialized message.
+        """
+        self._chunk_indexes_by_channel.setdefault(channel_id, []).append((log_time, len(self._chunk)))
+        self._chunk += _RECORD_PREFIX.pack(OP_MESSAGE, _MESSAGE_PREFIX.size + len(data))
+        self._chunk += _MESSAGE_PREFIX.pack(channel_id, sequence, log_time, publish_time)
+        self._chunk += data
+
+        if self._chunk_start_time is None or log_time < self._chunk_start_time:
+            self._chunk_start_time = log_time
+        if self._chunk_end_time is None or log_time > self._chunk_end_time:
+            self._chunk_end_time = log_time
+        self._channel_counts[channel_id] = self._channel_counts.get(channel_id, 0) + 1
+        self._message_count += 1
+
+        if len(self._chunk) >= self._chunk_size:
+            self.flush_chunk()
+
+    def flush_chunk(self) -> None:
+        """
+        Writes the current chunk followed by its message indexes.
+        """
+        if not self._chunk_indexes_by_channel:
+            return  # Schema and channel records wait for the next chunk with messages.
+        start_time, end_time = self._chunk_start_time, self._chunk_end_time
+        records = bytes(self._chunk)
+        chunk_start = self._stream.tell()
+        chunk = _record(OP_CHUNK, struct.pack('<QQQI', start_time, end_time, len(records), zlib.crc32(records))
+                        + _string("") + struct.pack('<Q', len(records)) + records)
+        self._stream.write(chunk)
+
+        index_offsets = {}
+        index_start = chunk_start + len(chunk)
+        offset = index_start
+        for channel_id, entries in sorted(self._chunk_indexes_by_channel.items()):
+            entries.sort()
+            body = b''.join(_INDEX_ENTRY.pack(*entry) for entry in entries)
+            index = _record(OP_MESSAGE_INDEX, struct.pack('<HI', channel_id, len(body)) + body)
+            self._stream.write(index)
+            index_offsets[channel_id] = offset
+            offset += len(index)
+
+        offsets = b''.join(struct.pack('<HQ', channel_id, index_offset)
+                           for channel_id, index_offset in index_offsets.items())
+        self._chunk_indexes.append(_record(
+            OP_CHUNK_INDEX,
+            struct.pack('<QQQQ', start_time, end_time, chunk_start, len(chunk))
+            + struct.pack('<I', len(offsets)) + offsets
+            + struct.pack('<Q', offset - index_start) + _string("")
+            + struct.pack('<QQ', len(records), len(records))))
+
+        self._start_time = start_time if self._start_time is None else min(self._start_time, start_time)
+        self._end_time = end_time if self._end_time is None else max(self._end_time, end_time)
+        self._chunk = bytearray()
+        self._chunk_indexes_by_channel = {}
+        self._chunk_start_time = None
+        self._chunk_end_time = None
+
+    def close(self) -> None:
+        """
+        Flushes the last chunk and writes the summary section and footer.
+        The stream itself is left open.
+        """
+        self.flush_chunk()
+        self._stream.write(_record(OP_DATA_END, struct.pack('<I', 0)))
+
+        summary_start = self._stream.tell()
+        summary = bytearray()
+        groups = []
+        channel_counts = b''.join(struct.pack('<HQ', channel_id, count)
+                                  for channel_id, count in sorted(self._channel_counts.items()))
+        statistics = _record(OP_STATISTICS, struct.pack(
+            '<QHIIIIQQ', self._message_count, len(self._schema_records), len(self._channel_records),
+            0, 0, len(self._chunk_indexes), self._start_time or 0, self._end_time or 0)
+            + struct.pack('<I', len(channel_counts)) + channel_counts)
+        for opcode, records in (
+                (OP_SCHEMA, self._schema_records),
+                (OP_CHANNEL, self._channel_records),
+                (OP_STATISTICS, [statistics]),
+                (OP_CHUNK_INDEX, self._chunk_indexes)):
+            if records:
+                groups.append((opcode, summary_start + len(summary), sum(map(len, records))))
+                for record in records:
+                    summary += record
+
+        summary_offset_start = summary_start + len(summary)
+        for group in groups:
+            summary += _record(OP_SUMMARY_OFFSET, struct.pack('<BQQ', *group))
+        if not summary:
+            summary_start = summary_offset_start = 0
+
+        footer = _RECORD_PREFIX.pack(OP_FOOTER, 20) + struct.pack('<QQ', summary_start, summary_offset_start)
+        summary_crc = zlib.crc32(bytes(summary) + footer)
+        self._stream.write(bytes(summary) + footer + struct.pack('<I', summary_crc))
+        self._stream.write(MCAP_MAGIC)
+
+
+class McapRecorder:
+    """
+    Records messages to an MCAP file from a background thread.
+    `add_channel` and `write` only enqueue work and may be called from any thread.
+    """
+
+    _STOP = object()
+
+    def __init__(self, directory: str, chunk_size: int = 1024 * 1024):
+        """
+        Initializes the McapRecorder.
+
+        Args:
+            directory (str): Directory the recordings are created in.
+            chunk_size (int): Uncompressed chunk size of the recordings.
+        """
+        self._directory = directory
+        self._chunk_size = chunk_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._channels: Dict[Tuple[str, str, str, str, bytes], int] = {}
+        self._sequences: Dict[int, int] = {}
+        self._recording = False
+        self.path: Optional[str] = None
+
+    def is_recording(self) -> bool:
+        return self._recording
+
+    def start(self) -> str:
+        """
+        Creates a new recording file and starts the writer thread.
+
+        Returns:
+            str: Path of the recording.
+        """
+        if self._recording:
+            return self.path
+        os.makedirs(self._directory, exist_ok=True)
+        self.path = os.path.join(self._directory, datetime.now().strftime("mowbot_%Y%m%d_%H%M%S.mcap"))
+        stream = open(self.path, 'wb')
+        self._queue = queue.SimpleQueue()
+        self._channels = {}
+        self._sequences = {}
+        self._recording = True
+        self._thread = threading.Thread(target=self._write_loop, args=(stream,), name="mcap-recorder", daemon=True)
+        self._thread.start()
+        logger.info(f"Recording started: {self.path}")
+        return self.path
+
+    def stop(self) -> None:
+        """
+        Stops recording, waiting until every queued message is written and the file is closed.
+        """
+        if not self._recording:
+            return
+        self._recording = False
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+        logger.info(f"Recording stopped: {self.path}")
+
+    def add_channel(
+            self,
+            topic: str,
+            message_encoding: str,
+            schema_name: str,
+            schema_encoding: str,
+            schema: bytes,
+        ) -> int:
+        """
+        Registers a channel; an identical channel registered earlier is reused.
+
+        Returns:
+            int: The channel ID to pass to `write`.
+        """
+        key = (topic, message_encoding, schema_name, schema_encoding, schema)
+        channel_id = self._channels.get(key)
+        if channel_id is None:
+            channel_id = len(self._channels) + 1
+            self._channels[key] = channel_id
+            self._queue.put((channel_id, key))
+        return channel_id
+
+    def write(self, channel_id: int, publish_time: int, data: bytes) -> None:
+        """
+        Queues a message; its log time is the time of this call.
+
+        Args:
+            channel_id (int): ID returned by `add_channel`.
+            publish_time (int): Publish time in nanoseconds since epoch.
+            data (bytes): The serialized message.
+        """
+        if self._recording:
+            self._queue.put((channel_id, time.time_ns(), publish_time, data))
+
+    def _write_loop(self, stream: BinaryIO) -> None:
+        with stream:
+            writer = McapWriter(stream, chunk_size=self._chunk_size)
+            while True:
+                item = self._queue.get()
+                if item is self._STOP:
+                    break
+                try:
+                    if len(item) == 2:
+                        channel_id, (topic, message_encoding, schema_name, schema_encoding, schema) = item
+                        schema_id = writer.add_schema(schema_name, schema_encoding, schema) if schema_name else 0
+                        writer.add_channel(channel_id, topic, message_encoding, schema_id)
+                        continue
+                    channel_id, log_time, publish_time, data = item
+                    sequence = self._sequences.get(channel_id, 0) + 1
+                    self._sequences[channel_id] = sequence
+                    writer.add_message(channel_id, sequence, log_time, publish_time, data)
+                except Exception as e:
+                    logger.error(f"Error writing recording {self.path}: {e}")
+            writer.close()
@@ -0,0 +1,144 @@
+# signal_coalescer.py
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer
+
+from app.utils.logger import logger
+
+
+_EMPTY = object()
+
+
+class LatestValueMailbox:
+    """
+    Keeps only the newest value per key.
+    Writers overwrite the slot of a key; the reader takes whatever is there.
+    Single dict operations are atomic under the GIL, so no lock is needed
+    between the producing thread and the consuming thread.
+    """
+
+    def __init__(self):
+        self._slots: Dict[Hashable, Any] = {}
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores `value` as the latest value of `key`, replacing any value not yet taken.
+        """
+        self._slots[key] = value
+
+    def take_all(self) -> Dict[Hashable, Any]:
+        """
+        Removes and returns the latest value of every key that has one.
+        A value written while this runs is either returned now or kept for the next call.
+
+        Returns:
+            Dict[Hashable, Any]: The latest value per key.
+        """
+        values = {}
+        for key in list(self._slots):
+            value = self._slots.pop(key, _EMPTY)
+            if value is not _EMPTY:
+                values[key] = value
+        return values
+
+    def take(self, key: Hashable) -> Any:
+        """
+        Removes and returns the latest value of `key`, or None if it has none.
+        """
+        value = self._slots.pop(key, _EMPTY)
+        return None if value is _EMPTY else value
+
+    def clear(self) -> None:
+        """
+        Drops all pending values.
+        """
+        self._slots.clear()
+
+
+class SignalCoalescer(QObject):
+    """
+    Publishes the newest value per key on a fixed render tick.
+    Producers (on any thread) call `publish`; a QTimer owned by the thread that
+    created the coalescer emits the registered signal once per tick with only
+    the latest value, so the receiving event queue never holds stale samples.
+    """
+
+    def __init__(self, rate_hz: float, parent: QObject = None):
+        """
+        Initializes the SignalCoalescer.
+
+        Args:
+            rate_hz (float): Number of render ticks per second.
+            parent (QObject): Optional Qt parent.
+        """
+        super().__init__(parent)
+        self._mailbox = LatestValueMailbox()
+        self._signals: Dict[Hashable, List[Tuple[Any, tuple]]] = {}
+        self._emitted_callback: Optional[Callable[[Any, int], None]] = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(round(1000.0 / rate_hz))))
+        self._timer.timeout.connect(self._on_tick)
+
+    def register(self, key: Hashable, signal: Any, *args: Any) -> None:
+        """
+        Registers a bound signal emitted for values published under `key`.
+        A key can have several signals; they are emitted in registration order.
+
+        Args:
+            key (Hashable): The mailbox key.
+            signal (Any): The bound pyqtSignal to emit with the latest value.
+            *args (Any): Leading signal arguments emitted before the value, e.g. a robot ID.
+        """
+        self._signals.setdefault(key, []).append((signal, args))
+
+    def unregister(self, key: Hashable) -> None:
+        """
+        Removes the signals of `key` and drops its pending value.
+        """
+        self._signals.pop(key, None)
+        self._mailbox.take(key)
+
+    def set_emitted_callback(self, callback: Optional[Callable[[Any, int], None]]) -> None:
+        """
+        Sets a callback invoked after each emit whose value was published with a
+        `sample`, with the sample and the time (ns) the connected slots returned.
+        """
+        self._emitted_callback = callback
+
+    def publish(self, key: Hashable, value: Any, sample: Any = None) -> None:
+        """
+        Stores `value` as the latest value of `key`. Safe to call from any thread.
+
+        Args:
+            key (Hashable): The mailbox key.
+            value (Any): The value to emit.
+            sample (Any): Optional bookkeeping passed to the emitted callback.
+        """
+        self._mailbox.put(key, (value, sample))
+
+    def start(self) -> None:
+        """
+        Starts the render tick. Must be called from the coalescer's thread.
+        """
+        self._mailbox.clear()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """
+        Stops the render tick and drops values that were not published yet.
+        """
+        self._timer.stop()
+        self._mailbox.clear()
+
+    def _on_tick(self) -> None:
+        for key, (value, sample) in self._mailbox.take_all().items():
+            signals = self._signals.get(key)
+            if not signals:
+                logger.warning(f"No signal registered for coalesced key: {key}")
+                continue
+            # Slots in this thread run synchronously, so they are done when emit returns.
+            for signal, args in signals:
+                signal.emit(*args, value)
+            if sample is not None and self._emitted_callback is not None:
+                self._emitted_callback(sample, time.time_ns())
@@ -40,6 +40,8 @@ class MainView(QWidget):
     signal_nav_wpfl_waypoints_load_btn_clicked = pyqtSignal(str) # load_file_path
     signal_nav_wpfl_params_load_btn_clicked = pyqtSignal(str) # load_file_path
     
+    signal_record_btn_clicked = pyqtSignal(str) # start or stop
+    
     signal_exit_btn_clicked = pyqtSignal()
     signal_shutdown_btn_clicked = pyqtSignal()
     signal_restart_btn_clicked = pyqtSignal()
@@ -68,6 +70,8 @@ class MainView(QWidget):
         self._is_waiting_for_localization = None
         self._is_waiting_for_navigation = None
         
+        self._is_recording = False
+        
         self.title_label = QLabel("MOWBOT CONTROL SYSTEM")
         self.title_label.setAlignment(Qt.AlignCenter)
         self.title_label.setStyleSheet("""
@@ -179,6 +183,7 @@ class MainView(QWidget):
             self.multi_panel.settings_panel.nav_settings_dlg.nav_panel.signal_load_btn_clicked
         self.signal_settings_nav_save_btn_clicked = \
             self.multi_panel.settings_panel.nav_settings_dlg.nav_panel.signal_save_btn_clicked
+        self.signal_panel_changed = self.multi_panel.signal_panel_changed
         # self.signal_settings_nav_sync_btn_clicked = \
         #     self.multi_panel.settings_panel.nav_settings_dlg.nav_panel.signal_sync_btn_clicked
         # self.signal_settings_nav_apply_btn_clicked = \
@@ -222,8 +227,11 @@ class MainView(QWidget):
     def _connect_button_events(self):
         """Connect button click events to their handlers."""
         self.menu_box.settings_btn.clicked.connect(self.on_settings_btn_clicked)
+        self.menu_box.diagnostics_btn.clicked.connect(self.on_diagnostics_btn_clicked)
+        self.menu_box.logs_btn.clicked.connect(self.on_logs_btn_clicked)
         self.menu_box.logger_btn.clicked.connect(self.on_logger_btn_clicked)
         self.menu_box.navigator_btn.clicked.connect(self.on_navigator_btn_clicked)
+        self.menu_box.record_btn.clicked.connect(self.on_record_btn_clicked)
         
         self.bringup_btn.clicked.connect(self.on_bringup_btn_clicked)
         self.localize_btn.clicked.connect(self.on_localize_btn_clicked)
@@ -291,6 +299,16 @@ class MainView(QWidget):
         self.multi_panel.show_settings_panel()  # Assuming the method name reflects your panel's API.
         # self.signal_settings_btn_clicked.emit()
         
+    def on_diagnostics_btn_clicked(self):
+        """Show the diagnostics panel."""
+        self.menu_box.highlight_button("diagnostics")
+        self.multi_panel.show_diagnostics_panel()
+
+    def on_logs_btn_clicked(self):
+        """Show the container logs panel."""
+        self.menu_box.highlight_button("logs")
+        self.multi_panel.show_logs_panel()
+
     def on_logger_btn_clicked(self):
         """Forward the logger button event."""
         self.menu_box.highlight_button("logger")
@@ -303,6 +321,11 @@ class MainView(QWidget):
         self.multi_panel.show_waypoints_navigator_panel()
         # self.signal_navigator_btn_clicked.emit()
         
+    def on_record_btn_clicked(self):
+        """Forward the record button event."""
+        self.menu_box.record_btn.setEnabled(False)
+        self.signal_record_btn_clicked.emit("stop" if self._is_recording else "start")
+        
     def on_bringup_btn_clicked(self):
         """Handle the bringup button click event."""
         
@@ -605,6 +628,46 @@ class MainView(QWidget):
             self.status_bar.update_status(name, status)
             
             
+    @pyqtSlot(str)
+    def on_signal_foxglove_connection_state(self, state: str):
+        """
+        Update the link status when the Foxglove connection state changes.
+        """
+        logger.info(f"Foxglove connection {state}")
+        self.status_bar.update_connection(state)
+            
+    @pyqtSlot(str, dict)
+    def on_signal_container_stats(self, key: str, stats: dict):
+        """
+        Update the resource usage of a launch container in the status bar.
+        """
+        self.status_bar.update_container_stats(key, stats)
+
+    @pyqtSlot(str, dict)
+    def on_signal_image_state(self, state: str, info: dict):
+        """
+        Update the container image state in the status bar.
+        """
+        self.status_bar.update_image_state(state, info)
+
+    @pyqtSlot(dict)
+    def on_signal_image_progress(self, progress: dict):
+        """
+        Update the progress of an image pull or load in the status bar.
+        """
+        self.status_bar.update_image_progress(progress)
+
+    @pyqtSlot(bool, str)
+    def on_signal_recording_state(self, recording: bool, file_path: str):
+        """
+        Update the record button when a recording starts or stops.
+        """
+        logger.info(f"Recording {'started' if recording else 'stopped'}: {file_path}")
+        self._is_recording = recording
+        self.menu_box.set_recording(recording)
+        self.menu_box.record_btn.setEnabled(True)
+            
+            
     @pyqtSlot(dict)
     def on_signal_gps_fix_received(self, data: dict):
         # logger.info(f" GPS Fix signal received: {data}")
@@ -15,11 +15,20 @@ class MenuBoxView(QWidget):
         self.settings_btn = QPushButton('Settings')
         self.settings_btn.setFixedHeight(50)
 
+        self.diagnostics_btn = QPushButton('Diagnostics')
+        self.diagnostics_btn.setFixedHeight(50)
+
+        self.logs_btn = QPushButton('Container Logs')
+        self.logs_btn.setFixedHeight(50)
+
         self.logger_btn = QPushButton('Waypoint Logger')
         self.logger_btn.setFixedHeight(50)
         
         self.navigator_btn = QPushButton('Waypoint Navigator')
         self.navigator_btn.setFixedHeight(50)
+
+        self.record_btn = QPushButton('Start Recording')
+        self.record_btn.setFixedHeight(50)
         
         self.task_menu_grb = QGroupBox('Tasks')
         
@@ -37,6 +46,10 @@ class MenuBoxView(QWidget):
         menu_layout = QVBoxLayout()
         menu_layout.addWidget(self.settings_btn)
         menu_layout.addSpacing(10)
+        menu_layout.addWidget(self.diagnostics_btn)
+        menu_layout.addSpacing(10)
+        menu_layout.addWidget(self.logs_btn)
+        menu_layout.addSpacing(10)
         
         # Create a nested group box for task-related buttons
         self.task_menu_grb.setStyleSheet("QGroupBox { font-size: 14px; font-weight: bold; }")
@@ -46,6 +59,8 @@ class MenuBoxView(QWidget):
         task_menu_layout.addSpacing(10)
         task_menu_layout.addWidget(self.navigator_btn)
         task_menu_layout.addSpacing(10)
+        task_menu_layout.addWidget(self.record_btn)
+        task_menu_layout.addSpacing(10)
         task_menu_layout.addStretch(1)
         
         menu_layout.addWidget(self.task_menu_grb)
@@ -58,9 +73,13 @@ class MenuBoxView(QWidget):
     def reset_btns(self):
         """Resets all buttons to default style and enables them."""
         self.settings_btn.setEnabled(True)
+        self.diagnostics_btn.setEnabled(True)
+        self.logs_btn.setEnabled(True)
         self.logger_btn.setEnabled(True)
         self.navigator_btn.setEnabled(True)
         self.settings_btn.setStyleSheet("")
+        self.diagnostics_btn.setStyleSheet("")
+        self.logs_btn.setStyleSheet("")
         self.logger_btn.setStyleSheet("")
         self.navigator_btn.setStyleSheet("")
     
@@ -68,14 +87,31 @@ class MenuBoxView(QWidget):
         """
         Highlights the specified button and resets all others.
         
-        :param button_name: One of "settings", "logger", or "navigator".
+        :param button_name: One of "settings", "diagnostics", "logs", "logger", or "navigator".
         """
         self.reset_btns()
         style = "background-color: lightblue; font-size: 16px; font-weight: bold;"
         if button_name == "settings":
             self.settings_btn.setStyleSheet(style)
+        elif button_name == "diagnostics":
+            self.diagnostics_btn.setStyleSheet(style)
+        elif button_name == "logs":
+            self.logs_btn.setStyleSheet(style)
         elif button_name == "logger":
             self.logger_btn.setStyleSheet(style)
         elif button_name == "navigator":
             self.navigator_btn.setStyleSheet(style)
         
+
+    def set_recording(self, recording: bool):
+        """
+        Updates the record button to show whether a recording is running.
+
+        :param recording: True while recording.
+        """
+        if recording:
+            self.record_btn.setText('Stop Recording')
+            self.record_btn.setStyleSheet("color: red; font-weight: bold;")
+        else:
+            self.record_btn.setText('Start Recording')
+            self.record_btn.setStyleSheet("")
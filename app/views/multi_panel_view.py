@@ -1,4 +1,5 @@
 # multipanel_view.py
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (
     QWidget, 
     QVBoxLayout, 
@@ -6,12 +7,20 @@ from PyQt5.QtWidgets import (
     QStackedWidget
 )
 from .panels import (
+    DiagnosticsPanelView,
+    LogsPanelView,
     SettingsPanelView,
     WaypointsLoggerPanelView,
     WaypointsNavigatorPanelView,
 )
 
 class MultiPanelView(QWidget):
+
+    # Panel names in stacked widget order.
+    PANEL_NAMES = ("logger", "navigator", "settings", "diagnostics", "logs")
+
+    signal_panel_changed = pyqtSignal(str)  # str: name of the visible panel
+
     def __init__(self, config):
         super().__init__()
         self._config = config
@@ -27,11 +36,20 @@ class MultiPanelView(QWidget):
         self.settings_panel = SettingsPanelView(
             config=self._config
         )                
+        self.diagnostics_panel = DiagnosticsPanelView(
+            config=self._config
+        )
+        self.logs_panel = LogsPanelView(
+            config=self._config
+        )
 
         # Add panels to the stacked widget.
         self.stacked_widget.addWidget(self.waypoints_logger_panel)
         self.stacked_widget.addWidget(self.waypoints_navigator_panel)
         self.stacked_widget.addWidget(self.settings_panel)
+        self.stacked_widget.addWidget(self.diagnostics_panel)
+        self.stacked_widget.addWidget(self.logs_panel)
+        self.stacked_widget.currentChanged.connect(self._on_current_changed)
 
         self._init_ui()
 
@@ -44,6 +62,14 @@ class MultiPanelView(QWidget):
         layout.addWidget(group_box)
         self.setLayout(layout)
 
+    def _on_current_changed(self, index: int):
+        if 0 <= index < len(self.PANEL_NAMES):
+            self.signal_panel_changed.emit(self.PANEL_NAMES[index])
+
+    def current_panel_name(self) -> str:
+        """Returns the name of the visible panel."""
+        return self.PANEL_NAMES[self.stacked_widget.currentIndex()]
+
     # View API methods for switching panels
     def show_waypoints_logger_panel(self):
         """Switches to the Waypoints Logger panel (Index 0)."""
@@ -56,3 +82,11 @@ class MultiPanelView(QWidget):
     def show_settings_panel(self):
         """Switches to the Settings panel (Index 2)."""
         self.stacked_widget.setCurrentIndex(2)
+
+    def show_diagnostics_panel(self):
+        """Switches to the Diagnostics panel (Index 3)."""
+        self.stacked_widget.setCurrentIndex(3)
+
+    def show_logs_panel(self):
+        """Switches to the Logs panel (Index 4)."""
+        self.stacked_widget.setCurrentIndex(4)
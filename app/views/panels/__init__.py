@@ -1,3 +1,5 @@
+from .diagnostics_panel_view import DiagnosticsPanelView
+from .logs_panel_view import LogsPanelView
 from .settings_panel_view import SettingsPanelView
 from .waypoints_logger_panel_view import WaypointsLoggerPanelView
 from .waypoints_navigator_panel_view import WaypointsNavigatorPanelView
@@ -0,0 +1,105 @@
+# diagnostics_panel_view.py
+from typing import Any, Dict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+)
+
+
+class DiagnosticsPanelView(QWidget):
+    """
+    Shows the connection state of the monitored robots, the latency percentiles
+    of the Foxglove topics per pipeline stage and the decode queue counters.
+    """
+
+    COLUMNS = ("Topic", "Stage", "Count", "p50 (ms)", "p90 (ms)", "p99 (ms)", "Max (ms)")
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__()
+        self._config = config
+        self._robot_states: Dict[str, str] = {}
+
+        self.robots_lbl = QLabel("Robots: -")
+        self.robots_lbl.setStyleSheet("font-size: 14px;")
+        self.robots_lbl.setWordWrap(True)
+
+        self.decode_stats_lbl = QLabel("Decode queue: -")
+        self.decode_stats_lbl.setStyleSheet("font-size: 14px;")
+
+        self.latency_table = QTableWidget(0, len(self.COLUMNS))
+        self.latency_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.latency_table.verticalHeader().setVisible(False)
+        self.latency_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.latency_table.setSelectionMode(QAbstractItemView.NoSelection)
+
+        self.note_lbl = QLabel(
+            "sensor: header stamp to frame, network: frame to receive, decode: receive to decoded, "
+            "view: decoded to view update, end_to_end: frame to view update. "
+            "Robot and local clock offsets are included in network and end_to_end.")
+        self.note_lbl.setWordWrap(True)
+
+        self._init_ui()
+
+    def _init_ui(self):
+        layout = QVBoxLayout()
+        layout.addWidget(self.robots_lbl)
+        layout.addWidget(self.decode_stats_lbl)
+        layout.addWidget(self.latency_table, 1)
+        layout.addWidget(self.note_lbl)
+        self.setLayout(layout)
+
+    def update_robot_state(self, robot_id: str, state: str):
+        """
+        Shows the connection state of a robot.
+
+        :param robot_id: The robot.
+        :param state: One of "connecting", "connected", "reconnecting" or "disconnected".
+        """
+        self._robot_states[robot_id] = state
+        self.robots_lbl.setText(
+            "Robots: " + ", ".join(f"{robot} {state}" for robot, state in self._robot_states.items()))
+
+    def update_decode_stats(self, stats: Dict[str, int]):
+        """
+        Shows the decode queue counters.
+
+        :param stats: 'submitted', 'dropped', 'handled' and 'queued' frames.
+        """
+        self.decode_stats_lbl.setText(
+            "Decode queue: " + ", ".join(f"{key} {value}" for key, value in stats.items()))
+
+    def update_latency(self, snapshot: Dict[str, Dict[str, Dict[str, float]]]):
+        """
+        Fills the table with one row per topic and stage.
+
+        :param snapshot: topic -> stage -> summary, as returned by LatencyMonitor.snapshot().
+        """
+        rows = [
+            (topic, stage, summary)
+            for topic, stages in snapshot.items()
+            for stage, summary in stages.items()
+        ]
+        self.latency_table.setRowCount(len(rows))
+        for row, (topic, stage, summary) in enumerate(rows):
+            values = (
+                topic,
+                stage,
+                str(summary['count']),
+                f"{summary['p50']:.1f}",
+                f"{summary['p90']:.1f}",
+                f"{summary['p99']:.1f}",
+                f"{summary['max']:.1f}",
+            )
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.latency_table.setItem(row, column, item)
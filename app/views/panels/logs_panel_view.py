@@ -0,0 +1,118 @@
+# logs_panel_view.py
+from typing import Any, Dict, List
+
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QComboBox,
+    QCheckBox,
+    QPlainTextEdit,
+)
+
+
+class LogsPanelView(QWidget):
+    """
+    Shows the output of a launch container. The controller pulls the lines added
+    since `last_seq()` at a fixed rate and hands them to `append_lines`.
+    """
+
+    LEVELS = ("DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__()
+        self._config = config
+        self._last_seq = 0
+        self._skipped = 0
+
+        self.container_cmb = QComboBox()
+        self.level_cmb = QComboBox()
+        self.level_cmb.addItems(self.LEVELS)
+        self.level_cmb.setCurrentText("INFO")
+        self.follow_chk = QCheckBox("Follow")
+        self.follow_chk.setChecked(True)
+        self.skipped_lbl = QLabel("")
+
+        self.log_txt = QPlainTextEdit()
+        self.log_txt.setReadOnly(True)
+        self.log_txt.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.log_txt.setMaximumBlockCount(config.get("container_log_buffer_lines", 5000))
+        self.log_txt.setStyleSheet("font-family: monospace; font-size: 12px;")
+
+        # Changing the container or level reloads the buffered lines.
+        self.container_cmb.currentTextChanged.connect(self.reset)
+        self.level_cmb.currentTextChanged.connect(self.reset)
+
+        self._init_ui()
+
+    def _init_ui(self):
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(QLabel("Container:"))
+        toolbar.addWidget(self.container_cmb)
+        toolbar.addSpacing(20)
+        toolbar.addWidget(QLabel("Level:"))
+        toolbar.addWidget(self.level_cmb)
+        toolbar.addSpacing(20)
+        toolbar.addWidget(self.follow_chk)
+        toolbar.addStretch(1)
+        toolbar.addWidget(self.skipped_lbl)
+
+        layout = QVBoxLayout()
+        layout.addLayout(toolbar)
+        layout.addWidget(self.log_txt, 1)
+        self.setLayout(layout)
+
+    def set_containers(self, keys: List[str]):
+        """
+        Sets the containers to choose from.
+
+        :param keys: The container keys.
+        """
+        self.container_cmb.clear()
+        self.container_cmb.addItems(keys)
+
+    def current_container(self) -> str:
+        """Returns the key of the container shown."""
+        return self.container_cmb.currentText()
+
+    def last_seq(self) -> int:
+        """Returns the sequence number of the last line received."""
+        return self._last_seq
+
+    def max_lines(self) -> int:
+        """Returns the number of lines the panel keeps."""
+        return self.log_txt.maximumBlockCount()
+
+    def reset(self, *_):
+        """Clears the lines, so the next pull reloads the buffered ones."""
+        self._last_seq = 0
+        self._skipped = 0
+        self.skipped_lbl.setText("")
+        self.log_txt.clear()
+
+    def append_lines(self, lines: List[Any], skipped: int = 0):
+        """
+        Appends the lines of the shown container that pass the level filter.
+
+        :param lines: LogLine tuples, oldest first.
+        :param skipped: Number of lines dropped before they were pulled.
+        """
+        # Lines that left the buffer before a (re)load are not news.
+        if skipped and self._last_seq:
+            self._skipped += skipped
+            self.skipped_lbl.setText(f"{self._skipped} lines skipped")
+        if not lines:
+            return
+        self._last_seq = lines[-1].seq
+        min_level = self.LEVELS.index(self.level_cmb.currentText())
+        text = "\n".join(line.text for line in lines if self.LEVELS.index(line.level) >= min_level)
+        if not text:
+            return
+        scroll_bar = self.log_txt.verticalScrollBar()
+        position = scroll_bar.value()
+        self.log_txt.appendPlainText(text)
+        if self.follow_chk.isChecked():
+            scroll_bar.setValue(scroll_bar.maximum())
+        else:
+            scroll_bar.setValue(position)
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Any, Dict, Literal, Optional
 
 from PyQt5.QtWidgets import (
     QWidget, 
@@ -37,6 +37,23 @@ class StatusBarView(QWidget):
         "Lidar",
     ]
 
+    # Text color per Foxglove connection state.
+    CONNECTION_COLORS = {
+        "connected": "green",
+        "connecting": "orange",
+        "reconnecting": "orange",
+        "disconnected": "red",
+    }
+
+    # Text color per container image state.
+    IMAGE_STATE_COLORS = {
+        "ready": "green",
+        "missing": "red",
+    }
+
+    # CPU usage (% of one CPU, max of the window) from which a container is shown as busy.
+    CONTAINER_CPU_WARN_PERCENT = 80.0
+
     def __init__(self):
         super().__init__()
 
@@ -55,13 +72,106 @@ class StatusBarView(QWidget):
             self.status_item_dict[name] = item
 
         status_layout.addStretch(1)
+        self.link_item = StatusItem("Link")
+        self.link_item.status_label.setText("Disconnected")
+        status_layout.addWidget(self.link_item)
         group_box.setLayout(status_layout)
         layout.addWidget(group_box)
 
+        # Image of the launch containers and the resource usage of the running containers.
+        containers_box = QGroupBox("Containers")
+        containers_box.setStyleSheet("QGroupBox { font-size: 16px; font-weight: bold; }")
+        self.containers_layout = QHBoxLayout()
+        self.image_item = StatusItem("Image")
+        self.image_item.status_label.setText("Checking")
+        self.image_item.status_label.setStyleSheet("color: orange;")
+        self.containers_layout.addWidget(self.image_item)
+        self._image_state = "checking"
+        containers_box.setLayout(self.containers_layout)
+        layout.addWidget(containers_box)
+        self.container_item_dict = {}
+
         self.setLayout(layout)
         self.setFixedHeight(100)
         
     
+    def update_connection(self, state: str):
+        """
+        Show the state of the Foxglove connection.
+
+        Args:
+            state (str): One of "connecting", "connected", "reconnecting" or "disconnected".
+        """
+        self.link_item.status_label.setText(state.capitalize())
+        self.link_item.status_label.setStyleSheet(
+            f"color: {self.CONNECTION_COLORS.get(state, 'red')};")
+
+    def update_image_state(self, state: str, info: Dict[str, Any]):
+        """
+        Show the state of the launch container image.
+
+        Args:
+            state (str): One of ContainerImageModel.IMAGE_STATES.
+            info (dict): The image reference, ID, digest, source and error.
+        """
+        self._image_state = state
+        self.image_item.status_label.setText(state.capitalize())
+        self.image_item.status_label.setStyleSheet(
+            f"color: {self.IMAGE_STATE_COLORS.get(state, 'orange')};")
+        self.image_item.setToolTip("\n".join(
+            f"{key.capitalize()}: {value}" for key, value in info.items() if value))
+
+    def update_image_progress(self, progress: Dict[str, Any]):
+        """
+        Show the progress of an image pull or load.
+
+        Args:
+            progress (dict): 'status', and the 'current' and 'total' bytes if known.
+        """
+        if self._image_state not in ("loading", "pulling"):
+            return
+        text = self._image_state.capitalize()
+        if progress.get('total'):
+            text += f" {100 * progress['current'] / progress['total']:.0f}%"
+            text += f" of {progress['total'] / 2 ** 20:.0f} MiB"
+        if progress.get('layers'):
+            text += f" ({progress.get('layers_done', 0)}/{progress['layers']} layers)"
+        self.image_item.status_label.setText(text)
+
+    def update_container_stats(self, key: str, stats: Dict[str, Optional[float]]):
+        """
+        Show the resource usage of a launch container.
+
+        Args:
+            key (str): The container key.
+            stats (dict): ContainerStatsWindow.summary(), empty if the container is not running.
+        """
+        item = self.container_item_dict.get(key)
+        if item is None:
+            item = StatusItem(key)
+            self.containers_layout.addWidget(item)
+            self.container_item_dict[key] = item
+        if not stats:
+            item.status_label.setText("Inactive")
+            item.status_label.setStyleSheet("color: gray;")
+            item.setToolTip("")
+            return
+        cpu, cpu_max = stats.get('cpu_percent'), stats.get('cpu_percent_max')
+        text = f"CPU {cpu:.0f}%" if cpu is not None else "CPU -"
+        text += f" | {stats['memory_bytes'] / 2 ** 20:.0f} MiB"
+        item.status_label.setText(text)
+        busy = cpu_max is not None and cpu_max >= self.CONTAINER_CPU_WARN_PERCENT
+        item.status_label.setStyleSheet("color: orange;" if busy else "color: green;")
+
+        def rate(value):
+            return "-" if value is None else f"{value / 1024:.1f} KiB/s"
+
+        item.setToolTip(
+            f"CPU max {'-' if cpu_max is None else f'{cpu_max:.0f}%'}\n"
+            f"Memory {stats['memory_bytes'] / 2 ** 20:.0f} / {stats['memory_limit_bytes'] / 2 ** 20:.0f} MiB\n"
+            f"Network rx {rate(stats.get('net_rx_bps'))}, tx {rate(stats.get('net_tx_bps'))}\n"
+            f"Block read {rate(stats.get('block_read_bps'))}, write {rate(stats.get('block_write_bps'))}")
+
     def update_status(self, name: str, status: Literal["Inactive", "Active"]):
         """
         Update the status of a specific item.
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Stand-in Foxglove WebSocket server (foxglove.websocket.v1) for running the app
+without a robot.
+
+Advertises /gps/fix_filtered, /gps/heading and /sensor_status with ros2msg
+schemas, streams CDR-encoded synthetic data to subscribers at configurable
+rates and can drop all clients or go offline on a schedule to exercise the
+reconnect path.
+
+Usage:
+    python test/foxglove_sim_server.py --gps-rate 100 --heading-rate 1000 \
+        --disconnect-every 30 --down-for 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import struct
+import sys
+import time
+
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.cdr_decoder import BUILTIN_SCHEMAS  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("foxglove_sim_server")
+
+SUBPROTOCOL = "foxglove.websocket.v1"
+MESSAGE_DATA_HEADER = struct.Struct('<BIQ')  # opcode, subscriptionId, timestamp
+TIME_MESSAGE = struct.Struct('<BQ')  # opcode, timestamp
+
+
+class CdrWriter:
+    """Little-endian ROS 2 CDR serializer for the simulated messages."""
+
+    def __init__(self):
+        self.buffer = bytearray(b'\x00\x01\x00\x00')  # CDR_LE encapsulation header
+
+    def _align(self, size: int):
+        padding = -(len(self.buffer) - 4) % size
+        self.buffer += b'\x00' * padding
+
+    def write(self, fmt: str, *values):
+        """Writes the fields of a struct format, each aligned to its own size like CDR."""
+        values = iter(values)
+        for count, code in re.findall(r'(\d*)([a-zA-Z?])', fmt):
+            size = struct.calcsize('<' + code)
+            for _ in range(int(count or 1)):
+                self._align(size)
+                self.buffer += struct.pack('<' + code, next(values))
+
+    def write_string(self, value: str):
+        data = value.encode('utf-8') + b'\x00'
+        self.write('I', len(data))
+        self.buffer += data
+
+    def write_header(self, stamp_ns: int, frame_id: str):
+        self.write('iI', stamp_ns // 1_000_000_000, stamp_ns % 1_000_000_000)
+        self.write_string(frame_id)
+
+
+class TrackSimulator:
+    """Drives around a circle and derives position, heading and sensor health from time."""
+
+    def __init__(self, latitude: float, longitude: float, radius_m: float = 20.0, speed_mps: float = 1.5):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius_m = radius_m
+        self.angular_speed = speed_mps / radius_m
+
+    def navsatfix(self, stamp_ns: int) -> bytes:
+        angle = self.angular_speed * stamp_ns / 1e9
+        meters_per_deg = 111_320.0
+        writer = CdrWriter()
+        writer.write_header(stamp_ns, "gps_left_link")
+        writer.write('bH', 2, 1)  # status: GBAS fix, GPS service
+        writer.write('3d',
+                     self.latitude + self.radius_m * math.sin(angle) / meters_per_deg,
+                     self.longitude + self.radius_m * math.cos(angle)
+                     / (meters_per_deg * math.cos(math.radians(self.latitude))),
+                     12.0)
+        writer.write('9d', 0.0004, 0, 0, 0, 0.0004, 0, 0, 0, 0.0016)
+        writer.write('B', 2)  # COVARIANCE_TYPE_DIAGONAL_KNOWN
+        return bytes(writer.buffer)
+
+    def imu(self, stamp_ns: int) -> bytes:
+        angle = self.angular_speed * stamp_ns / 1e9
+        yaw = angle + math.pi / 2  # Tangent to the circle.
+        writer = CdrWriter()
+        writer.write_header(stamp_ns, "gps_left_link")
+        writer.write('4d', 0.0, 0.0, math.sin(yaw / 2), math.cos(yaw / 2))
+        writer.write('9d', *([0.0] * 9))
+        writer.write('3d', 0.0, 0.0, self.angular_speed)
+        writer.write('9d', *([0.0] * 9))
+        writer.write('3d', 0.0, 0.0, 9.81)
+        writer.write('9d', *([0.0] * 9))
+        return bytes(writer.buffer)
+
+    def diagnostic_array(self, stamp_ns: int) -> bytes:
+        statuses = [("IMU", "Active"), ("GPS", "Active"), ("Heading", "Active"),
+                    ("RTCM", "Active" if (stamp_ns // 10_000_000_000) % 2 == 0 else "Inactive"),
+                    ("Lidar", "Active")]
+        writer = CdrWriter()
+        writer.write_header(stamp_ns, "")
+        writer.write('I', len(statuses))
+        for name, message in statuses:
+            writer.write('B', 0 if message == "Active" else 1)
+            writer.write_string(name)
+            writer.write_string(message)
+            writer.write_string("sim")
+            writer.write('I', 1)
+            writer.write_string("source")
+            writer.write_string("foxglove_sim_server")
+        return bytes(writer.buffer)
+
+
+class FoxgloveSimServer:
+    """Serves the simulated channels to any number of clients."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.sim = TrackSimulator(args.latitude, args.longitude)
+        # channel id -> (advertisement, rate, payload factory)
+        self.channels = {
+            1: (self._channel(1, "/gps/fix_filtered", "sensor_msgs/msg/NavSatFix"),
+                args.gps_rate, self.sim.navsatfix),
+            2: (self._channel(2, "/gps/heading", "sensor_msgs/msg/Imu"),
+                args.heading_rate, self.sim.imu),
+            3: (self._channel(3, "/sensor_status", "diagnostic_msgs/msg/DiagnosticArray"),
+                args.status_rate, self.sim.diagnostic_array),
+        }
+        self.session_id = str(time.time_ns())  # Same for every client of this server process.
+        self.clients = set()
+        self.sent = {channel_id: 0 for channel_id in self.channels}
+
+    @staticmethod
+    def _channel(channel_id: int, topic: str, schema_name: str) -> dict:
+        return {
+            "id": channel_id,
+            "topic": topic,
+            "encoding": "cdr",
+            "schemaName": schema_name,
+            "schema": BUILTIN_SCHEMAS[schema_name],
+            "schemaEncoding": "ros2msg",
+        }
+
+    async def handle_client(self, ws):
+        logger.info(f"Client connected: {ws.remote_address}")
+        self.clients.add(ws)
+        streams = {}  # subscription id -> task
+        clock = None
+        try:
+            await ws.send(json.dumps({
+                "op": "serverInfo",
+                "name": "foxglove_sim_server",
+                "capabilities": ["time"],
+                "supportedEncodings": ["cdr"],
+                "metadata": {},
+                "sessionId": self.session_id,
+            }))
+            await ws.send(json.dumps({
+                "op": "advertise",
+                "channels": [channel for channel, _, _ in self.channels.values()],
+            }))
+            clock = asyncio.ensure_future(self._stream_time(ws))
+            async for message in ws:
+                if isinstance(message, bytes):
+                    continue
+                request = json.loads(message)
+                if request.get("op") == "subscribe":
+                    for subscription in request.get("subscriptions", []):
+                        channel_id = subscription["channelId"]
+                        if channel_id not in self.channels:
+                            await self._status(ws, 2, f"Unknown channel {channel_id}")
+                            continue
+                        streams[subscription["id"]] = asyncio.ensure_future(
+                            self._stream(ws, subscription["id"], channel_id))
+                elif request.get("op") == "unsubscribe":
+                    for subscription_id in request.get("subscriptionIds", []):
+                        task = streams.pop(subscription_id, None)
+                        if task is not None:
+                            task.cancel()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            for task in streams.values():
+                task.cancel()
+            if clock is not None:
+                clock.cancel()
+            self.clients.discard(ws)
+            logger.info(f"Client disconnected: {ws.remote_address}")
+
+    async def _status(self, ws, level: int, message: str):
+        await ws.send(json.dumps({"op": "status", "level": level, "message": message}))
+
+    async def _stream_time(self, ws):
+        while True:
+            await ws.send(TIME_MESSAGE.pack(0x02, time.time_ns()))
+            await asyncio.sleep(1.0)
+
+    async def _stream(self, ws, subscription_id: int, channel_id: int):
+        """
+        Sends the channel at its rate. Deadlines are absolute, so at high rates the
+        stream catches up with several frames per wakeup instead of drifting.
+        """
+        _, rate, make_payload = self.channels[channel_id]
+        period = 1.0 / rate
+        deadline = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                while deadline <= now:
+                    stamp_ns = time.time_ns()
+                    await ws.send(MESSAGE_DATA_HEADER.pack(0x01, subscription_id, stamp_ns)
+                                  + make_payload(stamp_ns))
+                    self.sent[channel_id] += 1
+                    deadline += period
+                await asyncio.sleep(deadline - time.monotonic())
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def _report(self):
+        last = dict(self.sent)
+        while True:
+            await asyncio.sleep(5.0)
+            rates = {
+                channel[0]["topic"]: round((self.sent[channel_id] - last[channel_id]) / 5.0, 1)
+                for channel_id, channel in self.channels.items()
+            }
+            last = dict(self.sent)
+            logger.info(f"clients={len(self.clients)} rates_hz={rates}")
+
+    async def _disconnect_clients(self):
+        logger.info(f"Scripted disconnect of {len(self.clients)} client(s).")
+        for ws in list(self.clients):
+            await ws.close(code=1001, reason="scripted disconnect")
+
+    async def _serve(self):
+        while True:
+            async with websockets.serve(
+                    self.handle_client, self.args.host, self.args.port,
+                    subprotocols=[SUBPROTOCOL], max_size=None):
+                logger.info(f"Serving on ws://{self.args.host}:{self.args.port}")
+                if self.args.disconnect_every <= 0:
+                    await asyncio.Future()  # Serve until cancelled.
+                while True:
+                    await asyncio.sleep(self.args.disconnect_every)
+                    await self._disconnect_clients()
+                    if self.args.down_for > 0:
+                        break
+            logger.info(f"Server down for {self.args.down_for} s.")
+            await asyncio.sleep(self.args.down_for)
+
+    async def run(self):
+        reporter = asyncio.ensure_future(self._report())
+        try:
+            await asyncio.wait_for(self._serve(), self.args.duration if self.args.duration > 0 else None)
+        except asyncio.TimeoutError:
+            logger.info(f"Stopped after {self.args.duration} s.")
+        finally:
+            reporter.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--gps-rate", type=float, default=10.0, help="/gps/fix_filtered rate in Hz (1-1000)")
+    parser.add_argument("--heading-rate", type=float, default=10.0, help="/gps/heading rate in Hz (1-1000)")
+    parser.add_argument("--status-rate", type=float, default=1.0, help="/sensor_status rate in Hz (1-1000)")
+    parser.add_argument("--latitude", type=float, default=37.5665)
+    parser.add_argument("--longitude", type=float, default=126.9780)
+    parser.add_argument("--disconnect-every", type=float, default=0.0,
+                        help="close all client connections every N seconds (0: never)")
+    parser.add_argument("--down-for", type=float, default=0.0,
+                        help="after a scripted disconnect, refuse connections for N seconds")
+    parser.add_argument("--duration", type=float, default=0.0, help="stop after N seconds (0: run forever)")
+    args = parser.parse_args()
+    for name in ("gps_rate", "heading_rate", "status_rate"):
+        if not 1.0 <= getattr(args, name) <= 1000.0:
+            parser.error(f"--{name.replace('_', '-')} must be between 1 and 1000 Hz")
+
+    try:
+        asyncio.run(FoxgloveSimServer(args).run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()